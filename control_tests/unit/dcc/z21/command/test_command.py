@@ -46,6 +46,38 @@ class TestCommand(unittest.TestCase):
                          'total_len:7, data:81, xor:0xa0}', str(obj2))
 
 
+    def test_as_bytes(self):
+        obj1 = XCommand.construct_x(XHeader.LAN_X_SET_TRACK_POWER, TrackMode.COMMAND_POWER_ON)
+        self.assertEqual('07 00 40 00 21 81 a0', obj1.as_bytes().hex(' '))
+        self.assertIs(obj1.as_bytes(), obj1.as_bytes())
+
+
+    def test_flyweight(self):
+        obj1 = Command.construct(Header.LAN_LOGOFF)
+        obj2 = Command.construct_from_jdict(json.loads(JSONify.dumps(obj1)))
+        self.assertIs(obj1, obj2)
+
+        obj3 = XCommand.construct_x(XHeader.LAN_X_SET_TURNOUT, 1, 0)
+        obj4 = XCommand.construct_x(XHeader.LAN_X_SET_TURNOUT, 2, 0)
+        self.assertIsNot(obj3, obj4)
+
+
+    def test_flyweight_from_jdict(self):
+        obj1 = {'type': 'XCommand', 'x_header': 'LAN_X_SET_TURNOUT', 'argv': [1023, 169]}
+        obj2 = len(XCommand.flyweights())
+
+        obj3 = XCommand.construct_from_jdict(obj1)
+        obj4 = XCommand.construct_from_jdict(obj1)
+
+        self.assertEqual(obj3, obj4)
+        self.assertIsNot(obj3, obj4)                    # not cached...
+        self.assertEqual(obj2, len(XCommand.flyweights()))
+
+        obj5 = Command.construct(Header.LAN_SYSTEMSTATE_GETDATA)
+        obj6 = Command.construct_from_jdict(json.loads(JSONify.dumps(obj5)))
+        self.assertIs(obj5, obj6)                       # ...but shared where a flyweight exists
+
+
     def test_construct_fail(self):
         with self.assertRaises(TypeError):
             Command.construct(Header.LAN_UNKNOWN)
@@ -22,7 +22,7 @@ class TestCommandMetadata(unittest.TestCase):
     def test_found(self):
         obj1 = CommandMetadata.find(Header.LAN_SET_BROADCAST_FLAGS)
         self.assertEqual('CommandMetadata:{header:LAN_SET_BROADCAST_FLAGS, argc:1, argv_builder:argv_std, '
-                         'data_format:<I, report_type:None}', str(obj1))
+                         'data_format:<I, report_type:None, urgent:False, ttl:None}', str(obj1))
 
 
     def test_argv_std(self):
@@ -39,7 +39,25 @@ class TestCommandMetadata(unittest.TestCase):
     def test_x_found(self):
         obj1 = XCommandMetadata.find_x(XHeader.LAN_X_SET_TRACK_POWER)
         self.assertEqual('XCommandMetadata:{header:LAN_X, x_header:LAN_X_SET_TRACK_POWER, argc:1, '
-                         'argv_builder:argv_std, data_format:B, report_type:TrackReport}', str(obj1))
+                         'argv_builder:argv_std, data_format:B, report_type:TrackReport, urgent:True, '
+                         'ttl:None}', str(obj1))
+
+
+    def test_x_data_struct(self):
+        obj1 = XCommandMetadata.find_x(XHeader.LAN_X_SET_TURNOUT)
+        self.assertEqual('>HB', obj1.data_struct.format)
+        self.assertEqual(3, obj1.data_struct.size)
+
+
+    def test_x_urgent(self):
+        obj1 = XCommandMetadata.find_x(XHeader.LAN_X_SET_STOP)
+        self.assertTrue(obj1.urgent)
+        self.assertFalse(XCommandMetadata.find_x(XHeader.LAN_X_SET_TURNOUT).urgent)
+
+
+    def test_x_ttl(self):
+        obj1 = XCommandMetadata.find_x(XHeader.LAN_X_SET_TURNOUT)
+        self.assertEqual(30.0, obj1.ttl)
 
 
     def test_argv_turnout(self):
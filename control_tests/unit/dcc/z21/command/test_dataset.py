@@ -9,10 +9,13 @@ https://realpython.com/python-testing/
 https://www.jetbrains.com/help/pycharm/creating-tests.html
 """
 
+import random
 import unittest
+from functools import reduce
+from operator import xor
 
-from mrcs_control.dcc.z21.command.dataset import Dataset
-from mrcs_control.dcc.z21.command.header import Header
+from mrcs_control.dcc.z21.command.dataset import Dataset, XDataset
+from mrcs_control.dcc.z21.command.header import Header, XHeader
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -48,6 +51,46 @@ class TestDataset(unittest.TestCase):
             str(obj1))
 
 
+    def test_construct_from_buffer(self):
+        chars = bytes([0x05, 0x00, 0x40, 0x00, 0x21, 0x81, 0xa0,                             # not a complete dataset
+                       0x0e, 0x00, 0xc4, 0x00, 0x89, 0xd4, 0x05, 0x00, 0x04, 0x01, 0x00, 0x11, 0x00, 0x00,
+                       0x04, 0x00, 0x85, 0x00])
+        buffer = memoryview(chars)
+
+        obj1 = Dataset.construct_from_buffer(buffer, 7)
+        self.assertEqual('Dataset:{header:0x00c4 [LAN_CAN_DETECTOR], total_len:14, '
+                         'data:89 d4 05 00 04 01 00 11 00 00}', str(obj1))
+        self.assertIs(buffer.obj, obj1.data.obj)                  # a view - not a copy
+
+        obj2 = Dataset.construct_from_buffer(buffer, 7 + obj1.total_len)
+        self.assertEqual(Header.LAN_SYSTEMSTATE_GETDATA, obj2.header)
+        self.assertEqual(b'', obj2.data)
+
+
+    def test_construct_from_buffer_fail(self):
+        chars = bytes([0x0e, 0x00, 0xc4, 0x00, 0x89, 0xd4])
+
+        with self.assertRaises(ValueError):
+            Dataset.construct_from_buffer(memoryview(chars))
+
+        with self.assertRaises(ValueError):
+            Dataset.construct_from_buffer(memoryview(chars), 4)
+
+        with self.assertRaises(ValueError):
+            Dataset.construct_from_bytes(chars + bytes(10))
+
+
+    def test_calculated_xor(self):
+        generator = random.Random(24)
+
+        for length in range(64):
+            data = bytes(generator.randrange(256) for _ in range(length))
+            expected = reduce(xor, data, XHeader.LAN_X_LOCO_INFO)
+
+            self.assertEqual(expected, XDataset.calculated_xor(XHeader.LAN_X_LOCO_INFO, data), data.hex(' '))
+            self.assertEqual(expected, XDataset.calculated_xor(XHeader.LAN_X_LOCO_INFO, memoryview(data)[:]))
+
+
 # --------------------------------------------------------------------------------------------------------------------
 
 if __name__ == "__main__":
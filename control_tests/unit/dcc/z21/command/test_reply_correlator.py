@@ -0,0 +1,78 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/dcc/z21/command/test_reply_correlator.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import unittest
+
+from mrcs_control.dcc.z21.command.header import Header, XHeader
+from mrcs_control.dcc.z21.command.reply_correlator import ReplyCorrelator
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestReplyCorrelator(unittest.IsolatedAsyncioTestCase):
+
+    SYSTEM_STATE = memoryview(bytes([0x14, 0x00, 0x84, 0x00]) + bytes(16))
+    LOCO_3 = memoryview(bytes([0x0e, 0x00, 0x40, 0x00, 0xef, 0x00, 0x03, 0x04, 0x80, 0x00, 0x00, 0x00, 0x00, 0x6b]))
+    TURNOUT_5 = memoryview(bytes([0x09, 0x00, 0x40, 0x00, 0x43, 0x00, 0x05, 0x02, 0x44]))
+
+
+    def test_reply_key(self):
+        self.assertEqual((0x84, None, None), ReplyCorrelator.reply_key(self.SYSTEM_STATE, 0, 20))
+        self.assertEqual((0x40, 0xef, 3), ReplyCorrelator.reply_key(self.LOCO_3, 0, 14))
+        self.assertEqual((0x40, 0x43, 5), ReplyCorrelator.reply_key(self.TURNOUT_5, 0, 9))
+
+
+    async def test_resolve(self):
+        obj1 = ReplyCorrelator()
+
+        loco_3 = obj1.expect(Header.LAN_X, XHeader.LAN_X_LOCO_INFO, 3)
+        loco_4 = obj1.expect(Header.LAN_X, XHeader.LAN_X_LOCO_INFO, 4)
+        any_loco = obj1.expect(Header.LAN_X, XHeader.LAN_X_LOCO_INFO)
+        self.assertEqual(3, len(obj1))
+
+        self.assertEqual(0, obj1.resolve(self.SYSTEM_STATE, 0, 20, 'state'))
+        self.assertEqual(2, obj1.resolve(self.LOCO_3, 0, 14, 'loco 3'))
+
+        self.assertEqual('loco 3', await obj1.wait(loco_3, 1.0))
+        self.assertEqual('loco 3', await obj1.wait(any_loco, 1.0))
+        self.assertFalse(loco_4.done())
+        self.assertEqual(1, len(obj1))
+
+
+    async def test_timeout(self):
+        obj1 = ReplyCorrelator()
+
+        state = obj1.expect(Header.LAN_SYSTEMSTATE_DATACHANGED)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await obj1.wait(state, 0.01)
+
+        self.assertEqual(0, len(obj1))
+        self.assertEqual(1, obj1.timed_out)
+
+
+    async def test_fail_all(self):
+        obj1 = ReplyCorrelator()
+
+        state = obj1.expect(Header.LAN_SYSTEMSTATE_DATACHANGED)
+        obj1.fail_all(ConnectionError('lost'))
+
+        with self.assertRaises(ConnectionError):
+            await obj1.wait(state, 1.0)
+
+        self.assertEqual(0, len(obj1))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/dcc/z21/command/test_send_scheduler.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import unittest
+
+from mrcs_control.dcc.z21.command.send_scheduler import SendPriority, SendScheduler
+from mrcs_control.sys.token_bucket import TokenBucket
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestSendScheduler(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.datagrams = []
+
+
+    def sendto(self, chars):
+        self.datagrams.append(chars)
+
+
+    async def test_construct(self):
+        obj1 = SendScheduler.construct(self.sendto)
+        self.assertEqual('SendScheduler:{bucket:TokenBucket:{rate:20.0, burst:8, tokens:8}, max_datagram_size:256, '
+                         'is_running:False, waiting:0, datasets:0, datagrams:0}', str(obj1))
+
+
+    async def test_packing(self):
+        obj1 = SendScheduler(self.sendto, TokenBucket(1000000.0, 4), 12)
+
+        await asyncio.gather(*[obj1.send(bytes([i]) * 4) for i in range(5)])
+        await obj1.stop()
+
+        # packed up to 12 bytes...
+        self.assertEqual([b'\x00' * 4 + b'\x01' * 4 + b'\x02' * 4, b'\x03' * 4 + b'\x04' * 4], self.datagrams)
+        self.assertEqual(5, obj1.datasets)
+        self.assertEqual(2, obj1.datagrams)
+
+
+    async def test_priority(self):
+        obj1 = SendScheduler(self.sendto, TokenBucket(100.0, 1), 256)
+        obj1.bucket.take()
+
+        sends = [asyncio.create_task(obj1.send(b'b', priority=SendPriority.BACKGROUND)),
+                 asyncio.create_task(obj1.send(b'n', priority=SendPriority.NORMAL))]
+        await asyncio.sleep(0)
+
+        await obj1.send(b'u', priority=SendPriority.URGENT)
+        self.assertEqual([b'u'], self.datagrams)
+
+        await asyncio.gather(*sends)
+        await obj1.stop()
+
+        self.assertEqual([b'u', b'n', b'b'], self.datagrams)
+
+
+    async def test_error(self):
+        def sendto(_chars):
+            raise OSError('network is unreachable')
+
+        obj1 = SendScheduler(sendto, TokenBucket(100.0, 4), 256)
+
+        with self.assertRaises(OSError):
+            await obj1.send(b'n')
+
+        self.assertTrue(obj1.is_running)
+        await obj1.stop()
+
+
+    async def test_stop(self):
+        obj1 = SendScheduler(self.sendto, TokenBucket(1.0, 1), 256)
+        obj1.bucket.take()
+
+        send = asyncio.create_task(obj1.send(b'n'))
+        await asyncio.sleep(0)
+
+        await obj1.stop()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await send
+
+        self.assertEqual([], self.datagrams)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/dcc/z21/entities/test_z21_equipment_report.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import unittest
+
+from mrcs_control.dcc.z21.command.dataset import Dataset
+from mrcs_control.dcc.z21.equipment import Z21EquipmentReport
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestZ21EquipmentReport(unittest.TestCase):
+
+    TRACK_ON = bytes([0x07, 0x00, 0x40, 0x00, 0x61, 0x01, 0x60])
+    FAST_CLOCK = bytes([0x04, 0x00, 0xcd, 0x00])                            # unsupported header
+    STOPPED = bytes([0x07, 0x00, 0x40, 0x00, 0x81, 0x00, 0x81])             # unsupported x-header
+
+
+    def test_construct_from_buffer(self):
+        buffer = memoryview(self.FAST_CLOCK + self.TRACK_ON)
+
+        obj1 = Z21EquipmentReport.construct_from_buffer(buffer, 4, 7)
+        self.assertEqual('TrackReport:{mode:POWER_ON}', str(obj1))
+
+
+    def test_unsupported(self):
+        buffer = memoryview(self.FAST_CLOCK + self.STOPPED)
+
+        self.assertIsNone(Z21EquipmentReport.construct_from_buffer(buffer, 0, 4))
+        self.assertIsNone(Z21EquipmentReport.construct_from_buffer(buffer, 4, 7))
+
+
+    def test_xor_fail(self):
+        buffer = memoryview(self.TRACK_ON[:-1] + bytes([0x61]))
+
+        with self.assertRaises(ValueError):
+            Z21EquipmentReport.construct_from_buffer(buffer, 0, 7)
+
+
+    def test_construct_from_dataset(self):
+        obj1 = Z21EquipmentReport.construct_from_dataset(Dataset.construct_from_bytes(self.TRACK_ON))
+        self.assertEqual('TrackReport:{mode:POWER_ON}', str(obj1))
+
+        with self.assertRaises(TypeError):
+            Z21EquipmentReport.construct_from_dataset(Dataset.construct_from_bytes(self.STOPPED))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
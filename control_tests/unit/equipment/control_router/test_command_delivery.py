@@ -0,0 +1,91 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/equipment/control_router/test_command_delivery.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import unittest
+
+from mrcs_control.dcc.z21.command.command import XCommand
+from mrcs_control.dcc.z21.command.header import XHeader
+from mrcs_control.equipment.control_router.command_delivery import CommandDelivery
+from mrcs_control.messaging.delivery_policy import DeliveryPolicy
+from mrcs_control.messaging.mq_enums import MQPriority
+from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestCommandDelivery(unittest.TestCase):
+
+    __ROUTING_KEY = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                          EquipmentFilter.construct_from_jdict('CRT.*.1'))
+
+    def setUp(self):
+        CommandDelivery.register()
+        self.addCleanup(DeliveryPolicy.init)
+
+
+    @classmethod
+    def message(cls, body):
+        return Message(cls.__ROUTING_KEY, body)
+
+
+    def test_priority_urgent(self):
+        obj1 = self.message({'type': 'XCommand', 'x_header': 'LAN_X_SET_STOP', 'argv': []})
+        self.assertEqual(MQPriority.URGENT, DeliveryPolicy.find(self.__ROUTING_KEY).priority_of(obj1))
+
+
+    def test_priority_normal(self):
+        obj1 = self.message({'type': 'XCommand', 'x_header': 'LAN_X_SET_TURNOUT', 'argv': [1, 169]})
+        self.assertEqual(MQPriority.NORMAL, DeliveryPolicy.find(self.__ROUTING_KEY).priority_of(obj1))
+
+
+    def test_priority_command(self):
+        obj1 = self.message(XCommand.construct_x(XHeader.LAN_X_SET_STOP))
+        self.assertEqual(MQPriority.URGENT, DeliveryPolicy.find(self.__ROUTING_KEY).priority_of(obj1))
+
+
+    def test_priority_invalid(self):
+        obj1 = self.message({'type': 'XCommand', 'x_header': 'LAN_X_UNKNOWN', 'argv': []})
+        self.assertEqual(MQPriority.NORMAL, DeliveryPolicy.find(self.__ROUTING_KEY).priority_of(obj1))
+
+        obj2 = self.message(['not', 'a', 'command'])
+        self.assertEqual(MQPriority.NORMAL, DeliveryPolicy.find(self.__ROUTING_KEY).priority_of(obj2))
+
+
+    def test_ttl_stamped(self):
+        obj1 = self.message({'type': 'XCommand', 'x_header': 'LAN_X_SET_TURNOUT', 'argv': [1, 169]})
+        obj2 = DeliveryPolicy.find(self.__ROUTING_KEY).properties_for(obj1, 'application/json')
+        self.assertEqual('30000', obj2.expiration)
+        self.assertIsNotNone(obj2.timestamp)
+
+
+    def test_ttl_none(self):
+        obj1 = self.message({'type': 'XCommand', 'x_header': 'LAN_X_SET_STOP', 'argv': []})
+        obj2 = DeliveryPolicy.find(self.__ROUTING_KEY).properties_for(obj1, 'application/json')
+        self.assertIsNone(obj2.expiration)
+        self.assertIsNone(obj2.timestamp)
+
+
+    def test_assess(self):
+        obj1 = self.message({'type': 'XCommand', 'x_header': 'LAN_X_SET_TURNOUT', 'argv': [1, 169]})
+        self.assertEqual((MQPriority.NORMAL, 30.0), CommandDelivery.assess(obj1))
+
+
+    def test_metadata_memoized(self):
+        obj1 = {'type': 'XCommand', 'x_header': 'LAN_X_SET_TURNOUT', 'argv': [1, 169]}
+        self.assertIs(CommandDelivery.metadata(obj1), CommandDelivery.metadata(dict(obj1)))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
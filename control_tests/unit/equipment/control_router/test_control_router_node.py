@@ -0,0 +1,167 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/equipment/control_router/test_control_router_node.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import unittest
+
+from mrcs_control.dcc.z21.command.dataset import Dataset
+from mrcs_control.dcc.z21.equipment.block.z21_block_report import Z21BlockReport
+from mrcs_control.dcc.z21.equipment.motive_power_unit.z21_mpu_configuration_report import Z21MPUConfigurationReport
+from mrcs_control.dcc.z21.equipment.motive_power_unit.z21_mpu_decoder_report import Z21MPUDecoderReport
+from mrcs_control.dcc.z21.equipment.track.z21_track_report import Z21TrackReport
+from mrcs_control.dcc.z21.equipment.turnout.z21_turnout_report import Z21TurnoutReport
+from mrcs_control.equipment.control_router.control_router_node import ControlRouterNode
+from mrcs_control.operations.node_enums import NodeTopology
+from mrcs_core.data.equipment_identity import EquipmentIdentifier, EquipmentType
+from mrcs_core.equipment.block.block_id import BlockID
+from mrcs_core.equipment.block.block_report import BlockOccupancyReport
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestControlRouterNode(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.node = ControlRouterNode(NodeTopology.LOOPBACK, None)
+        self.node.outbox.clear()
+        self.addCleanup(self.node.outbox.clear)
+
+
+    @staticmethod
+    def turnout_report(position):
+        return Z21TurnoutReport.construct_from_data(bytes((0, 5, position)))
+
+
+    @staticmethod
+    def voltage_report(address, port, voltage):
+        chars = bytes([0x0e, 0x00, 0xc4, 0x00, 0x78, 0xdb, address, 0x00, port, 0x01, 0x00, voltage, 0x00, 0x00])
+        return Z21BlockReport.construct_from_dataset(Dataset.construct_from_bytes(chars))
+
+
+    @staticmethod
+    def occupancy_report(occupant_group):
+        return BlockOccupancyReport(BlockID(3, 2, 0), occupant_group, [])
+
+
+    def nack(self, outgoing):
+        confirmation = asyncio.get_running_loop().create_future()
+        confirmation.set_result(False)
+
+        self.node.on_confirmation(outgoing, confirmation)
+
+
+    async def test_newest_requeued(self):
+        self.node.on_dataset(self.turnout_report(1))
+        obj1 = self.node.outbox.pop()
+
+        self.nack(obj1)
+        self.assertIs(obj1, self.node.outbox.pop())
+
+
+    async def test_superseded_dropped(self):
+        self.node.on_dataset(self.turnout_report(1))
+        obj1 = self.node.outbox.pop()                   # in flight...
+
+        self.node.on_dataset(self.turnout_report(2))
+        obj2 = self.node.outbox.pop()                   # ...and superseded
+
+        self.nack(obj1)
+        self.assertEqual(0, len(self.node.outbox))
+
+        self.nack(obj2)
+        self.assertIs(obj2, self.node.outbox.pop())
+
+
+    async def test_occupancy_order(self):
+        self.node.on_dataset(self.occupancy_report(1))
+        obj1 = self.node.outbox.pop()
+
+        self.node.on_dataset(self.occupancy_report(2))
+        self.assertEqual(1, len(self.node.outbox))
+
+        self.nack(obj1)                                 # not re-appended behind the newer report
+        self.assertEqual(1, len(self.node.outbox))
+
+
+    async def test_journal_round_trip(self):
+        self.node.on_dataset(self.turnout_report(1))
+        obj1 = self.node.outbox.pop()
+
+        obj2 = ControlRouterNode.decode_outgoing(ControlRouterNode.encode_outgoing(obj1))
+        self.assertEqual(obj1[:2], obj2[:2])            # the stream and sequence survive the journal
+
+        self.node.on_dataset(self.turnout_report(2))
+        self.node.outbox.pop()
+
+        self.nack(obj2)
+        self.assertEqual(0, len(self.node.outbox))
+
+
+    def assertSource(self, expected: EquipmentIdentifier, report):
+        self.assertEqual(expected.as_json(), ControlRouterNode.publication_source(report).as_json())
+
+
+    def test_source_mpu_configuration(self):
+        chars = bytes([0x0f, 0x00, 0x40, 0x00, 0xef, 0x00, 0x04, 0x0c, 0xb5, 0x01, 0x00, 0x00, 0x00, 0x00, 0x53])
+        obj1 = Z21MPUConfigurationReport.construct_from_dataset(Dataset.construct_from_bytes(chars))
+        self.assertSource(EquipmentIdentifier(EquipmentType.MPU, None, 4), obj1)
+
+
+    def test_source_mpu_decoder(self):
+        obj1 = Z21MPUDecoderReport.construct_from_data(bytes([0x03, 0x00] + [0x00] * 11))
+        self.assertSource(EquipmentIdentifier(EquipmentType.MPU, None, 3), obj1)
+
+
+    def test_source_turnout(self):
+        self.assertSource(EquipmentIdentifier(EquipmentType.TRN, None, 5), self.turnout_report(1))
+
+
+    def test_source_block_voltage(self):
+        obj1 = self.voltage_report(0x04, 0x00, 0x11)
+        self.assertEqual('5/1', obj1.block_address)
+        self.assertSource(EquipmentIdentifier(EquipmentType.BLK, 5, 1), obj1)
+
+
+    def test_source_block_occupancy(self):
+        chars = bytes([0x0e, 0x00, 0xc4, 0x00, 0x89, 0xd4, 0x05, 0x00, 0x06, 0x11, 0x04, 0x80, 0x03, 0x80])
+        obj1 = Z21BlockReport.construct_from_dataset(Dataset.construct_from_bytes(chars))
+        self.assertSource(EquipmentIdentifier(EquipmentType.BLK, 6, 7), obj1)
+
+
+    def test_source_track(self):
+        chars = bytes([0x07, 0x00, 0x40, 0x00, 0x61, 0x01, 0x60])
+        obj1 = Z21TrackReport.construct_from_dataset(Dataset.construct_from_bytes(chars))
+        self.assertSource(ControlRouterNode.id(), obj1)
+
+
+    def test_conflation_key_block(self):
+        obj1 = ControlRouterNode.stream(self.voltage_report(0x04, 0x00, 0x11))
+        obj2 = ControlRouterNode.stream(self.voltage_report(0x04, 0x00, 0x00))      # the same block, a new voltage
+        obj3 = ControlRouterNode.stream(self.voltage_report(0x05, 0x05, 0x11))
+
+        self.assertEqual(obj1, ControlRouterNode.conflation_key(obj1))
+        self.assertEqual(obj1, obj2)
+        self.assertNotEqual(obj1, obj3)
+
+
+    def test_conflation_key(self):
+        obj1 = ControlRouterNode.stream(self.turnout_report(1))
+        self.assertEqual(obj1, ControlRouterNode.conflation_key(obj1))
+        self.assertEqual(obj1, ControlRouterNode.stream(self.turnout_report(2)))
+
+        obj2 = ControlRouterNode.stream(self.occupancy_report(1))
+        self.assertIsNone(ControlRouterNode.conflation_key(obj2))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
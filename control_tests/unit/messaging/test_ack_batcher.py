@@ -0,0 +1,156 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_ack_batcher.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import unittest
+
+from mrcs_control.messaging.ack_batcher import AckBatcher
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestAckBatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+
+
+    def ack(self, delivery_tag, multiple):
+        self.sent.append((delivery_tag, multiple))
+
+
+    def nack(self, delivery_tag, requeue):
+        self.sent.append(('nack', delivery_tag, requeue))
+
+
+    def test_construct(self):
+        obj1 = AckBatcher(self.ack, self.nack, 4)
+        self.assertEqual('AckBatcher:{batch_size:4, outstanding:0, unflushed:0, frames:0, acked:0, nacked:0, '
+                         'is_retired:False}', str(obj1))
+
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            AckBatcher(self.ack, self.nack, 0)
+
+
+    def test_threshold(self):
+        obj1 = AckBatcher(self.ack, self.nack, 2)
+        obj1.delivered(1)
+        obj1.delivered(2)
+
+        self.assertFalse(obj1.succeeded(1))
+        self.assertTrue(obj1.succeeded(2))
+
+
+    def test_contiguous(self):
+        obj1 = AckBatcher(self.ack, self.nack, 8)
+
+        for tag in range(1, 5):
+            obj1.delivered(tag)
+
+        for tag in range(1, 5):
+            obj1.succeeded(tag)
+
+        obj1.flush()
+        self.assertEqual([(4, True)], self.sent)
+        self.assertEqual(1, obj1.frames)
+        self.assertEqual(4, obj1.acked)
+        self.assertEqual(0, obj1.outstanding)
+
+
+    def test_failure_is_nacked(self):
+        obj1 = AckBatcher(self.ack, self.nack, 8)
+
+        for tag in range(1, 5):
+            obj1.delivered(tag)
+
+        obj1.succeeded(1)
+        obj1.failed(2)
+        obj1.succeeded(3)
+        obj1.succeeded(4)
+
+        obj1.flush()
+        self.assertEqual([('nack', 2, True), (4, True)], self.sent)
+        self.assertEqual(1, obj1.nacked)
+        self.assertEqual(3, obj1.acked)
+        self.assertEqual(0, obj1.outstanding)
+
+
+    def test_failed_head_advances(self):
+        obj1 = AckBatcher(self.ack, self.nack, 8)
+
+        for tag in range(1, 4):
+            obj1.delivered(tag)
+
+        obj1.failed(1, requeue=False)
+        obj1.flush()
+
+        obj1.succeeded(2)
+        obj1.succeeded(3)
+        obj1.flush()
+
+        self.assertEqual([('nack', 1, False), (3, True)], self.sent)
+        self.assertEqual(2, obj1.frames)
+
+
+    def test_failure_threshold(self):
+        obj1 = AckBatcher(self.ack, self.nack, 2)
+        obj1.delivered(1)
+        obj1.delivered(2)
+
+        self.assertFalse(obj1.failed(1))
+        self.assertTrue(obj1.succeeded(2))
+
+
+    def test_failed_straggler(self):
+        obj1 = AckBatcher(self.ack, self.nack, 8)
+
+        for tag in range(1, 4):
+            obj1.delivered(tag)
+
+        obj1.failed(2)
+        obj1.succeeded(3)
+        obj1.flush()
+
+        self.assertEqual([('nack', 2, True), (3, False)], self.sent)
+        self.assertEqual(1, obj1.outstanding)
+
+
+    def test_pending_holds_run(self):
+        obj1 = AckBatcher(self.ack, self.nack, 8)
+
+        for tag in range(1, 4):
+            obj1.delivered(tag)
+
+        obj1.succeeded(2)
+        obj1.succeeded(3)
+        obj1.flush()
+        self.assertEqual([(2, False), (3, False)], self.sent)
+
+        obj1.succeeded(1)
+        obj1.flush()
+        self.assertEqual([(2, False), (3, False), (1, True)], self.sent)
+
+
+    def test_retired(self):
+        obj1 = AckBatcher(self.ack, self.nack, 1)
+        obj1.delivered(1)
+        obj1.retire()
+
+        self.assertFalse(obj1.succeeded(1))
+        obj1.flush()
+        self.assertEqual([], self.sent)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
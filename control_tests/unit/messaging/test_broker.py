@@ -0,0 +1,142 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_broker.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mrcs_control.messaging.broker import AsyncBroker
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestAsyncBroker(unittest.TestCase):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'           # keep-alive
+
+        connections = 0
+        requests = []
+
+        DEPTHS = [{'name': 'mrcs.a', 'messages': 3, 'messages_ready': 2, 'messages_unacknowledged': 1,
+                   'consumers': 1},
+                  {'name': 'mrcs.b', 'messages': 0, 'messages_ready': 0, 'messages_unacknowledged': 0,
+                   'consumers': 2}]
+
+        def setup(self):
+            super().setup()
+            TestAsyncBroker.Handler.connections += 1
+
+        def do_GET(self):
+            TestAsyncBroker.Handler.requests.append(('GET', self.path))
+            path = self.path.split('?')[0]
+
+            if path == '/api/queues/':
+                self.reply(200, self.DEPTHS)
+                return
+
+            for depth in self.DEPTHS:
+                if path == f"/api/queues/%2F/{depth['name']}":
+                    self.reply(200, depth)
+                    return
+
+            self.reply(404, {'error': 'Object Not Found'})
+
+        def do_DELETE(self):
+            TestAsyncBroker.Handler.requests.append(('DELETE', self.path))
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def reply(self, status, jdict):
+            body = json.dumps(jdict).encode()
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+
+    def setUp(self):
+        self.Handler.connections = 0
+        self.Handler.requests = []
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+    def broker(self, concurrency=2):
+        return AsyncBroker(self.server.server_address[1], 'guest', 'guest', concurrency, 5.0)
+
+
+    def test_construct(self):
+        obj1 = AsyncBroker.construct()
+        self.assertEqual('AsyncBroker:{host:127.0.0.1, port:15672, username:guest, password:guest, concurrency:4, '
+                         'is_open:False}', str(obj1))
+
+
+    def test_queue_depths(self):
+        async def run():
+            async with self.broker() as obj1:
+                return await obj1.queue_depths()
+
+        depths = asyncio.run(run())
+        self.assertEqual(['mrcs.a', 'mrcs.b'], [depth.name for depth in depths])
+        self.assertEqual([3, 0], [depth.messages for depth in depths])
+        self.assertEqual([1, 2], [depth.consumers for depth in depths])
+        self.assertIn('columns=', self.Handler.requests[0][1])
+
+
+    def test_queue_depths_named(self):
+        async def run():
+            async with self.broker() as obj1:
+                return await obj1.queue_depths(['mrcs.b', 'mrcs.a'])
+
+        depths = asyncio.run(run())
+        self.assertEqual(['mrcs.b', 'mrcs.a'], [depth.name for depth in depths])
+
+
+    def test_keep_alive(self):
+        async def run():
+            async with self.broker(concurrency=2) as obj1:
+                for _ in range(5):
+                    await obj1.queue_depths(['mrcs.a', 'mrcs.b', 'mrcs.a', 'mrcs.b'])
+
+        asyncio.run(run())
+        self.assertEqual(20, len(self.Handler.requests))
+        self.assertLessEqual(self.Handler.connections, 2)
+
+
+    def test_drain(self):
+        async def run():
+            async with self.broker() as obj1:
+                await obj1.drain('mrcs.a')
+                return obj1.is_open
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual([('DELETE', '/api/queues/%2F/mrcs.a/contents')], self.Handler.requests)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_dead_lettering.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import unittest
+
+import pika
+
+from mrcs_control.messaging.dead_lettering import DeadLettering
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestDeadLettering(unittest.TestCase):
+
+    class Channel(object):
+        def __init__(self):
+            self.calls = []
+
+        def exchange_declare(self, **kwargs):
+            self.calls.append(('exchange_declare', kwargs))
+
+        def queue_bind(self, **kwargs):
+            self.calls.append(('queue_bind', kwargs))
+
+        def queue_declare(self, **kwargs):
+            self.calls.append(('queue_declare', kwargs))
+
+        def basic_publish(self, **kwargs):
+            self.calls.append(('basic_publish', kwargs))
+
+
+    def test_construct(self):
+        obj1 = DeadLettering.construct('mrcs.test', 'mrcs.test.CRT.001.002')
+        self.assertEqual("DeadLettering:{exchange_name:mrcs.test, queue_name:mrcs.test.CRT.001.002, "
+                         "delays:(1.0, 10.0, 60.0), max_attempts:5}", str(obj1))
+
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DeadLettering('mrcs.test', 'q', (), 5)
+
+        with self.assertRaises(ValueError):
+            DeadLettering('mrcs.test', 'q', (1.0,), 0)
+
+
+    def test_declare(self):
+        obj1 = DeadLettering('mrcs.test', 'q', (1.0, 10.0), 3)
+        channel = self.Channel()
+        obj1.declare(channel)
+
+        names = [kwargs.get('queue', kwargs.get('exchange')) for _, kwargs in channel.calls]
+        self.assertEqual(['mrcs.test.dlx', 'q', 'q.retry.0', 'q.retry.1', 'q.dead'], names)
+
+        arguments = channel.calls[3][1]['arguments']
+        self.assertEqual({'x-message-ttl': 10000, 'x-dead-letter-exchange': 'mrcs.test.dlx',
+                          'x-dead-letter-routing-key': 'q'}, arguments)
+
+
+    def test_retry_tiers(self):
+        obj1 = DeadLettering('mrcs.test', 'q', (1.0, 10.0), 4)
+        properties = pika.BasicProperties(content_type='application/json', expiration='5000')
+
+        destinations = []
+        for _ in range(4):
+            destination, properties, will_retry = obj1.redirect('key', properties)
+            destinations.append((destination, will_retry))
+
+        self.assertEqual([('q.retry.0', True), ('q.retry.1', True), ('q.retry.1', True), ('q.dead', False)],
+                         destinations)
+        self.assertEqual(4, DeadLettering.retries(properties))
+        self.assertIsNone(properties.expiration)
+        self.assertEqual('5000', DeadLettering.expiration(properties))
+
+
+    def test_expiration(self):
+        obj1 = DeadLettering('mrcs.test', 'q', (1.0,), 3)
+        properties = pika.BasicProperties(timestamp=1000)
+        self.assertIsNone(DeadLettering.expiration(properties))
+
+        _, properties, _ = obj1.redirect('key', properties)
+        self.assertIsNone(DeadLettering.expiration(properties))
+        self.assertNotIn(DeadLettering.EXPIRATION_HEADER, properties.headers)
+        self.assertEqual(1000, properties.timestamp)
+
+
+    def test_routing_key(self):
+        obj1 = DeadLettering('mrcs.test', 'q', (1.0,), 3)
+        properties = pika.BasicProperties()
+        self.assertEqual('key', DeadLettering.routing_key('key', properties))
+
+        _, properties, _ = obj1.redirect('key', properties)
+        self.assertEqual('key', DeadLettering.routing_key('q', properties))
+
+
+    def test_reject(self):
+        obj1 = DeadLettering('mrcs.test', 'q', (1.0,), 2)
+        channel = self.Channel()
+
+        self.assertTrue(obj1.reject(channel, 'key', pika.BasicProperties(), b'{}'))
+        self.assertEqual('', channel.calls[0][1]['exchange'])
+        self.assertEqual('q.retry.0', channel.calls[0][1]['routing_key'])
+        self.assertTrue(channel.calls[0][1]['mandatory'])              # an unroutable copy is not confirmed
+
+        properties = channel.calls[0][1]['properties']
+        self.assertFalse(obj1.reject(channel, 'q', properties, b'{}'))
+        self.assertEqual('q.dead', channel.calls[1][1]['routing_key'])
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
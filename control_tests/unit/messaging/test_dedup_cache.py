@@ -0,0 +1,113 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_dedup_cache.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from mrcs_control.messaging.dedup_cache import DedupCache
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestDedupCache(unittest.TestCase):
+
+    __ROUTING_KEY = 'TST.001.001.MPU.001.100'
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'test.dedup')
+
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+
+    def test_construct(self):
+        obj1 = DedupCache.construct()
+        self.assertEqual('DedupCache:{max_size:10000, ttl:3600.0, path:None, size:0, duplicates:0}', str(obj1))
+
+
+    def test_invalid_max_size(self):
+        with self.assertRaises(ValueError):
+            DedupCache(0, 1.0)
+
+
+    def test_duplicate(self):
+        obj1 = DedupCache(10, 60.0)
+        self.assertFalse(obj1.is_duplicate('12345678', self.__ROUTING_KEY))
+
+        obj1.record('12345678', self.__ROUTING_KEY)
+        self.assertTrue(obj1.is_duplicate('12345678', self.__ROUTING_KEY))
+        self.assertFalse(obj1.is_duplicate(None, self.__ROUTING_KEY))
+        self.assertEqual(1, obj1.duplicates)
+
+
+    def test_relayed(self):
+        obj1 = DedupCache(10, 60.0)
+        obj1.record('12345678', self.__ROUTING_KEY)
+
+        self.assertFalse(obj1.is_duplicate('12345678', 'CLK.001.001.ANY'))     # the same origin, relayed
+        self.assertEqual(0, obj1.duplicates)
+
+
+    def test_bounded(self):
+        obj1 = DedupCache(2, 60.0)
+
+        for origin in ('a', 'b', 'c'):
+            obj1.record(origin, self.__ROUTING_KEY)
+
+        self.assertEqual(2, len(obj1))
+        self.assertFalse(obj1.is_duplicate('a', self.__ROUTING_KEY))
+        self.assertTrue(obj1.is_duplicate('c', self.__ROUTING_KEY))
+
+
+    def test_expiry(self):
+        obj1 = DedupCache(10, 0.01)
+        obj1.record('a', self.__ROUTING_KEY)
+        time.sleep(0.02)
+
+        self.assertFalse(obj1.is_duplicate('a', self.__ROUTING_KEY))
+        self.assertEqual(0, len(obj1))
+
+
+    def test_persisted(self):
+        obj1 = DedupCache(10, 60.0, path=self.path)
+        obj1.record('a', self.__ROUTING_KEY)
+        obj1.record('b', self.__ROUTING_KEY)
+        obj1.close()
+
+        with open(self.path, 'a') as journal:
+            journal.write('torn')
+
+        obj2 = DedupCache(10, 60.0, path=self.path)
+        self.assertTrue(obj2.is_duplicate('a', self.__ROUTING_KEY))
+        self.assertTrue(obj2.is_duplicate('b', self.__ROUTING_KEY))
+        self.assertEqual(2, len(obj2))
+
+
+    def test_compacted(self):
+        obj1 = DedupCache(2, 60.0, path=self.path)
+
+        for origin in ('a', 'b', 'c', 'd', 'e'):
+            obj1.record(origin, self.__ROUTING_KEY)
+
+        obj1.close()
+
+        with open(self.path) as journal:
+            self.assertLessEqual(len(journal.readlines()), 4)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
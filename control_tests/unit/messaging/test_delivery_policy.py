@@ -0,0 +1,131 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_delivery_policy.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import unittest
+
+import pika
+
+from mrcs_control.messaging.delivery_policy import DeliveryPolicy, MessageKind
+from mrcs_control.messaging.mq_enums import MQPriority
+from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier, EquipmentType
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestDeliveryPolicy(unittest.TestCase):
+
+    __ROUTING_KEY = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                          EquipmentFilter.construct_from_jdict('MPU.001.100'))
+
+    def test_kind_report(self):
+        obj1 = PublicationRoutingKey(EquipmentIdentifier(EquipmentType.CRT, None, 1), EquipmentFilter.any())
+        self.assertEqual(MessageKind.REPORT, MessageKind.of(obj1))
+
+
+    def test_kind_command(self):
+        obj1 = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                     EquipmentFilter.construct_from_jdict('CRT.*.1'))
+        self.assertEqual(MessageKind.COMMAND, MessageKind.of(obj1))
+
+
+    def test_find_report(self):
+        obj1 = PublicationRoutingKey(EquipmentIdentifier(EquipmentType.CRT, None, 1), EquipmentFilter.any())
+        obj2 = DeliveryPolicy.find(obj1)
+        self.assertEqual('DeliveryPolicy:{persistent:False, ttl:10.0, priority:None, mandatory:False}', str(obj2))
+
+
+    def test_find_equipment_report(self):
+        obj1 = PublicationRoutingKey(EquipmentIdentifier(EquipmentType.MPU, None, 3), EquipmentFilter.any())
+        obj2 = DeliveryPolicy.find(obj1)
+        self.assertEqual('DeliveryPolicy:{persistent:False, ttl:10.0, priority:None, mandatory:False}', str(obj2))
+
+
+    def test_find_command(self):
+        obj1 = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                     EquipmentFilter.construct_from_jdict('CRT.*.1'))
+        obj2 = DeliveryPolicy.find(obj1)
+        self.assertEqual('DeliveryPolicy:{persistent:True, ttl:None, priority:None, mandatory:True}', str(obj2))
+
+
+    def test_find_default(self):
+        obj1 = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                     EquipmentFilter.construct_from_jdict('MPU.001.100'))
+        obj2 = DeliveryPolicy.find(obj1)
+        self.assertEqual('DeliveryPolicy:{persistent:True, ttl:None, priority:None, mandatory:False}', str(obj2))
+
+
+    def test_properties(self):
+        obj1 = PublicationRoutingKey(EquipmentIdentifier(EquipmentType.CRT, None, 1), EquipmentFilter.any())
+        obj2 = DeliveryPolicy.find(obj1).properties('application/json')
+        self.assertEqual(pika.DeliveryMode.Transient.value, obj2.delivery_mode)
+        self.assertEqual('10000', obj2.expiration)
+
+
+    def test_priority_properties(self):
+        obj1 = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                     EquipmentFilter.construct_from_jdict('CRT.*.1'))
+        obj2 = DeliveryPolicy.find(obj1).properties('application/json', MQPriority.URGENT)
+        self.assertEqual(1, obj2.priority)
+
+
+    def test_assessor(self):
+        obj1 = DeliveryPolicy(True, None, None, False, assessor=lambda message: (MQPriority.URGENT, 2.0))
+        obj2 = obj1.properties_for(Message(self.__ROUTING_KEY, {}), 'application/json')
+        self.assertEqual(1, obj2.priority)
+        self.assertEqual('2000', obj2.expiration)
+        self.assertIsNotNone(obj2.timestamp)
+
+
+    def test_assessor_once(self):
+        assessed = []
+
+        def assessor(message):
+            assessed.append(message)
+            return MQPriority.URGENT, 2.0
+
+        obj1 = DeliveryPolicy(True, None, None, False, assessor=assessor)
+        obj1.properties_for(Message(self.__ROUTING_KEY, {}), 'application/json')
+        self.assertEqual(1, len(assessed))
+
+
+    def test_assessor_defaults(self):
+        obj1 = DeliveryPolicy(True, 5.0, MQPriority.NORMAL, False, assessor=lambda message: (None, None))
+        obj2 = obj1.properties_for(Message(self.__ROUTING_KEY, {}), 'application/json')
+        self.assertEqual(MQPriority.NORMAL, obj2.priority)
+        self.assertEqual('5000', obj2.expiration)
+        self.assertIsNone(obj2.timestamp)
+
+
+    def test_assessor_fails(self):
+        obj1 = DeliveryPolicy(True, 5.0, MQPriority.NORMAL, False, assessor=lambda message: message.body['x'])
+        obj2 = Message(self.__ROUTING_KEY, {})
+        self.assertEqual(MQPriority.NORMAL, obj1.priority_of(obj2))
+        self.assertEqual(5.0, obj1.ttl_of(obj2))
+        self.assertEqual('5000', obj1.properties_for(obj2, 'application/json').expiration)
+
+
+    def test_register(self):
+        obj1 = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                     EquipmentFilter.construct_from_jdict('TRN.*.1'))
+        obj2 = DeliveryPolicy(True, None, None, True)
+
+        DeliveryPolicy.register(EquipmentType.TRN, MessageKind.COMMAND, obj2)
+        self.addCleanup(DeliveryPolicy.init)
+
+        self.assertIs(obj2, DeliveryPolicy.find(obj1))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_flow_control.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import threading
+import time
+import unittest
+
+from mrcs_control.messaging.flow_control import FlowControl
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestFlowControl(unittest.TestCase):
+
+    def setUp(self):
+        self.notified = []
+
+
+    def test_construct(self):
+        obj1 = FlowControl()
+        self.assertEqual('FlowControl:{is_blocked:False, reason:None, blocks:0, blocked_time:0.0, listeners:0}',
+                         str(obj1))
+
+
+    def test_blocked(self):
+        obj1 = FlowControl()
+        obj1.add_listener(self.notified.append)
+
+        obj1.blocked('low on memory')
+        obj1.blocked('low on memory')
+
+        self.assertTrue(obj1.is_blocked)
+        self.assertEqual('low on memory', obj1.reason)
+        self.assertEqual(1, obj1.blocks)
+        self.assertEqual([True], self.notified)
+
+
+    def test_unblocked(self):
+        obj1 = FlowControl()
+        obj1.add_listener(self.notified.append)
+
+        obj1.unblocked()
+        self.assertEqual([], self.notified)
+
+        obj1.blocked(None)
+        time.sleep(0.01)
+        obj1.unblocked()
+
+        self.assertFalse(obj1.is_blocked)
+        self.assertEqual([True, False], self.notified)
+        self.assertGreater(obj1.blocked_time, 0.0)
+
+
+    def test_wait_until_unblocked(self):
+        obj1 = FlowControl()
+        self.assertTrue(obj1.wait_until_unblocked(0.0))
+
+        obj1.blocked(None)
+        self.assertFalse(obj1.wait_until_unblocked(0.01))
+
+        threading.Timer(0.01, obj1.unblocked).start()       # as by the thread that services the connection
+        self.assertTrue(obj1.wait_until_unblocked(1.0))
+
+
+    def test_remove_listener(self):
+        obj1 = FlowControl()
+        obj1.add_listener(self.notified.append)
+        obj1.remove_listener(self.notified.append)
+        obj1.remove_listener(self.notified.append)
+
+        obj1.blocked(None)
+        self.assertEqual([], self.notified)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
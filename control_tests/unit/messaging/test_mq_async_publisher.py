@@ -0,0 +1,204 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_mq_async_publisher.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import unittest
+
+from pika.exceptions import ChannelClosedByBroker, ChannelClosedByClient
+from pika.frame import Method
+from pika.spec import Basic
+
+from mrcs_control.messaging.mq_async_client import MQAsyncPublisher
+from mrcs_control.messaging.mq_client import MQMode
+from mrcs_control.sys.reconnect_strategy import ReconnectStrategy
+from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeChannel(object):
+    """
+    A stand-in for a pika channel, recording publications
+    """
+
+    def __init__(self):
+        self.published = []
+        self.on_confirmation = None
+
+
+    def add_on_close_callback(self, _callback):
+        pass
+
+
+    def add_on_return_callback(self, _callback):
+        pass
+
+
+    def exchange_declare(self, exchange, exchange_type, durable, callback):
+        callback(None)
+
+
+    def confirm_delivery(self, callback):
+        self.on_confirmation = callback
+
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        self.published.append(body)
+
+
+    def close(self):
+        pass
+
+
+    def confirm(self, delivery_tag, multiple=False):
+        self.on_confirmation(Method(1, Basic.Ack(delivery_tag=delivery_tag, multiple=multiple)))
+
+
+    def reject(self, delivery_tag, multiple=False):
+        self.on_confirmation(Method(1, Basic.Nack(delivery_tag=delivery_tag, multiple=multiple)))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestMQAsyncPublisher(unittest.IsolatedAsyncioTestCase):
+
+    __ROUTING_KEY = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                          EquipmentFilter.construct_from_jdict('MPU.001.100'))
+
+    async def asyncSetUp(self):
+        self.channel = FakeChannel()
+
+        self.publisher = MQAsyncPublisher(MQMode.TEST, max_in_flight=2)
+        self.publisher.on_channel_open(self.channel)
+
+
+    @classmethod
+    def message(cls, body):
+        return Message(cls.__ROUTING_KEY, body)
+
+
+    async def test_ack(self):
+        obj1 = await self.publisher.publish(self.message('hello'))
+        self.assertEqual(1, self.publisher.in_flight)
+
+        self.channel.confirm(1)
+        self.assertEqual(True, await obj1)
+        self.assertEqual(0, self.publisher.in_flight)
+
+
+    async def test_nack(self):
+        obj1 = await self.publisher.publish(self.message('hello'))
+
+        self.channel.reject(1)
+        self.assertEqual(False, await obj1)
+        self.assertEqual(1, self.publisher.nacked_count)
+        self.assertEqual(0, self.publisher.in_flight)
+
+
+    async def test_ack_multiple(self):
+        obj1 = await self.publisher.publish(self.message(1))
+        obj2 = await self.publisher.publish(self.message(2))
+
+        self.channel.confirm(2, multiple=True)
+        self.assertEqual([True, True], [await obj1, await obj2])
+
+
+    async def test_publish_many(self):
+        obj1 = await self.publisher.publish_many([self.message(1), self.message(2)])
+        self.assertEqual(2, len(self.channel.published))
+
+        self.channel.confirm(1)
+        self.channel.reject(2)
+        self.assertEqual([True, False], [await obj1[0], await obj1[1]])
+
+
+    async def test_publish_many_invalid(self):
+        obj1 = await self.publisher.publish_many([self.message(object()), self.message(2)])
+
+        self.assertIsNone(obj1[0])
+        self.assertEqual(1, len(self.channel.published))
+
+        self.channel.confirm(1)
+        self.assertEqual(True, await obj1[1])
+
+
+    async def test_window_bound(self):
+        await self.publisher.publish(self.message(1))
+        await self.publisher.publish(self.message(2))
+
+        obj1 = asyncio.create_task(self.publisher.publish(self.message(3)))
+        await asyncio.sleep(0.01)
+
+        self.assertFalse(obj1.done())
+        self.assertEqual(2, len(self.channel.published))
+
+        self.channel.confirm(1)
+        obj2 = await asyncio.wait_for(obj1, 1.0)
+
+        self.assertEqual(3, len(self.channel.published))
+        self.assertEqual(2, self.publisher.in_flight)
+        self.assertFalse(obj2.done())
+
+
+    async def test_abandon_on_channel_close(self):
+        obj1 = await self.publisher.publish(self.message(1))
+        obj2 = await self.publisher.publish(self.message(2))
+
+        self.publisher.on_channel_closed(self.channel, ChannelClosedByClient(200, 'OK'))
+
+        self.assertEqual([False, False], [await obj1, await obj2])
+        self.assertEqual(0, self.publisher.in_flight)
+        self.assertIsNone(self.publisher.channel)
+
+
+    async def test_reconnect_resets_delivery_tags(self):
+        obj1 = await self.publisher.publish(self.message(1))
+        self.publisher.on_channel_closed(self.channel, ChannelClosedByClient(200, 'OK'))
+
+        channel = FakeChannel()
+        self.publisher.on_channel_open(channel)
+
+        obj2 = await self.publisher.publish(self.message(2))
+        obj3 = await self.publisher.publish(self.message(3))
+
+        channel.confirm(1)                                  # tags restart at 1 on the new channel
+        self.assertEqual(False, await obj1)
+        self.assertEqual(True, await obj2)
+        self.assertFalse(obj3.done())
+
+        channel.confirm(2)
+        self.assertEqual(True, await obj3)
+        self.assertEqual(0, self.publisher.in_flight)
+
+
+    async def test_reconnect_exhausted(self):
+        obj1 = MQAsyncPublisher(MQMode.TEST, reconnect_strategy=ReconnectStrategy(0.0, 0.0, 1.0, 0.0, 0))
+        obj1.on_channel_open(self.channel)
+
+        obj2 = await obj1.publish(self.message(1))
+        obj1.on_channel_closed(self.channel, ChannelClosedByBroker(320, 'CONNECTION_FORCED'))
+
+        self.assertEqual(False, await obj2)
+        await asyncio.sleep(0.01)                           # the reconnect task gives up
+
+        self.assertIsInstance(obj1.failure, ConnectionError)
+        self.assertFalse(obj1.is_connected)
+
+        with self.assertRaises(ConnectionError):
+            await asyncio.wait_for(obj1.publish(self.message(2)), 1.0)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,314 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_mq_async_subscriber.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import time
+import unittest
+
+import pika
+from pika.spec import Basic
+
+from mrcs_control.messaging.dead_lettering import DeadLettering
+from mrcs_control.messaging.dedup_cache import DedupCache
+from mrcs_control.messaging.mq_async_client import MQAsyncSubscriber
+from mrcs_control.messaging.mq_client import MQMode
+from mrcs_control.messaging.mq_codec import MQEncoding
+from mrcs_control.messaging.mq_enums import MQTopology
+from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier
+from mrcs_core.data.json import JSONify
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeChannel(object):
+    """
+    A stand-in for a pika channel, recording acks and nacks
+    """
+
+    def __init__(self):
+        self.acked = []
+        self.nacked = []
+
+
+    def add_on_close_callback(self, _callback):
+        pass
+
+
+    def add_on_return_callback(self, _callback):
+        pass
+
+
+    def add_on_cancel_callback(self, _callback):
+        pass
+
+
+    def exchange_declare(self, **_kwargs):
+        pass                                        # the test starts consuming directly
+
+
+    def confirm_delivery(self, _callback):
+        pass
+
+
+    def basic_qos(self, prefetch_count):
+        pass
+
+
+    def basic_consume(self, _queue_name, _on_message):
+        pass
+
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acked.append((delivery_tag, multiple))
+
+
+    def basic_nack(self, delivery_tag, requeue=True):
+        self.nacked.append((delivery_tag, requeue))
+
+
+    def close(self):
+        pass
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestMQAsyncSubscriber(unittest.IsolatedAsyncioTestCase):
+
+    __ID = EquipmentIdentifier.construct_from_jdict('TST.001.009')
+    __TARGET = EquipmentFilter.construct_from_jdict('MPU.001.100')
+
+    async def asyncSetUp(self):
+        self.channel = FakeChannel()
+
+        self.started = []
+        self.finished = []
+        self.deadlines = []
+        self.gates = {}                             # body: asyncio.Event
+        self.delivery_tag = 0
+
+
+    def subscriber(self, max_concurrency, on_message=None, dedup=None):
+        on_message = self.on_message if on_message is None else on_message
+        subscriber = MQAsyncSubscriber(MQMode.TEST, self.__ID, MQTopology.MULTIPLE.value, on_message,
+                                       prefetch_count=8, max_concurrency=max_concurrency, dedup=dedup)
+
+        subscriber.on_channel_open(self.channel)
+        subscriber.start_publishing(notify_startup=False)
+        subscriber.start_consuming()
+
+        return subscriber
+
+
+    async def on_message(self, message, deadline):
+        self.started.append(message.body)
+        self.deadlines.append(deadline)
+
+        gate = self.gates.get(message.body)
+        if gate is not None:
+            await gate.wait()
+
+        self.finished.append(message.body)
+
+
+    def deliver(self, subscriber, source, body, timestamp=None, expiration=None, headers=None, origin=None):
+        routing_key = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict(source), self.__TARGET)
+        payload = MQEncoding.JSON.value.encode(Message(routing_key, body, origin=origin).payload)
+
+        self.delivery_tag += 1
+        delivery = Basic.Deliver(delivery_tag=self.delivery_tag, routing_key=JSONify.as_jdict(routing_key))
+        properties = pika.BasicProperties(content_type=MQEncoding.JSON.value.content_type, timestamp=timestamp,
+                                          expiration=expiration, headers=headers)
+
+        subscriber.on_consume(self.channel, delivery, properties, payload)
+
+
+    def gate(self, body):
+        self.gates[body] = asyncio.Event()
+        return self.gates[body]
+
+
+    @staticmethod
+    async def settle():
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+
+    async def test_source_order(self):
+        obj1 = self.subscriber(4)
+        obj2 = self.gate('a1')
+
+        self.deliver(obj1, 'TST.001.001', 'a1')
+        self.deliver(obj1, 'TST.001.001', 'a2')
+        self.deliver(obj1, 'TST.001.002', 'b1')
+        await self.settle()
+
+        self.assertEqual(['a1', 'b1'], self.started)      # a2 waits for a1, b1 does not
+
+        obj2.set()
+        await self.settle()
+
+        self.assertEqual(['a1', 'b1', 'a2'], self.started)
+        self.assertEqual(['b1', 'a1', 'a2'], self.finished)
+
+
+    async def test_source_order_after_failure(self):
+        async def on_message(message, _deadline):
+            self.started.append(message.body)
+            if message.body == 'a1':
+                raise ValueError('failed')
+
+        obj1 = self.subscriber(4, on_message=on_message)
+
+        self.deliver(obj1, 'TST.001.001', 'a1')
+        self.deliver(obj1, 'TST.001.001', 'a2')
+        await self.settle()
+
+        obj1.flush_acks()
+        self.assertEqual(['a1', 'a2'], self.started)
+        self.assertEqual([(2, True)], self.channel.acked)         # a failure without dead-lettering is discarded
+
+
+    async def test_concurrency_bound(self):
+        obj1 = self.subscriber(2)
+        obj2 = [self.gate(body) for body in ('a1', 'b1', 'c1')]
+
+        self.deliver(obj1, 'TST.001.001', 'a1')
+        self.deliver(obj1, 'TST.001.002', 'b1')
+        self.deliver(obj1, 'TST.001.003', 'c1')
+        await self.settle()
+
+        self.assertEqual(['a1', 'b1'], self.started)
+
+        obj2[0].set()
+        await self.settle()
+
+        self.assertEqual(['a1', 'b1', 'c1'], self.started)
+        self.assertEqual(['a1'], self.finished)
+
+        obj2[1].set()
+        obj2[2].set()
+        await self.settle()
+
+        self.assertEqual(['a1', 'b1', 'c1'], self.finished)
+
+
+    async def test_acked(self):
+        obj1 = self.subscriber(2)
+
+        self.deliver(obj1, 'TST.001.001', 'a1')
+        self.deliver(obj1, 'TST.001.002', 'b1')
+        await self.settle()
+
+        obj1.flush_acks()
+        self.assertEqual([(2, True)], self.channel.acked)
+
+
+    async def test_undecodable_discarded(self):
+        obj1 = self.subscriber(2)
+
+        self.delivery_tag += 1
+        delivery = Basic.Deliver(delivery_tag=self.delivery_tag, routing_key='TST.001.001.MPU.001.100')
+        properties = pika.BasicProperties(content_type=MQEncoding.JSON.value.content_type)
+        obj1.on_consume(self.channel, delivery, properties, b'not json')
+
+        self.deliver(obj1, 'TST.001.001', 'a2')
+        await self.settle()
+
+        obj1.flush_acks()
+        self.assertEqual([(1, False)], self.channel.nacked)
+        self.assertEqual([(2, True)], self.channel.acked)         # the failed head does not hold back the run
+
+
+    async def test_deadline_passed(self):
+        obj1 = self.subscriber(2)
+        obj2 = int(time.time())
+
+        self.deliver(obj1, 'TST.001.001', 'a1', timestamp=obj2, expiration='30000')
+        self.deliver(obj1, 'TST.001.001', 'a2')
+        await self.settle()
+
+        self.assertEqual(['a1', 'a2'], self.started)
+        self.assertAlmostEqual(obj2 + 30.0, self.deadlines[0], delta=5.0)
+        self.assertIsNone(self.deadlines[1])
+
+
+    async def test_expired_dropped(self):
+        obj1 = self.subscriber(2)
+
+        self.deliver(obj1, 'TST.001.001', 'a1', timestamp=int(time.time()) - 60, expiration='1000')
+        await self.settle()
+
+        obj1.flush_acks()
+        self.assertEqual([], self.started)
+        self.assertEqual(1, obj1.expired)
+        self.assertEqual([(1, True)], self.channel.acked)
+
+
+    async def test_expired_retry_dropped(self):
+        obj1 = self.subscriber(2)
+        obj2 = {DeadLettering.RETRIES_HEADER: 1, DeadLettering.EXPIRATION_HEADER: '1000'}
+
+        self.deliver(obj1, 'TST.001.001', 'a1', timestamp=int(time.time()) - 60, headers=obj2)
+        await self.settle()
+
+        self.assertEqual([], self.started)
+        self.assertEqual(1, obj1.expired)
+
+
+    def test_is_expired(self):
+        self.assertFalse(MQAsyncSubscriber.is_expired(None))
+        self.assertFalse(MQAsyncSubscriber.is_expired(time.time() + 60.0))
+        self.assertTrue(MQAsyncSubscriber.is_expired(time.time() - 1.0))
+
+
+    async def test_redelivery_skipped(self):
+        obj1 = self.subscriber(2, dedup=DedupCache(10, 60.0))
+
+        self.deliver(obj1, 'TST.001.001', 'a1', origin='12345678')
+        await self.settle()
+
+        self.deliver(obj1, 'TST.001.001', 'a1', origin='12345678')
+        await self.settle()
+
+        self.assertEqual(['a1'], self.started)
+        self.assertEqual(1, obj1.dedup.duplicates)
+
+
+    async def test_relay_not_duplicate(self):
+        obj1 = self.subscriber(2, dedup=DedupCache(10, 60.0))
+
+        self.deliver(obj1, 'TST.001.001', 'a1', origin='12345678')
+        await self.settle()
+
+        self.deliver(obj1, 'TST.001.002', 'a1', origin='12345678')      # relayed, keeping its origin
+        await self.settle()
+
+        self.assertEqual(['a1', 'a1'], self.started)
+        self.assertEqual(0, obj1.dedup.duplicates)
+
+
+    async def test_own_message_skipped(self):
+        obj1 = self.subscriber(2)
+
+        self.deliver(obj1, 'TST.001.009', 'a1')
+        await self.settle()
+
+        obj1.flush_acks()
+        self.assertEqual([], self.started)
+        self.assertEqual([(1, True)], self.channel.acked)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
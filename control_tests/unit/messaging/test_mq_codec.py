@@ -0,0 +1,86 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_mq_codec.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import unittest
+
+from mrcs_control.messaging.mq_codec import MQEncoding
+from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestMQCodec(unittest.TestCase):
+
+    __ROUTING_KEY = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                          EquipmentFilter.construct_from_jdict('MPU.001.100'))
+
+    def test_find_json(self):
+        obj1 = MQEncoding.find('application/json')
+        self.assertEqual(MQEncoding.JSON, obj1)
+
+
+    def test_find_msgpack(self):
+        obj1 = MQEncoding.find('application/msgpack')
+        self.assertEqual(MQEncoding.MSGPACK, obj1)
+
+
+    def test_find_default(self):
+        obj1 = MQEncoding.find(None)
+        self.assertEqual(MQEncoding.JSON, obj1)
+
+
+    def test_json_encode(self):
+        obj1 = MQEncoding.JSON.value.encode({'body': 'hello'})
+        self.assertEqual('{"body": "hello"}', obj1)
+
+
+    def test_json_round_trip(self):
+        obj1 = Message(self.__ROUTING_KEY, {'mpu_address': 3, 'speeds': [1, 2]}, origin='12345678')
+        obj2 = MQEncoding.JSON.value.message(self.__ROUTING_KEY, MQEncoding.JSON.value.encode(obj1.payload))
+
+        self.assertEqual('12345678', obj2.origin)
+        self.assertEqual({'mpu_address': 3, 'speeds': [1, 2]}, obj2.body)
+
+
+    @unittest.skipUnless(MQEncoding.MSGPACK.value.is_available(), 'msgpack is not installed')
+    def test_msgpack_round_trip(self):
+        obj1 = Message(self.__ROUTING_KEY, {'mpu_address': 3, 'speeds': [1, 2]}, origin='12345678')
+        obj2 = MQEncoding.MSGPACK.value.encode(obj1.payload)
+        self.assertIsInstance(obj2, bytes)
+
+        obj3 = MQEncoding.MSGPACK.value.message(self.__ROUTING_KEY, obj2)
+        self.assertEqual('12345678', obj3.origin)
+        self.assertEqual({'mpu_address': 3, 'speeds': [1, 2]}, obj3.body)
+        self.assertIs(self.__ROUTING_KEY, obj3.routing_key)
+
+
+    @unittest.skipUnless(MQEncoding.MSGPACK.value.is_available(), 'msgpack is not installed')
+    def test_msgpack_matches_json(self):
+        obj1 = Message(self.__ROUTING_KEY, 'hello', origin='12345678')
+
+        obj2 = MQEncoding.JSON.value.message(self.__ROUTING_KEY, MQEncoding.JSON.value.encode(obj1.payload))
+        obj3 = MQEncoding.MSGPACK.value.message(self.__ROUTING_KEY, MQEncoding.MSGPACK.value.encode(obj1.payload))
+
+        self.assertEqual((obj2.origin, obj2.body), (obj3.origin, obj3.body))
+
+
+    def test_compact(self):
+        obj1 = MQEncoding.compact()
+        obj2 = MQEncoding.MSGPACK if MQEncoding.MSGPACK.value.is_available() else MQEncoding.JSON
+        self.assertEqual(obj2, obj1)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_mq_connection_pool.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import threading
+import unittest
+
+from pika.frame import Method
+from pika.spec import Connection
+
+from mrcs_control.messaging.flow_control import FlowControl
+from mrcs_control.messaging.mq_connection_pool import MQConnectionPool
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeChannel(object):
+    """
+    A stand-in for a pika channel
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeBlockingConnection(object):
+    """
+    A stand-in for a pika.BlockingConnection
+    """
+
+    def __init__(self):
+        self.is_open = True
+        self.on_blocked = None
+
+
+    @property
+    def is_closed(self):
+        return not self.is_open
+
+
+    def add_on_connection_blocked_callback(self, callback):
+        self.on_blocked = callback
+
+
+    def add_on_connection_unblocked_callback(self, _callback):
+        pass
+
+
+    def channel(self):
+        return FakeChannel(self)
+
+
+    def close(self):
+        self.is_open = False
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeAsyncConnection(object):
+    """
+    A stand-in for a PooledAsyncConnection
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.flow_control = FlowControl()
+        self.channels = 0
+        self.closed = False
+
+
+    @property
+    def is_open(self):
+        return not self.closed
+
+
+    def channel(self, _on_channel_open, _on_connection_closed, _on_open_error):
+        self.channels += 1
+
+
+    def close(self):
+        self.closed = True
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakePool(MQConnectionPool):
+    """
+    A connection pool that opens fake connections
+    """
+
+    def __init__(self):
+        super().__init__('127.0.0.1', 5672, 2)
+        self.opened = []
+
+
+    def _blocking_connection(self):
+        connection = FakeBlockingConnection()
+        self.opened.append(connection)
+
+        return connection
+
+
+    def _async_connection(self, loop):
+        connection = FakeAsyncConnection(loop)
+        self.opened.append(connection)
+
+        return connection
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestMQConnectionPool(unittest.TestCase):
+
+    @staticmethod
+    def in_thread(func):
+        results = []
+
+        thread = threading.Thread(target=lambda: results.append(func()))
+        thread.start()
+        thread.join()
+
+        return results[0]
+
+
+    def test_blocking_shared_within_thread(self):
+        obj1 = FakePool()
+        obj2 = obj1.blocking_channel()
+        obj3 = obj1.blocking_channel()
+
+        self.assertIs(obj2.connection, obj3.connection)
+        self.assertEqual(1, len(obj1.opened))
+
+
+    def test_blocking_per_thread(self):
+        obj1 = FakePool()
+        obj2 = obj1.blocking_channel()
+        obj3 = self.in_thread(obj1.blocking_channel)
+
+        self.assertIsNot(obj2.connection, obj3.connection)
+        self.assertEqual(2, len(obj1.opened))
+
+
+    def test_blocking_orphan_closed(self):
+        obj1 = FakePool()
+        obj2 = self.in_thread(obj1.blocking_channel)
+
+        obj1.blocking_channel()
+        self.assertFalse(obj2.connection.is_open)
+
+
+    def test_blocking_reopened(self):
+        obj1 = FakePool()
+        obj2 = obj1.blocking_channel()
+        obj2.connection.close()
+
+        obj3 = obj1.blocking_channel()
+        self.assertIsNot(obj2.connection, obj3.connection)
+        self.assertTrue(obj3.connection.is_open)
+
+
+    def test_blocking_flow_control(self):
+        obj1 = FakePool()
+        obj2 = obj1.blocking_channel()
+        obj3 = obj1.blocking_flow_control(obj2)
+
+        obj2.connection.on_blocked(obj2.connection, Method(0, Connection.Blocked(reason='low on memory')))
+        self.assertEqual('low on memory', obj3.reason)
+        self.assertIsNone(obj1.blocking_flow_control(FakeChannel(FakeBlockingConnection())))
+
+
+    def test_async_per_loop(self):
+        obj1 = FakePool()
+
+        async def connect():
+            return obj1.async_channel(None, None)
+
+        obj2 = asyncio.run(connect())
+        obj3 = asyncio.run(connect())
+
+        self.assertIsNot(obj2, obj3)
+        self.assertEqual(4, len(obj1.opened))
+        self.assertEqual('MQConnectionPool:{url:amqp://127.0.0.1:5672/, size:2, blocking_open:0, async_open:2}',
+                         str(obj1))
+
+
+    def test_async_round_robin(self):
+        obj1 = FakePool()
+
+        async def connect():
+            return [obj1.async_channel(None, None) for _ in range(3)]
+
+        obj2 = asyncio.run(connect())
+        self.assertIs(obj2[0], obj2[2])
+        self.assertIsNot(obj2[0], obj2[1])
+
+
+    def test_close_all(self):
+        obj1 = FakePool()
+        obj2 = obj1.blocking_channel()
+
+        obj1.close_all()
+        self.assertFalse(obj2.connection.is_open)
+        self.assertEqual('MQConnectionPool:{url:amqp://127.0.0.1:5672/, size:2, blocking_open:0, async_open:0}',
+                         str(obj1))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,322 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_mq_loopback.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import threading
+import unittest
+
+from mrcs_control.messaging.dedup_cache import DedupCache
+from mrcs_control.messaging.mq_codec import MQEncoding
+from mrcs_control.messaging.mq_enums import MQMode, MQTopology
+from mrcs_control.messaging.mq_loopback import LoopbackBroker, MQAsyncLoopbackPublisher, \
+    MQAsyncLoopbackSubscriber, MQLoopbackPublisher, MQLoopbackSubscriber
+from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey, SubscriptionRoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestMQLoopback(unittest.TestCase):
+
+    __SOURCE = EquipmentIdentifier.construct_from_jdict('TST.001.001')
+    __TARGET = EquipmentFilter.construct_from_jdict('MPU.001.100')
+
+    def setUp(self):
+        LoopbackBroker.kill()
+
+
+    def test_topic_exact(self):
+        self.assertTrue(LoopbackBroker.topic_matches('a.b'.split('.'), 'a.b'.split('.')))
+        self.assertFalse(LoopbackBroker.topic_matches('a.b'.split('.'), 'a.c'.split('.')))
+
+
+    def test_topic_star(self):
+        self.assertTrue(LoopbackBroker.topic_matches('a.*.c'.split('.'), 'a.b.c'.split('.')))
+        self.assertFalse(LoopbackBroker.topic_matches('a.*.c'.split('.'), 'a.c'.split('.')))
+
+
+    def test_topic_hash(self):
+        self.assertTrue(LoopbackBroker.topic_matches('#'.split('.'), 'a.b.c'.split('.')))
+        self.assertTrue(LoopbackBroker.topic_matches('a.#.c'.split('.'), 'a.c'.split('.')))
+        self.assertTrue(LoopbackBroker.topic_matches('a.#.c'.split('.'), 'a.b.b.c'.split('.')))
+        self.assertFalse(LoopbackBroker.topic_matches('a.#.c'.split('.'), 'a.b.d'.split('.')))
+
+
+    def test_publish_unrouted(self):
+        obj1 = LoopbackBroker.instance()
+        self.assertFalse(obj1.publish('mrcs.test', 'a.b', 'message'))
+
+
+    def test_publish_backlog(self):
+        obj1 = LoopbackBroker.instance()
+        obj2 = obj1.queue_declare('q1')
+        obj1.queue_bind('mrcs.test', 'q1', 'a.*')
+
+        self.assertTrue(obj1.publish('mrcs.test', 'a.b', 'message'))
+        self.assertEqual(1, obj2.depth)
+
+        received = []
+        obj2.add_consumer(received.append)
+        self.assertEqual(['message'], received)
+        self.assertEqual(0, obj2.depth)
+
+
+    def test_competing_consumers(self):
+        obj1 = LoopbackBroker.instance()
+        obj2 = obj1.queue_declare('q1')
+        obj1.queue_bind('mrcs.test', 'q1', '#')
+
+        received1 = []
+        received2 = []
+        obj2.add_consumer(received1.append)
+        obj2.add_consumer(received2.append)
+
+        for i in range(4):
+            obj1.publish('mrcs.test', 'a.b', i)
+
+        self.assertEqual([0, 2], received1)
+        self.assertEqual([1, 3], received2)
+
+
+    def test_queue_delete(self):
+        obj1 = LoopbackBroker.instance()
+        obj1.queue_declare('q1')
+        obj1.queue_bind('mrcs.test', 'q1', '#')
+        obj1.queue_delete('q1')
+
+        self.assertFalse(obj1.publish('mrcs.test', 'a.b', 'message'))
+
+
+    def test_single_queue_per_id(self):
+        obj1 = MQLoopbackSubscriber.construct_sub(MQMode.TEST, MQTopology.SINGLE,
+                                                  EquipmentIdentifier.construct_from_jdict('TST.001.002'), print)
+        obj2 = MQLoopbackSubscriber.construct_sub(MQMode.TEST, MQTopology.SINGLE,
+                                                  EquipmentIdentifier.construct_from_jdict('TST.001.003'), print)
+
+        self.assertEqual('mrcs.test.TST.001.002.p1', obj1.queue_name)
+        self.assertEqual('mrcs.test.TST.001.003.p1', obj2.queue_name)
+
+
+    def test_unique_queue_kept(self):
+        obj1 = MQLoopbackSubscriber.construct_sub(MQMode.TEST, MQTopology.MULTIPLE,
+                                                  EquipmentIdentifier.construct_from_jdict('TST.001.002'), print)
+
+        self.assertEqual(obj1.queue_name, obj1.queue_name)
+
+
+    def test_round_trip(self):
+        received = []
+        delivered = threading.Event()
+
+        def on_message(message):
+            received.append(message)
+            delivered.set()
+
+        obj1 = MQLoopbackSubscriber.construct_sub(MQMode.TEST, MQTopology.MULTIPLE,
+                                                  EquipmentIdentifier.construct_from_jdict('TST.001.002'), on_message)
+        obj1.connect()
+
+        routing_key = SubscriptionRoutingKey(EquipmentFilter.any(), self.__TARGET)
+        threading.Thread(target=obj1.subscribe, args=(routing_key,), daemon=True).start()
+
+        obj2 = MQLoopbackPublisher.construct_pub(MQMode.TEST)
+        obj2.connect()
+
+        for _ in range(100):                        # the subscriber binds its queue in its own thread
+            if obj2.publish(Message(PublicationRoutingKey(self.__SOURCE, self.__TARGET), {'a': 1})):
+                break
+            threading.Event().wait(0.01)
+
+        self.assertTrue(delivered.wait(1.0))
+        self.assertEqual({'a': 1}, received[0].body)
+        self.assertEqual(PublicationRoutingKey(self.__SOURCE, self.__TARGET), received[0].routing_key)
+
+
+    def test_encoding_unavailable(self):
+        if MQEncoding.MSGPACK.value.is_available():
+            self.skipTest('msgpack is installed')
+
+        with self.assertRaises(ValueError):
+            MQLoopbackPublisher.construct_pub(MQMode.TEST, encoding=MQEncoding.MSGPACK)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestMQAsyncLoopback(unittest.IsolatedAsyncioTestCase):
+
+    __SOURCE = EquipmentIdentifier.construct_from_jdict('TST.001.001')
+    __TARGET = EquipmentFilter.construct_from_jdict('MPU.001.100')
+
+    def setUp(self):
+        LoopbackBroker.kill()
+
+
+    @classmethod
+    def message(cls, body):
+        return Message(PublicationRoutingKey(cls.__SOURCE, cls.__TARGET), body)
+
+
+    async def test_round_trip(self):
+        received = []
+
+        obj1 = MQAsyncLoopbackSubscriber.construct_sub(MQMode.TEST, MQTopology.MULTIPLE,
+                                                       EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                                       lambda message, _deadline: received.append(message),
+                                                       SubscriptionRoutingKey(EquipmentFilter.any(), self.__TARGET))
+        obj1.connect()
+
+        obj2 = MQAsyncLoopbackPublisher.construct_pub(MQMode.TEST, max_in_flight=2, encoding=MQEncoding.JSON)
+        obj2.connect()
+
+        obj3 = await obj2.publish(self.message({'a': 1}))
+        self.assertEqual(True, await obj3)
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        self.assertEqual([{'a': 1}], [message.body for message in received])
+        self.assertEqual(2, obj2.max_in_flight)
+        self.assertEqual(0, obj2.in_flight)
+
+
+    def subscriber(self, on_message, prefetch_count=None, max_concurrency=None, dedup=None):
+        subscriber = MQAsyncLoopbackSubscriber.construct_sub(MQMode.TEST, MQTopology.MULTIPLE,
+                                                             EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                                             on_message,
+                                                             SubscriptionRoutingKey(EquipmentFilter.any(),
+                                                                                    self.__TARGET),
+                                                             prefetch_count=prefetch_count,
+                                                             max_concurrency=max_concurrency, dedup=dedup)
+        subscriber.connect()
+        self.addCleanup(subscriber.close)
+
+        return subscriber
+
+
+    @classmethod
+    def message_from(cls, source, body):
+        return Message(PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict(source), cls.__TARGET), body)
+
+
+    @staticmethod
+    async def settle():
+        for _ in range(20):
+            await asyncio.sleep(0)
+
+
+    async def test_no_round_trip(self):
+        received = []
+        self.subscriber(lambda message, _deadline: received.append(message))
+
+        obj1 = MQAsyncLoopbackPublisher.construct_pub(MQMode.TEST)
+        obj1.connect()
+
+        obj2 = self.message({'a': 1})
+        await obj1.publish(obj2)
+        await self.settle()
+
+        self.assertIs(obj2, received[0])
+
+
+    async def test_slow_source_does_not_hold_up_others(self):
+        started = []
+        finished = []
+        gate = asyncio.Event()
+
+        async def on_message(message, _deadline):
+            started.append(message.body)
+
+            if message.body == 'a1':
+                await gate.wait()
+
+            finished.append(message.body)
+
+        self.subscriber(on_message, prefetch_count=4, max_concurrency=2)
+
+        obj1 = MQAsyncLoopbackPublisher.construct_pub(MQMode.TEST)
+        obj1.connect()
+
+        for source, body in (('TST.001.001', 'a1'), ('TST.001.001', 'a2'),
+                             ('TST.001.003', 'b1'), ('TST.001.003', 'b2')):
+            await obj1.publish(self.message_from(source, body))
+
+        await self.settle()
+        self.assertEqual(['b1', 'b2'], finished)        # the other source proceeds...
+        self.assertNotIn('a2', started)                 # ...but a source's messages stay in order
+
+        gate.set()
+        await self.settle()
+        self.assertEqual(['b1', 'b2', 'a1', 'a2'], finished)
+
+
+    async def test_prefetch_count(self):
+        started = []
+        gate = asyncio.Event()
+
+        async def on_message(message, _deadline):
+            started.append(message.body)
+            await gate.wait()
+
+        self.subscriber(on_message, prefetch_count=2, max_concurrency=4)
+
+        obj1 = MQAsyncLoopbackPublisher.construct_pub(MQMode.TEST)
+        obj1.connect()
+
+        for source in ('TST.001.001', 'TST.001.003', 'TST.001.004'):
+            await obj1.publish(self.message_from(source, source))
+
+        await self.settle()
+        self.assertEqual(2, len(started))               # the third is held back
+
+        gate.set()
+        await self.settle()
+        self.assertEqual(3, len(started))
+
+
+    async def test_deduplicate(self):
+        received = []
+        self.subscriber(lambda message, _deadline: received.append(message), dedup=DedupCache.construct())
+
+        obj1 = MQAsyncLoopbackPublisher.construct_pub(MQMode.TEST)
+        obj1.connect()
+
+        obj2 = self.message({'a': 1})
+        await obj1.publish(obj2)
+        await self.settle()
+
+        await obj1.publish(obj2)                        # for example, relayed by another node
+        await self.settle()
+
+        self.assertEqual(1, len(received))
+
+
+    async def test_unrouted(self):
+        obj1 = MQAsyncLoopbackPublisher.construct_pub(MQMode.TEST)
+        obj1.connect()
+
+        obj2 = await obj1.publish(self.message({'a': 1}))
+        self.assertEqual(False, await obj2)
+
+
+    async def test_single_queue_per_id(self):
+        obj1 = MQAsyncLoopbackSubscriber.construct_sub(MQMode.TEST, MQTopology.SINGLE,
+                                                       EquipmentIdentifier.construct_from_jdict('TST.001.002'), print)
+        obj2 = MQAsyncLoopbackSubscriber.construct_sub(MQMode.TEST, MQTopology.SINGLE,
+                                                       EquipmentIdentifier.construct_from_jdict('TST.001.003'), print)
+
+        self.assertNotEqual(obj1.queue_name, obj2.queue_name)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_mq_manager.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import unittest
+
+import pika
+from pika.spec import Basic
+
+from mrcs_control.messaging.dead_lettering import DeadLettering
+from mrcs_control.messaging.mq_client import MQManager
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeChannel(object):
+    """
+    A stand-in for a pika BlockingChannel, holding the messages on a legacy queue
+    """
+
+    def __init__(self, *routing_keys):
+        self.waiting = [(Basic.GetOk(delivery_tag=tag, routing_key=routing_key), pika.BasicProperties(), b'{}')
+                        for tag, routing_key in enumerate(routing_keys, start=1)]
+
+        self.published = []
+        self.acked = []
+        self.deleted = []
+
+
+    def queue_declare(self, queue, passive=False):
+        pass
+
+
+    def confirm_delivery(self):
+        pass
+
+
+    def basic_get(self, queue):
+        return self.waiting.pop(0) if self.waiting else (None, None, None)
+
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        self.published.append((routing_key, properties))
+
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acked.append(delivery_tag)
+
+
+    def queue_delete(self, queue, if_unused=False, if_empty=False):
+        self.deleted.append(queue)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestMQManager(unittest.TestCase):
+
+    def test_migrate(self):
+        obj1 = FakeChannel('TST.001.001.MPU.001.100', 'TST.001.002.MPU.001.100')
+
+        self.assertEqual(2, MQManager.migrate(obj1, 'mrcs.test.CRT.001.002', 'mrcs.test.CRT.001.002.p1'))
+
+        self.assertEqual(['mrcs.test.CRT.001.002.p1'] * 2, [routing_key for routing_key, _ in obj1.published])
+        self.assertEqual(['TST.001.001.MPU.001.100', 'TST.001.002.MPU.001.100'],
+                         [DeadLettering.routing_key('', properties) for _, properties in obj1.published])
+        self.assertEqual([1, 2], obj1.acked)
+        self.assertEqual(['mrcs.test.CRT.001.002'], obj1.deleted)
+
+
+    def test_migrate_empty(self):
+        obj1 = FakeChannel()
+
+        self.assertEqual(0, MQManager.migrate(obj1, 'mrcs.test.CRT.001.002', 'mrcs.test.CRT.001.002.p1'))
+        self.assertEqual(['mrcs.test.CRT.001.002'], obj1.deleted)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_mq_publisher.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import threading
+import unittest
+
+from mrcs_control.messaging.flow_control import FlowControl
+from mrcs_control.messaging.mq_client import MQMode, MQPublisher
+from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeChannel(object):
+    """
+    A stand-in for a pika BlockingChannel, recording publications
+    """
+
+    def __init__(self):
+        self.published = []
+
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        self.published.append((routing_key, body))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakePublisher(MQPublisher):
+    """
+    A publisher on a fake channel, serviced by another thread
+    """
+
+    def __init__(self, channel):
+        super().__init__(MQMode.TEST)
+        self.__fake_channel = channel
+        self.__fake_flow_control = FlowControl()
+
+
+    @property
+    def channel(self):
+        return self.__fake_channel
+
+
+    @property
+    def flow_control(self):
+        return self.__fake_flow_control
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestMQPublisher(unittest.TestCase):
+
+    __ROUTING_KEY = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                          EquipmentFilter.construct_from_jdict('MPU.001.100'))
+
+    def setUp(self):
+        self.channel = FakeChannel()
+        self.publisher = FakePublisher(self.channel)
+
+
+    @classmethod
+    def message(cls, body):
+        return Message(cls.__ROUTING_KEY, body)
+
+
+    def test_publish_many(self):
+        obj1 = self.publisher.publish_many([self.message(1), self.message(2)])
+
+        self.assertEqual([True, True], obj1)
+        self.assertEqual(2, len(self.channel.published))
+        self.assertEqual(['TST.001.002.MPU.001.100'] * 2, [routing_key for routing_key, _ in self.channel.published])
+
+
+    def test_publish_many_invalid(self):
+        obj1 = self.publisher.publish_many([self.message(object()), self.message(2)])
+
+        self.assertEqual([False, True], obj1)
+        self.assertEqual(1, len(self.channel.published))
+
+
+    def test_publish_when_unblocked(self):
+        self.publisher.flow_control.blocked('low on memory')
+        threading.Timer(0.01, self.publisher.flow_control.unblocked).start()
+
+        self.publisher.publish(self.message(1))         # waits for the thread that services the connection
+        self.assertFalse(self.publisher.is_blocked)
+        self.assertEqual(1, len(self.channel.published))
+
+
+    def test_publish_many_empty(self):
+        self.assertEqual([], self.publisher.publish_many([]))
+        self.assertEqual([], self.channel.published)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
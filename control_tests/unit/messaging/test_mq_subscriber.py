@@ -0,0 +1,205 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_mq_subscriber.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import queue
+import threading
+import time
+import unittest
+
+import pika
+from pika.spec import Basic
+
+from mrcs_control.messaging.mq_client import MQMode, MQSubscriber
+from mrcs_control.messaging.mq_codec import MQEncoding
+from mrcs_control.messaging.mq_enums import MQTopology
+from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier
+from mrcs_core.data.json import JSONify
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeConnection(object):
+    """
+    A stand-in for a pika BlockingConnection, whose IO thread is the test
+    """
+
+    def __init__(self):
+        self.callbacks = queue.Queue()
+
+
+    def add_callback_threadsafe(self, callback):
+        self.callbacks.put(callback)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FakeChannel(object):
+    """
+    A stand-in for a pika BlockingChannel, recording acks and nacks
+    """
+
+    def __init__(self):
+        self.connection = FakeConnection()
+        self.acked = []
+        self.nacked = []
+
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acked.append(delivery_tag)
+
+
+    def basic_nack(self, delivery_tag, requeue=True):
+        self.nacked.append((delivery_tag, requeue))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestMQSubscriber(unittest.TestCase):
+
+    __ID = EquipmentIdentifier.construct_from_jdict('TST.001.009')
+    __TARGET = EquipmentFilter.construct_from_jdict('MPU.001.100')
+
+    def setUp(self):
+        self.channel = FakeChannel()
+
+        self.started = []
+        self.finished = []
+        self.gates = {}                             # body: threading.Event
+        self.delivery_tag = 0
+
+
+    def subscriber(self, max_workers):
+        subscriber = MQSubscriber(MQMode.TEST, MQTopology.MULTIPLE.value, self.__ID, self.on_message,
+                                  max_workers=max_workers)
+        self.addCleanup(subscriber.close)
+
+        return subscriber
+
+
+    def on_message(self, message):
+        self.started.append(message.body)
+
+        gate = self.gates.get(message.body)
+        if gate is not None:
+            gate.wait(5.0)
+
+        self.finished.append(message.body)
+
+
+    def deliver(self, subscriber, source, body):
+        routing_key = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict(source), self.__TARGET)
+        payload = MQEncoding.JSON.value.encode(Message(routing_key, body).payload)
+
+        self.delivery_tag += 1
+        delivery = Basic.Deliver(delivery_tag=self.delivery_tag, routing_key=JSONify.as_jdict(routing_key))
+        properties = pika.BasicProperties(content_type=MQEncoding.JSON.value.content_type)
+
+        subscriber.on_consume(self.channel, delivery, properties, payload)
+
+
+    def gate(self, body):
+        self.gates[body] = threading.Event()
+        return self.gates[body]
+
+
+    def service(self, acks, timeout=2.0):
+        # runs the callbacks passed to the IO thread, until the number of acks is reached
+        expiry = time.monotonic() + timeout
+
+        while len(self.channel.acked) < acks and time.monotonic() < expiry:
+            try:
+                self.channel.connection.callbacks.get(timeout=0.01)()
+            except queue.Empty:
+                pass
+
+
+    def test_io_thread(self):
+        obj1 = self.subscriber(None)
+
+        self.deliver(obj1, 'TST.001.001', 'a1')
+        self.assertEqual(['a1'], self.finished)
+        self.assertEqual([1], self.channel.acked)
+
+
+    def test_slow_source_does_not_hold_up_others(self):
+        obj1 = self.subscriber(2)
+        obj2 = self.gate('a1')
+
+        self.deliver(obj1, 'TST.001.001', 'a1')         # slow...
+        self.deliver(obj1, 'TST.001.001', 'a2')
+        self.deliver(obj1, 'TST.001.002', 'b1')
+        self.deliver(obj1, 'TST.001.002', 'b2')
+
+        self.service(2)
+        self.assertEqual([3, 4], self.channel.acked)    # ...but the other source proceeds
+        self.assertNotIn('a2', self.started)
+
+        obj2.set()
+        self.service(4)
+
+        self.assertEqual([3, 4, 1, 2], self.channel.acked)
+        self.assertLess(self.finished.index('a1'), self.finished.index('a2'))
+
+
+    def test_failure_settled_on_io_thread(self):
+        def on_message(message):
+            raise ValueError(message.body)
+
+        obj1 = MQSubscriber(MQMode.TEST, MQTopology.MULTIPLE.value, self.__ID, on_message, max_workers=1)
+        self.addCleanup(obj1.close)
+
+        self.deliver(obj1, 'TST.001.001', 'a1')
+        self.channel.connection.callbacks.get(timeout=2.0)()
+
+        self.assertEqual([(1, False)], self.channel.nacked)     # no dead-lettering, so discarded
+
+
+    def test_invalid_routing_key_discarded(self):
+        obj1 = self.subscriber(None)
+
+        delivery = Basic.Deliver(delivery_tag=1, routing_key='not.a.routing.key')
+        properties = pika.BasicProperties(content_type=MQEncoding.JSON.value.content_type)
+
+        obj1.on_consume(self.channel, delivery, properties, b'{}')
+        self.assertEqual([(1, False)], self.channel.nacked)
+
+
+    def test_invalid_body_discarded(self):
+        obj1 = self.subscriber(None)
+
+        routing_key = PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.001'), self.__TARGET)
+        delivery = Basic.Deliver(delivery_tag=1, routing_key=JSONify.as_jdict(routing_key))
+        properties = pika.BasicProperties(content_type=MQEncoding.JSON.value.content_type)
+
+        obj1.on_consume(self.channel, delivery, properties, b'{')
+        self.assertEqual([(1, False)], self.channel.nacked)
+        self.assertEqual([], self.finished)
+
+
+    def test_self_acknowledged(self):
+        obj1 = self.subscriber(None)
+
+        self.deliver(obj1, 'TST.001.009', 'a1')
+        self.assertEqual([1], self.channel.acked)
+        self.assertEqual([], self.finished)
+
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            self.subscriber(0)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
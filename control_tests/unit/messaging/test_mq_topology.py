@@ -24,8 +24,8 @@ class TestMQTopology(unittest.TestCase):
         obj2 = EquipmentIdentifier(EquipmentType.CRT, 1, 2)
         obj3 = obj1.value.queue_name(MQMode.TEST, obj2)
         self.assertEqual('MQMode.QueueConfiguration:{unique_name:False, durable:True, exclusive:False, '
-                         'queue_name:mrcs.test.CRT.001.002}', str(obj1.value))
-        self.assertEqual('mrcs.test.CRT.001.002', str(obj3))
+                         'max_priority:1, dead_lettering:True}', str(obj1.value))
+        self.assertEqual('mrcs.test.CRT.001.002.p1', str(obj3))
 
 
     def test_queue_multiple(self):
@@ -36,6 +36,35 @@ class TestMQTopology(unittest.TestCase):
         self.assertTrue(len(str(obj3)) == 54)
 
 
+    def test_queue_single_per_id(self):
+        obj1 = MQTopology.SINGLE
+        obj2 = obj1.value.queue_name(MQMode.TEST, EquipmentIdentifier(EquipmentType.CRT, 1, 2))
+        obj3 = obj1.value.queue_name(MQMode.TEST, EquipmentIdentifier(EquipmentType.CRT, 1, 3))
+        self.assertEqual('mrcs.test.CRT.001.002.p1', obj2)
+        self.assertEqual('mrcs.test.CRT.001.003.p1', obj3)
+
+
+    def test_queue_multiple_per_call(self):
+        obj1 = MQTopology.MULTIPLE
+        obj2 = EquipmentIdentifier(EquipmentType.CRT, 1, 2)
+        self.assertNotEqual(obj1.value.queue_name(MQMode.TEST, obj2), obj1.value.queue_name(MQMode.TEST, obj2))
+
+
+    def test_legacy_name(self):
+        obj1 = MQTopology.SINGLE.value
+        obj2 = EquipmentIdentifier.construct_from_jdict('CRT.001.002')
+
+        self.assertEqual('mrcs.test.CRT.001.002', obj1.legacy_name(MQMode.TEST, obj2))
+        self.assertEqual(obj1.queue_name(MQMode.TEST, obj2), obj1.successor_name(obj1.legacy_name(MQMode.TEST, obj2)))
+        self.assertIsNone(MQTopology.MULTIPLE.value.legacy_name(MQMode.TEST, obj2))
+
+
+    def test_successor_name(self):
+        obj1 = MQTopology.SINGLE
+        self.assertEqual('mrcs.test.CRT.001.002.p1', obj1.value.successor_name('mrcs.test.CRT.001.002'))
+        self.assertIsNone(MQTopology.MULTIPLE.value.successor_name('mrcs.test.CRT.001.002'))
+
+
 # --------------------------------------------------------------------------------------------------------------------
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_queue_depth_poller.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import unittest
+
+import httpx
+
+from mrcs_control.messaging.queue_depth_poller import QueueDepth, QueueDepthPoller
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestQueueDepthPoller(unittest.TestCase):
+
+    class Broker(object):
+        def __init__(self):
+            self.samples = []
+
+        async def queue_depths(self, queue_names=None):
+            sample = self.samples.pop(0)
+
+            if isinstance(sample, Exception):
+                raise sample
+
+            return sample
+
+
+    @staticmethod
+    def depth(name, messages, sampled, consumers=1):
+        return QueueDepth(name, messages, messages, 0, consumers, sampled)
+
+
+    def test_construct_from_jdict(self):
+        obj1 = QueueDepth.construct_from_jdict({'name': 'q', 'messages': 3, 'messages_ready': 2,
+                                                'messages_unacknowledged': 1, 'consumers': 2}, sampled=10.0)
+        self.assertEqual('QueueDepth:{name:q, messages:3, ready:2, unacked:1, consumers:2, sampled:10.0}', str(obj1))
+
+        obj2 = QueueDepth.construct_from_jdict({'name': 'q'}, sampled=10.0)
+        self.assertEqual(0, obj2.messages)
+
+
+    def test_construct(self):
+        obj1 = QueueDepthPoller.construct(self.Broker())
+        self.assertEqual('QueueDepthPoller:{interval:10.0, window:30, names:None, queues:0, is_running:False, '
+                         'samples:0, errors:0}', str(obj1))
+
+        with self.assertRaises(ValueError):
+            QueueDepthPoller(self.Broker(), 1.0, 1)
+
+
+    def test_trend(self):
+        broker = self.Broker()
+        broker.samples = [[self.depth('a', 10, 100.0), self.depth('b', 5, 100.0)],
+                          [self.depth('a', 30, 110.0), self.depth('b', 5, 110.0)],
+                          [self.depth('a', 50, 120.0)]]
+
+        obj1 = QueueDepthPoller(broker, 1.0, 2)
+        self.assertIsNone(obj1.trend('a'))
+
+        for _ in range(3):
+            asyncio.run(obj1.sample())
+
+        self.assertEqual(['a'], obj1.queue_names)               # b has been deleted
+        self.assertEqual([30, 50], [depth.messages for depth in obj1.history('a')])
+        self.assertEqual(2.0, obj1.trend('a'))
+        self.assertEqual(50, obj1.latest('a').messages)
+        self.assertIsNone(obj1.latest('b'))
+
+
+    def test_errors(self):
+        broker = self.Broker()
+        broker.samples = [httpx.ConnectError('refused'), [self.depth('a', 10, 100.0)]]
+
+        obj1 = QueueDepthPoller(broker, 1.0, 2)
+
+        self.assertFalse(asyncio.run(obj1.sample()))
+        self.assertTrue(asyncio.run(obj1.sample()))
+        self.assertEqual(1, obj1.samples)
+        self.assertEqual(1, obj1.errors)
+
+
+    def test_empty_depth_skipped(self):
+        broker = self.Broker()
+        broker.samples = [[QueueDepth.construct_from_jdict({}), self.depth('a', 10, 100.0)]]
+
+        obj1 = QueueDepthPoller(broker, 1.0, 2)
+
+        self.assertTrue(asyncio.run(obj1.sample()))
+        self.assertEqual(['a'], obj1.queue_names)
+
+
+    def test_unexpected_error(self):
+        broker = self.Broker()
+        broker.samples = [RuntimeError('unexpected')] + [[self.depth('a', i, 100.0 + i)] for i in range(100)]
+
+        async def run():
+            obj1 = QueueDepthPoller(broker, 0.01, 5)
+            obj1.start()
+            await asyncio.sleep(0.1)
+            self.assertTrue(obj1.is_running)                    # the poller survives the failure
+
+            await obj1.stop()
+            return obj1
+
+        poller = asyncio.run(run())
+        self.assertEqual(1, poller.errors)
+        self.assertGreater(poller.samples, 1)
+
+
+    def test_start_stop(self):
+        broker = self.Broker()
+        broker.samples = [[self.depth('a', i, 100.0 + i)] for i in range(100)]
+
+        async def run():
+            obj1 = QueueDepthPoller(broker, 0.01, 5)
+            obj1.start()
+            await asyncio.sleep(0.1)
+            self.assertTrue(obj1.is_running)
+
+            await obj1.stop()
+            self.assertFalse(obj1.is_running)
+            return obj1
+
+        poller = asyncio.run(run())
+        self.assertGreater(poller.samples, 1)
+        self.assertEqual(1.0, poller.trend('a'))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/messaging/test_routing_key_cache.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import unittest
+
+from mrcs_control.messaging.routing_key_cache import RoutingKeyCache
+from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier
+from mrcs_core.data.json import JSONify
+from mrcs_core.messaging.routing_key import PublicationRoutingKey, SubscriptionRoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestRoutingKeyCache(unittest.TestCase):
+
+    __WIRE = 'TST.001.002.MPU.001.100'
+
+    @staticmethod
+    def routing_key():
+        return PublicationRoutingKey(EquipmentIdentifier.construct_from_jdict('TST.001.002'),
+                                     EquipmentFilter.construct_from_jdict('MPU.001.100'))
+
+
+    def test_parse(self):
+        obj1 = RoutingKeyCache(2)
+
+        obj2 = obj1.parse(self.__WIRE)
+        self.assertIs(obj2, obj1.parse(self.__WIRE))
+        self.assertEqual((1, 1), (obj1.hits, obj1.misses))
+
+
+    def test_parse_fail(self):
+        obj1 = RoutingKeyCache(2)
+
+        with self.assertRaises(Exception):
+            obj1.parse('not.a.routing.key')
+
+        self.assertEqual(0, obj1.hits)
+
+
+    def test_wire_equal_keys(self):
+        obj1 = RoutingKeyCache(2)
+
+        self.assertEqual(self.__WIRE, obj1.wire(self.routing_key()))
+        self.assertEqual(self.__WIRE, obj1.wire(self.routing_key()))     # built separately, the same entry
+        self.assertEqual((1, 1), (obj1.hits, obj1.misses))
+
+
+    def test_wire_by_class(self):
+        obj1 = RoutingKeyCache(2)
+        obj2 = self.routing_key()
+        obj3 = SubscriptionRoutingKey(obj2.source, obj2.target)
+
+        self.assertNotEqual(RoutingKeyCache.value_key(obj2), RoutingKeyCache.value_key(obj3))
+        self.assertEqual(JSONify.as_jdict(obj3), obj1.wire(obj3))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
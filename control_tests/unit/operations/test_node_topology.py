@@ -27,14 +27,21 @@ class TestNodeTopology(unittest.TestCase):
 
     def test_node_test(self):
         obj1 = NodeTopology.TEST
-        self.assertEqual('NodeTopology.ServiceConfiguration:{id:TEST, db_mode:test, mq_mode:mrcs.test}',
-                         str(obj1.value))
+        self.assertEqual('NodeTopology.ServiceConfiguration:{id:TEST, db_mode:test, mq_mode:mrcs.test, '
+                         'mq_transport:amqp}', str(obj1.value))
 
 
     def test_node_live(self):
         obj1 = NodeTopology.LIVE
-        self.assertEqual('NodeTopology.ServiceConfiguration:{id:LIVE, db_mode:live, mq_mode:mrcs.live}',
-                         str(obj1.value))
+        self.assertEqual('NodeTopology.ServiceConfiguration:{id:LIVE, db_mode:live, mq_mode:mrcs.live, '
+                         'mq_transport:amqp}', str(obj1.value))
+
+
+    def test_node_loopback(self):
+        obj1 = NodeTopology.LOOPBACK
+        self.assertEqual('NodeTopology.ServiceConfiguration:{id:LOOPBACK, db_mode:test, mq_mode:mrcs.test, '
+                         'mq_transport:loopback}', str(obj1.value))
+        self.assertTrue(obj1.value.is_loopback)
 
 
     def test_broker_filter(self):
@@ -60,6 +60,22 @@ class TestCronjobPersistence(unittest.TestCase):
         self.assertEqual(job, job1)
 
 
+    def test_find_due(self):
+        PersistentCronjob.recreate_tables()
+
+        target = EquipmentIdentifier(EquipmentType.SCH, None, 1)
+        job1 = PersistentCronjob(None, target, 'abc', ISODatetime.now())
+        job1.save()
+        time.sleep(1)
+
+        job2 = PersistentCronjob(None, target, 'def', ISODatetime.now())
+        job2.save()
+        time.sleep(1)
+
+        jobs = PersistentCronjob.find_due(ISODatetime.now())
+        self.assertEqual([job1, job2], jobs)
+
+
     def test_delete(self):
         PersistentCronjob.recreate_tables()
 
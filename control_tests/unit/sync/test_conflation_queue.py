@@ -0,0 +1,68 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/sync/test_conflation_queue.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import unittest
+
+from mrcs_control.sys.conflation_queue import ConflationQueue
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestConflationQueue(unittest.IsolatedAsyncioTestCase):
+
+    def test_construct(self):
+        obj1 = ConflationQueue()
+        self.assertEqual('ConflationQueue:{size:0, offered:0, conflated:0}', str(obj1))
+
+
+    def test_pop_empty(self):
+        obj1 = ConflationQueue()
+
+        with self.assertRaises(IndexError):
+            obj1.pop()
+
+
+    def test_latest_value(self):
+        obj1 = ConflationQueue()
+        obj1.put('a', 1)
+        obj1.put('b', 2)
+        obj1.put('a', 3)
+
+        self.assertEqual(3, obj1.pop())
+        self.assertEqual(2, obj1.pop())
+        self.assertEqual('ConflationQueue:{size:0, offered:3, conflated:1}', str(obj1))
+
+
+    def test_unkeyed(self):
+        obj1 = ConflationQueue()
+        obj1.put(None, 1)
+        obj1.put(None, 2)
+
+        self.assertEqual(2, len(obj1))
+        self.assertEqual(0, obj1.conflated)
+
+
+    async def test_get_waits(self):
+        obj1 = ConflationQueue()
+        task = asyncio.create_task(obj1.get())
+
+        await asyncio.sleep(0.01)
+        self.assertFalse(task.done())
+
+        obj1.put('a', 1)
+        self.assertEqual(1, await asyncio.wait_for(task, 1.0))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/sync/test_lru_cache.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import threading
+import unittest
+
+from mrcs_control.sys.lru_cache import LRUCache
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_construct(self):
+        obj1 = LRUCache(2)
+        self.assertEqual('LRUCache:{max_size:2, size:0, hits:0, misses:0}', str(obj1))
+
+
+    def test_construct_fail(self):
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+
+    def test_hit_miss(self):
+        obj1 = LRUCache(2)
+        obj1.put('a', 1)
+        self.assertEqual(1, obj1.get('a'))
+        self.assertEqual(None, obj1.get('b'))
+        self.assertEqual('LRUCache:{max_size:2, size:1, hits:1, misses:1}', str(obj1))
+
+
+    def test_evict_least_recent(self):
+        obj1 = LRUCache(2)
+        obj1.put('a', 1)
+        obj1.put('b', 2)
+        obj1.get('a')
+        obj1.put('c', 3)
+        self.assertEqual(True, 'a' in obj1)
+        self.assertEqual(False, 'b' in obj1)
+        self.assertEqual(True, 'c' in obj1)
+
+
+    def test_clear(self):
+        obj1 = LRUCache(2)
+        obj1.put('a', 1)
+        obj1.get('a')
+        obj1.clear()
+        self.assertEqual('LRUCache:{max_size:2, size:0, hits:0, misses:0}', str(obj1))
+
+
+    def test_shared_between_threads(self):
+        obj1 = LRUCache(8)
+        errors = []
+
+        def run(offset):
+            try:
+                for i in range(2000):
+                    obj1.put((offset + i) % 16, i)
+                    obj1.get((offset + i + 1) % 16)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=run, args=(offset,)) for offset in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(8, len(obj1))
+        self.assertEqual(8000, obj1.hits + obj1.misses)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
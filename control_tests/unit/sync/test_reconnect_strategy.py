@@ -0,0 +1,68 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/sync/test_reconnect_strategy.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import unittest
+
+from mrcs_control.sys.reconnect_strategy import ReconnectStrategy
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestReconnectStrategy(unittest.IsolatedAsyncioTestCase):
+
+    def test_construct(self):
+        obj1 = ReconnectStrategy.construct()
+        self.assertEqual('ReconnectStrategy:{initial_delay:0.5, max_delay:30.0, multiplier:2.0, jitter:0.2, '
+                         'max_attempts:None, attempts:0, outages:0, total_outage_duration:0.000}', str(obj1))
+
+
+    def test_backoff(self):
+        obj1 = ReconnectStrategy(1.0, 5.0, 2.0, 0.0, None)
+        delays = [obj1.next_delay() for _ in range(6)]
+        self.assertEqual([0.0, 1.0, 2.0, 4.0, 5.0, 5.0], delays)
+
+
+    def test_jitter(self):
+        obj1 = ReconnectStrategy(1.0, 5.0, 2.0, 0.5, None)
+        obj1.next_delay()
+        delay = obj1.next_delay()
+        self.assertTrue(0.5 <= delay <= 1.5)
+
+
+    def test_max_attempts(self):
+        obj1 = ReconnectStrategy(0.0, 0.0, 2.0, 0.0, 2)
+        obj1.next_delay()
+        obj1.next_delay()
+        with self.assertRaises(ConnectionError):
+            obj1.next_delay()
+
+
+    def test_reconnected(self):
+        obj1 = ReconnectStrategy(0.0, 0.0, 2.0, 0.0, None)
+        obj1.next_delay()
+        self.assertEqual(True, obj1.is_reconnecting)
+
+        obj1.reconnected()
+        self.assertEqual(False, obj1.is_reconnecting)
+        self.assertEqual(0, obj1.attempts)
+        self.assertEqual(1, obj1.outages)
+
+
+    async def test_async_wait(self):
+        obj1 = ReconnectStrategy(0.0, 0.0, 2.0, 0.0, None)
+        await obj1.async_wait()
+        self.assertEqual(1, obj1.attempts)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
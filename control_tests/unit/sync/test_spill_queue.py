@@ -0,0 +1,152 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/sync/test_spill_queue.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from mrcs_control.sys.spill_queue import SpillQueue
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestSpillQueue(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'test.outbox')
+
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+
+    def construct(self, capacity):
+        return SpillQueue(self.path, capacity, str, int)
+
+
+    def test_construct(self):
+        obj1 = self.construct(2)
+        self.assertEqual(f'SpillQueue:{{path:{self.path}, capacity:2, size:0, spilled:0, offered:0, conflated:0, '
+                         f'discarded:0}}', str(obj1))
+
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            self.construct(0)
+
+
+    def test_spill_in_order(self):
+        obj1 = self.construct(2)
+
+        for value in range(5):
+            obj1.put(None, value)
+
+        self.assertEqual(5, len(obj1))
+        self.assertEqual(3, obj1.spilled)
+        self.assertTrue(os.path.exists(self.path))
+
+        self.assertEqual([0, 1, 2, 3, 4], [obj1.pop() for _ in range(5)])
+        self.assertFalse(os.path.exists(self.path))
+
+        with self.assertRaises(IndexError):
+            obj1.pop()
+
+
+    def test_no_overtaking(self):
+        obj1 = self.construct(2)
+
+        for value in range(3):
+            obj1.put(None, value)
+
+        obj1.pop()
+        obj1.put(None, 3)               # memory has room, but the journal is not yet read back
+
+        self.assertEqual([1, 2, 3], [obj1.pop() for _ in range(3)])
+
+
+    def test_conflate_in_memory(self):
+        obj1 = self.construct(1)
+        obj1.put('a', 1)
+        obj1.put('b', 2)
+        obj1.put('a', 3)
+
+        self.assertEqual(1, obj1.conflated)
+        self.assertEqual([3, 2], [obj1.pop() for _ in range(2)])
+
+
+    def test_recover(self):
+        obj1 = self.construct(1)
+
+        for value in range(3):
+            obj1.put(None, value)
+
+        obj1.close()
+
+        with open(self.path, 'ab') as journal:
+            journal.write(b'torn')
+
+        obj2 = self.construct(1)
+        self.assertEqual(3, len(obj2))
+        self.assertEqual([1, 2], [obj2.pop() for _ in range(2)])
+
+        with self.assertRaises(IndexError):
+            obj2.pop()
+
+        self.assertEqual(1, obj2.discarded)
+
+
+    async def test_recover_discarded(self):
+        with open(self.path, 'wb') as journal:
+            journal.write(b'a\tb\nc\n')            # for example, written in an earlier format
+
+        obj1 = self.construct(1)
+        self.assertEqual(2, len(obj1))
+
+        with self.assertRaises(IndexError):
+            obj1.pop()
+
+        self.assertEqual(0, len(obj1))
+        self.assertEqual(2, obj1.discarded)
+        self.assertFalse(os.path.exists(self.path))
+
+
+    async def test_get_waits_after_discarded(self):
+        with open(self.path, 'wb') as journal:
+            journal.write(b'a\tb\nc\n')
+
+        obj1 = self.construct(1)
+        task = asyncio.create_task(obj1.get())
+
+        await asyncio.sleep(0.01)
+        self.assertFalse(task.done())
+        self.assertEqual(2, obj1.discarded)
+
+        obj1.put(None, 1)
+        self.assertEqual(1, await asyncio.wait_for(task, 1.0))
+
+
+    async def test_get_waits(self):
+        obj1 = self.construct(1)
+        task = asyncio.create_task(obj1.get())
+
+        await asyncio.sleep(0.01)
+        self.assertFalse(task.done())
+
+        obj1.put(None, 1)
+        self.assertEqual(1, await asyncio.wait_for(task, 1.0))
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+python -m unittest -v unit/sync/test_token_bucket.py
+
+https://realpython.com/python-testing/
+https://www.jetbrains.com/help/pycharm/creating-tests.html
+"""
+
+import time
+import unittest
+
+from mrcs_control.sys.token_bucket import TokenBucket
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TestTokenBucket(unittest.IsolatedAsyncioTestCase):
+
+    def test_construct(self):
+        obj1 = TokenBucket(10.0, 4)
+        self.assertEqual('TokenBucket:{rate:10.0, burst:4, tokens:4}', str(obj1))
+
+        with self.assertRaises(ValueError):
+            TokenBucket(0.0, 4)
+
+        with self.assertRaises(ValueError):
+            TokenBucket(10.0, 0)
+
+
+    def test_burst(self):
+        obj1 = TokenBucket(1.0, 3)
+
+        self.assertEqual([True, True, True, False], [obj1.take() for _ in range(4)])
+        self.assertGreater(obj1.delay(), 0.9)
+
+
+    def test_refill(self):
+        obj1 = TokenBucket(100.0, 2)
+        obj1.take(2)
+
+        time.sleep(0.05)
+        self.assertEqual(2, obj1.tokens)                # capped at burst
+
+
+    async def test_acquire(self):
+        obj1 = TokenBucket(50.0, 1)
+
+        start = time.monotonic()
+        for _ in range(6):
+            await obj1.acquire()
+
+        self.assertGreater(time.monotonic() - start, 0.09)
+
+        with self.assertRaises(ValueError):
+            await obj1.acquire(2)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
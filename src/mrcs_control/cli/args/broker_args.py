@@ -24,6 +24,9 @@ class BrokerArgs(MultimodeControlArgs):
         group = self._parser.add_mutually_exclusive_group(required=False)
         group.add_argument('-d', '--delete', action='store', type=str, help='delete ITEM')
         group.add_argument('-z', '--erase', action='store_true', help='delete all')
+        group.add_argument('-m', '--migrate', action='store_true',
+                           help='move messages from legacy queues to their priority successors, and delete them '
+                                '(subscribers do so when they start)')
 
         self._args = self._parser.parse_args()
 
@@ -50,8 +53,13 @@ class BrokerArgs(MultimodeControlArgs):
         return self._args.erase
 
 
+    @property
+    def migrate(self):
+        return self._args.migrate
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
         return (f'BrokerArgs:{{test:{self.test}, exchange:{self.exchange}, queue:{self.queue}, delete:{self.delete}, '
-                f'erase:{self.erase}, indent:{self.indent}, verbose:{self.verbose}}}')
+                f'erase:{self.erase}, migrate:{self.migrate}, indent:{self.indent}, verbose:{self.verbose}}}')
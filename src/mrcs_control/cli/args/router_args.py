@@ -22,6 +22,9 @@ class RouterArgs(MultimodeControlArgs):
         group.add_argument('-r', '--run', action='store_true', help='run the cron')
         group.add_argument('-s', '--run-save', action='store_true', help='run the cron with save on')
 
+        self._parser.add_argument('-c', '--compact', action='store_true',
+                                  help='publish reports as MessagePack - every subscriber must have msgpack')
+
         self._args = self._parser.parse_args()
 
 
@@ -38,8 +41,13 @@ class RouterArgs(MultimodeControlArgs):
         return self._args.run_save
 
 
+    @property
+    def compact(self):
+        return self._args.compact
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
         return (f'RouterArgs:{{test:{self.test}, run:{self.run}, run_save:{self.run_save}, '
-                f'indent:{self.indent}, verbose:{self.verbose}}}')
+                f'compact:{self.compact}, indent:{self.indent}, verbose:{self.verbose}}}')
@@ -57,7 +57,7 @@ class ClockConfNode(AsyncSubscriberNode):
         self.async_loop.create_task(self.publish_clock())
 
 
-    def handle_message(self, message: Message):
+    def handle_message(self, message: Message, _deadline: float | None = None):
         if message.origin == self.origin:
             self.async_loop.create_task(self.halt())
 
@@ -5,6 +5,8 @@ Created on 9 Nov 2025
 
 An SQLite database client, guaranteeing one connection per database, per process
 
+A connection may be used from any thread - for example, by a subscriber's worker - but by only one thread at a time.
+
 https://www.sqlitetutorial.net/sqlite-python/
 https://forum.xojo.com/t/sqlite-return-id-of-record-inserted/37896
 https://iafisher.com/blog/2021/10/using-sqlite-effectively-in-python
@@ -159,7 +161,8 @@ class DbClient(object):
         os.makedirs(Host.mrcs_db_abs_dir(self.db_mode), exist_ok=True)
 
         # isolation_level=None to enable manual TX control
-        self.__connection = sqlite3.connect(Host.mrcs_db_abs_file(self.db_mode, filename), isolation_level=None)
+        self.__connection = sqlite3.connect(Host.mrcs_db_abs_file(self.db_mode, filename), isolation_level=None,
+                                            check_same_thread=False)
 
         # foreign keys enabled
         self.__connection.execute("PRAGMA foreign_keys = ON;")
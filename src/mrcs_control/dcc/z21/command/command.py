@@ -5,17 +5,23 @@ Created on 26 Jun 2026
 
 An abstraction over Rocco Z21 DCC command datasets
 
+Commands are immutable, so each computes its metadata, dataset and wire bytes once, on first use. Commands built by
+the construct methods are flyweights: a command with a given header and arguments - for example LAN_LOGOFF,
+LAN_SYSTEMSTATE_GETDATA or track power on - is shared, from a bounded cache, so that its encoding is reused for every
+send. Commands received as JSON share a flyweight if one exists, but are not added to the cache - otherwise traffic
+with arbitrary arguments, such as turnout addresses or speeds, would evict the common commands.
+
 Classes in support of the Rocco Z21 DCC command station:
 https://www.z21.eu/en/products/z21
 """
 
-import struct
 from collections import OrderedDict
 from typing import Any
 
 from mrcs_control.dcc.z21.command.command_metadata import CommandMetadata, XCommandMetadata
 from mrcs_control.dcc.z21.command.dataset import Dataset, XDataset
 from mrcs_control.dcc.z21.command.header import Header, XHeader
+from mrcs_control.sys.lru_cache import LRUCache
 from mrcs_core.data.json import JSONable
 
 
@@ -26,6 +32,32 @@ class Command(JSONable):
     An abstraction over Rocco Z21 DCC command datasets
     """
 
+    __FLYWEIGHTS = LRUCache(256)                    # (class, header, argv): Command
+
+
+    @classmethod
+    def flyweights(cls) -> LRUCache:
+        return cls.__FLYWEIGHTS
+
+
+    @classmethod
+    def _flyweight(cls, header: Header | XHeader, argv: tuple):
+        key = (cls, header, argv)
+        command = cls.__FLYWEIGHTS.get(key)
+
+        if command is None:
+            command = cls(header, *argv)
+            cls.__FLYWEIGHTS.put(key, command)
+
+        return command
+
+
+    @classmethod
+    def _shared(cls, header: Header | XHeader, argv: tuple):
+        command = cls.__FLYWEIGHTS.get((cls, header, argv))
+
+        return cls(header, *argv) if command is None else command
+
 
     # ----------------------------------------------------------------------------------------------------------------
 
@@ -41,7 +73,7 @@ class Command(JSONable):
 
         argv = meta.argv_builder(*argv)
 
-        return cls(header, *argv)
+        return cls._flyweight(header, tuple(argv))
 
 
     @classmethod
@@ -61,7 +93,7 @@ class Command(JSONable):
         header = Header[jdict['header']]
         argv = jdict.get('argv')
 
-        return cls(header, *argv)
+        return cls._shared(header, tuple(argv))
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -70,6 +102,10 @@ class Command(JSONable):
         self._header = header
         self._argv = argv
 
+        self._meta = None                           # memoized on first use
+        self._dataset = None
+        self._chars = None
+
 
     def __eq__(self, other: Any):
         try:
@@ -78,12 +114,23 @@ class Command(JSONable):
             return False
 
 
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def as_bytes(self) -> bytes:
+        if self._chars is None:
+            self._chars = self.dataset.as_bytes()
+
+        return self._chars
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     @property
     def dataset(self) -> Dataset:
-        data = struct.pack(self.data_format, *self.argv)
-        return Dataset(self.header, data)
+        if self._dataset is None:
+            self._dataset = Dataset(self.header, self.meta.data_struct.pack(*self.argv))
+
+        return self._dataset
 
 
     @property
@@ -96,6 +143,16 @@ class Command(JSONable):
         return self.meta.report_type
 
 
+    @property
+    def is_urgent(self):
+        return self.meta.urgent
+
+
+    @property
+    def ttl(self):
+        return self.meta.ttl
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     def as_json(self, **kwargv):
@@ -113,7 +170,10 @@ class Command(JSONable):
 
     @property
     def meta(self):
-        return CommandMetadata.find(self.header)
+        if self._meta is None:
+            self._meta = CommandMetadata.find(self.header)
+
+        return self._meta
 
 
     @property
@@ -152,7 +212,7 @@ class XCommand(Command):
 
         argv = meta.argv_builder(*argv)
 
-        return cls(x_header, *argv)
+        return cls._flyweight(x_header, tuple(argv))
 
 
     @classmethod
@@ -169,7 +229,7 @@ class XCommand(Command):
         x_header = XHeader[jdict['x_header']]
         argv = jdict.get('argv')
 
-        return cls(x_header, *argv)
+        return cls._shared(x_header, tuple(argv))
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -203,8 +263,11 @@ class XCommand(Command):
 
     @property
     def dataset(self) -> XDataset:
-        data = struct.pack(self.data_format, *self.argv)
-        return XDataset.construct_from_command(self.header, self.x_header, data)
+        if self._dataset is None:
+            data = self.meta.data_struct.pack(*self.argv)
+            self._dataset = XDataset.construct_from_command(self.header, self.x_header, data)
+
+        return self._dataset
 
 
     @property
@@ -222,7 +285,10 @@ class XCommand(Command):
 
     @property
     def meta(self):
-        return XCommandMetadata.find_x(self.x_header)
+        if self._meta is None:
+            self._meta = XCommandMetadata.find_x(self.x_header)
+
+        return self._meta
 
 
     @property
@@ -10,12 +10,22 @@ The catalogues indicate which commands are supported.
 Note that the argc field indicates the number of arguments that the Command or XCommand factory method should require.
 Other arguments may be supplied by a custom argv builder method.
 
+Urgent commands - emergency stop and track power - are published at a raised priority, and are sent to the Z21 ahead
+of any other commands that are waiting to be sent.
+
+The data format of each command is compiled once, to a struct.Struct, when the catalogue is built.
+
+Commands that only make sense for a short time, such as speed changes, have a time-to-live (ttl). If such a command
+cannot be sent within its ttl - for example, because the Z21 was unavailable - it is dropped. Commands without a ttl
+never expire.
+
 https://docs.python.org/3/library/struct.html#format-characters
 
 Classes in support of the Rocco Z21 DCC command station:
 https://www.z21.eu/en/products/z21
 """
 
+import struct
 from typing import Dict, Protocol, Type
 
 from mrcs_control.dcc.z21.command.header import Header, XHeader
@@ -73,12 +83,15 @@ class CommandMetadata(object):
 
 
     def __init__(self, header: Header, argc: int, argv_builder: ArgvBuilder, data_format: str,
-                 report_type: Type | None):
+                 report_type: Type | None, urgent: bool = False, ttl: float | None = None):
         self._header = header
         self._argc = argc
         self._argv_builder = argv_builder
         self._data_format = data_format
+        self._data_struct = struct.Struct(data_format)
         self._report_type = report_type
+        self._urgent = urgent
+        self._ttl = ttl                         # seconds - None for no expiry
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -103,11 +116,26 @@ class CommandMetadata(object):
         return self._data_format
 
 
+    @property
+    def data_struct(self) -> struct.Struct:
+        return self._data_struct
+
+
     @property
     def report_type(self):
         return self._report_type
 
 
+    @property
+    def urgent(self):
+        return self._urgent
+
+
+    @property
+    def ttl(self):
+        return self._ttl
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     # noinspection PyUnresolvedReferences
@@ -116,7 +144,8 @@ class CommandMetadata(object):
         report_type_name = None if self.report_type is None else self.report_type.__name__
 
         return (f'CommandMetadata:{{header:{self.header.name}, argc:{self.argc}, '
-                f'argv_builder:{argv_builder}, data_format:{self.data_format}, report_type:{report_type_name}}}')
+                f'argv_builder:{argv_builder}, data_format:{self.data_format}, report_type:{report_type_name}, '
+                f'urgent:{self.urgent}, ttl:{self.ttl}}}')
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -132,11 +161,15 @@ class XCommandMetadata(CommandMetadata):
     @classmethod
     def init(cls):
         cls.__CATALOG = {
-            XHeader.LAN_X_GET_LOCO: cls(XHeader.LAN_X_GET_LOCO, 1, cls.argv_get_loco, '>BH', MPUConfigurationReport),
+            XHeader.LAN_X_GET_LOCO: cls(XHeader.LAN_X_GET_LOCO, 1, cls.argv_get_loco, '>BH', MPUConfigurationReport,
+                                        ttl=5.0),
             XHeader.LAN_X_SET_LOCO_FUNCTION: cls(XHeader.LAN_X_SET_LOCO_FUNCTION, 3, cls.argv_set_loco, '>BHB',
-                                                 None),
-            XHeader.LAN_X_SET_TRACK_POWER: cls(XHeader.LAN_X_SET_TRACK_POWER, 1, cls.argv_std, 'B', TrackReport),
-            XHeader.LAN_X_SET_TURNOUT: cls(XHeader.LAN_X_SET_TURNOUT, 2, cls.argv_turnout, '>HB', TurnoutReport),
+                                                 None, ttl=5.0),
+            XHeader.LAN_X_SET_TRACK_POWER: cls(XHeader.LAN_X_SET_TRACK_POWER, 1, cls.argv_std, 'B', TrackReport,
+                                               urgent=True),
+            XHeader.LAN_X_SET_TURNOUT: cls(XHeader.LAN_X_SET_TURNOUT, 2, cls.argv_turnout, '>HB', TurnoutReport,
+                                           ttl=30.0),
+            XHeader.LAN_X_SET_STOP: cls(XHeader.LAN_X_SET_STOP, 0, cls.argv_std, '', None, urgent=True),
         }
 
 
@@ -173,8 +206,8 @@ class XCommandMetadata(CommandMetadata):
     # ----------------------------------------------------------------------------------------------------------------
 
     def __init__(self, x_header: XHeader, argc: int, argv_builder: ArgvBuilder, data_format: str,
-                 report_type: Type | None):
-        super().__init__(Header.LAN_X, argc, argv_builder, data_format, report_type)
+                 report_type: Type | None, urgent: bool = False, ttl: float | None = None):
+        super().__init__(Header.LAN_X, argc, argv_builder, data_format, report_type, urgent=urgent, ttl=ttl)
         self.__x_header = x_header
 
 
@@ -193,4 +226,5 @@ class XCommandMetadata(CommandMetadata):
         report_type_name = None if self.report_type is None else self.report_type.__name__
 
         return (f'XCommandMetadata:{{header:{self.header.name}, x_header:{self.x_header.name}, argc:{self.argc}, '
-                f'argv_builder:{argv_builder}, data_format:{self.data_format}, report_type:{report_type_name}}}')
+                f'argv_builder:{argv_builder}, data_format:{self.data_format}, report_type:{report_type_name}, '
+                f'urgent:{self.urgent}, ttl:{self.ttl}}}')
@@ -5,6 +5,11 @@ Created on 5 Jun 2026
 
 The unit of Z21 communication
 
+A UDP datagram from the Z21 may hold several datasets. construct_from_buffer reads one dataset at a given offset in a
+memoryview of the datagram: the data of the dataset is a view onto the datagram, rather than a copy, so that bursts
+of packed broadcasts are decoded without intermediate bytes objects. Datasets constructed from buffers hold a
+reference to the whole datagram.
+
 Classes in support of the Rocco Z21 DCC command station:
 https://www.z21.eu/en/products/z21
 
@@ -14,7 +19,6 @@ https://gitlab.com/z21-fpm/z21_python
 """
 
 import struct
-from functools import reduce
 
 from mypy.types import Any
 
@@ -28,26 +32,40 @@ class Dataset(object):
     The unit of Z21 LAN communication
     """
 
+    __HEAD = struct.Struct('<HH')                   # total_len, header
+
 
     @classmethod
     def construct_from_bytes(cls, chars: bytes) -> Dataset | XDataset:
-        if len(chars) < 4:
-            raise ValueError(f'Dataset requires at least 4 bytes, got:{chars.hex(" ")}')
+        dataset = cls.construct_from_buffer(memoryview(chars))
+
+        if len(chars) != dataset.total_len:
+            raise ValueError(f'Dataset length does not match header, '
+                             f'specified:{dataset.total_len} got:{chars.hex(" ")}')
+
+        return dataset
 
-        total_len, header_int = struct.unpack('<HH', chars[:4])
 
-        if len(chars) != total_len:
-            raise ValueError(f'Dataset length does not match header, specified:{total_len} got:{chars.hex(" ")}')
+    @classmethod
+    def construct_from_buffer(cls, buffer: memoryview, offset: int = 0) -> Dataset | XDataset:
+        if len(buffer) - offset < 4:
+            raise ValueError(f'Dataset requires at least 4 bytes, got:{buffer[offset:].hex(" ")}')
+
+        total_len, header_int = cls.__HEAD.unpack_from(buffer, offset)
+
+        if total_len < 4 or offset + total_len > len(buffer):
+            raise ValueError(f'Dataset length does not match buffer, specified:{total_len} '
+                             f'got:{buffer[offset:].hex(" ")}')
 
         header = Header.construct(header_int)
-        data = chars[4:total_len]
+        data = buffer[offset + 4:offset + total_len]            # a view - not a copy
 
         return XDataset.construct_from_response(header, data) if header == Header.LAN_X else Dataset(header, data)
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, header: Header, data: bytes = b''):
+    def __init__(self, header: Header, data: bytes | memoryview = b''):
         self._header = header
         self._data = data
 
@@ -62,7 +80,7 @@ class Dataset(object):
     # ----------------------------------------------------------------------------------------------------------------
 
     def as_bytes(self):
-        return struct.pack("<HH", self.total_len, self.header) + self.data
+        return self.__HEAD.pack(self.total_len, self.header) + self.data
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -101,10 +119,20 @@ class XDataset(Dataset):
     The unit of Z21 XLAN communication
     """
 
+    __HEAD = struct.Struct('<HHB')                  # total_len, header, x_header
+
 
     @staticmethod
-    def calculated_xor(x_header, data, ) -> int:
-        return reduce(lambda acc, x: acc ^ x, data, x_header)
+    def calculated_xor(x_header, data: bytes | memoryview) -> int:
+        # the data is read as one integer, and folded in halves until one byte remains
+        value = int.from_bytes(data, 'little')
+        width = len(data)
+
+        while width > 1:
+            width = (width + 1) // 2
+            value = (value >> (width * 8)) ^ (value & ((1 << (width * 8)) - 1))
+
+        return value ^ x_header
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -116,7 +144,7 @@ class XDataset(Dataset):
 
 
     @classmethod
-    def construct_from_response(cls, header: Header, data: bytes):
+    def construct_from_response(cls, header: Header, data: bytes | memoryview):
         if len(data) < 1:
             raise ValueError(f'XDataset data length must be at least 1 byte')
 
@@ -133,7 +161,7 @@ class XDataset(Dataset):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, header: Header, x_header: XHeader, data: bytes, xor: int):
+    def __init__(self, header: Header, x_header: XHeader, data: bytes | memoryview, xor: int):
         super().__init__(header, data)
 
         self.__x_header = x_header
@@ -143,7 +171,7 @@ class XDataset(Dataset):
     # ----------------------------------------------------------------------------------------------------------------
 
     def as_bytes(self):
-        return struct.pack('<HHB', self.total_len, self.header, self.x_header) + self.data + bytes([self.xor])
+        return self.__HEAD.pack(self.total_len, self.header, self.x_header) + self.data + bytes([self.xor])
 
 
     # ----------------------------------------------------------------------------------------------------------------
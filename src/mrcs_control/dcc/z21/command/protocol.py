@@ -5,6 +5,9 @@ Created on 6 Jun 2026
 
 Z21 communications handler
 
+Each datagram is split into datasets by their length fields, and each dataset is passed to the dataset handler as
+(buffer, offset, length), where buffer is a memoryview of the datagram - the handler decodes the dataset in place.
+
 Classes in support of the Rocco Z21 DCC command station:
 https://www.z21.eu/en/products/z21
 
@@ -17,7 +20,6 @@ import struct
 from asyncio import DatagramProtocol
 from typing import Callable
 
-from mrcs_control.dcc.z21.command.dataset import Dataset
 from mrcs_core.sys.logging import Logging
 
 
@@ -31,7 +33,12 @@ class Z21Protocol(DatagramProtocol):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, dataset_handler: Callable[[Dataset], None],
+    __LENGTH = struct.Struct('<H')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, dataset_handler: Callable[[memoryview, int, int], None],
                  connection_lost_handler: Callable):
         self.__dataset_handler = dataset_handler
         self.__connection_lost_handler = connection_lost_handler
@@ -54,16 +61,25 @@ class Z21Protocol(DatagramProtocol):
     def datagram_received(self, data: bytes, addr: tuple[str, int]):
         self.logger.debug('protocol - datagram_received')
 
+        buffer = memoryview(data)               # datasets are views onto the datagram - not copies
+
         offset = 0
-        while offset < len(data):
+        while offset < len(buffer):
             try:
-                dataset = Dataset.construct_from_bytes(data[offset:])
-                self.__dataset_handler(dataset)
-                offset += dataset.total_len
+                if len(buffer) - offset < 4:
+                    raise ValueError('dataset requires at least 4 bytes')
+
+                length = self.__LENGTH.unpack_from(buffer, offset)[0]
+
+                if length < 4 or offset + length > len(buffer):
+                    raise ValueError(f'dataset length does not match datagram, specified:{length}')
+
+                self.__dataset_handler(buffer, offset, length)
+                offset += length
 
             except (ValueError, struct.error) as exc:
                 self.logger.error('datagram_received on %s at offset %d: %s <%s>', addr, offset, exc,
-                                  data[offset:].hex(' '))
+                                  buffer[offset:].hex(' '))
                 return
 
 
@@ -0,0 +1,159 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+Pending replies from a Z21 command station, keyed by the (header, x_header, address) of the expected reply
+
+A query registers a future for the reply it expects, sends its command, and awaits the future with its own timeout.
+Each received dataset is offered to the correlator: every future waiting for its key is resolved with the decoded
+report - so several queries, for the same or different keys, may be in flight at once. A future registered with an
+address of None matches a reply with any address.
+
+Replies are addressed by loco address (LAN_X_LOCO_INFO) or turnout address (LAN_X_TURNOUT_INFO), read from the raw
+dataset. Other replies have no address.
+
+Classes in support of the Rocco Z21 DCC command station:
+https://www.z21.eu/en/products/z21
+"""
+
+import asyncio
+from typing import Any
+
+from mrcs_control.dcc.z21.command.header import Header, XHeader
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ReplyCorrelator(object):
+    """
+    Pending replies from a Z21 command station, keyed by the (header, x_header, address) of the expected reply
+    """
+
+    __LAN_X = int(Header.LAN_X)
+
+    # x_header int: mask applied to the high byte of the address in the reply
+    __ADDRESS_MASKS = {
+        int(XHeader.LAN_X_LOCO_INFO): 0x3f,
+        int(XHeader.LAN_X_TURNOUT_INFO): 0xff,
+    }
+
+
+    @classmethod
+    def reply_key(cls, buffer: memoryview, offset: int, length: int) -> tuple[int, int | None, int | None]:
+        header = buffer[offset + 2] | (buffer[offset + 3] << 8)
+
+        if header != cls.__LAN_X or length < 6:
+            return header, None, None
+
+        x_header = buffer[offset + 4]
+        mask = cls.__ADDRESS_MASKS.get(x_header)
+
+        if mask is None or length < 8:
+            return header, x_header, None
+
+        return header, x_header, ((buffer[offset + 5] & mask) << 8) | buffer[offset + 6]
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        self.__pending = {}                 # (header, x_header, address): list of futures, oldest first
+
+        self.__resolved = 0
+        self.__timed_out = 0
+
+
+    def __len__(self):
+        return sum(len(futures) for futures in self.__pending.values())
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def expect(self, header: Header, x_header: XHeader | None = None, address: int | None = None) -> asyncio.Future:
+        key = (int(header), None if x_header is None else int(x_header), address)
+        future = asyncio.get_running_loop().create_future()
+
+        self.__pending.setdefault(key, []).append(future)
+        future.add_done_callback(lambda done: self.__discard(key, done))
+
+        return future
+
+
+    async def wait(self, future: asyncio.Future, timeout: float) -> Any:
+        try:
+            return await asyncio.wait_for(future, timeout)
+
+        except asyncio.TimeoutError:
+            self.__timed_out += 1
+            raise
+
+
+    def resolve(self, buffer: memoryview, offset: int, length: int, report: Any) -> int:
+        if not self.__pending:
+            return 0
+
+        header, x_header, address = self.reply_key(buffer, offset, length)
+
+        resolved = self.__resolve((header, x_header, address), report)
+
+        if address is not None:
+            resolved += self.__resolve((header, x_header, None), report)
+
+        return resolved
+
+
+    def fail_all(self, exc: BaseException):
+        for futures in list(self.__pending.values()):
+            for future in list(futures):
+                if not future.done():
+                    future.set_exception(exc)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __resolve(self, key, report: Any) -> int:
+        futures = self.__pending.pop(key, ())
+        resolved = 0
+
+        for future in futures:
+            if not future.done():
+                future.set_result(report)
+                resolved += 1
+
+        self.__resolved += resolved
+
+        return resolved
+
+
+    def __discard(self, key, future: asyncio.Future):
+        futures = self.__pending.get(key)
+
+        if futures is None:
+            return
+
+        try:
+            futures.remove(future)
+        except ValueError:
+            return
+
+        if not futures:
+            del self.__pending[key]
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def resolved(self):
+        return self.__resolved
+
+
+    @property
+    def timed_out(self):
+        return self.__timed_out
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return f'ReplyCorrelator:{{pending:{len(self)}, resolved:{self.resolved}, timed_out:{self.timed_out}}}'
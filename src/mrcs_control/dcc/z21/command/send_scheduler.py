@@ -0,0 +1,206 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+A paced sender of Z21 datasets, with priority classes and datagram packing
+
+Datasets are queued by priority, and sent by a single task. Sending is paced by a token bucket - one token per
+dataset - so an idle station accepts a burst of commands immediately, while a busy station is held to the sustained
+rate. The Z21 LAN protocol permits several datasets to be concatenated in one UDP datagram: when datasets are waiting,
+as many as the tokens held and max_datagram_size allow are packed together, highest priority first.
+
+URGENT datasets - emergency stop and track power - are not paced: they are sent at once, in a datagram of their own,
+ahead of any datasets that are waiting.
+
+Each send returns when its dataset has been passed to the transport, or raises the exception that the transport
+raised. Datasets still waiting when the scheduler is stopped are cancelled.
+
+https://en.wikipedia.org/wiki/Token_bucket
+
+Classes in support of the Rocco Z21 DCC command station:
+https://www.z21.eu/en/products/z21
+"""
+
+import asyncio
+from collections import deque
+from enum import IntEnum, unique
+from typing import Callable
+
+from mrcs_control.sys.token_bucket import TokenBucket
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+@unique
+class SendPriority(IntEnum):
+    """
+    An enumeration of the send priority classes, most urgent first
+    """
+
+    URGENT = 0                  # emergency stop, track power - not paced
+    NORMAL = 1                  # operational commands
+    BACKGROUND = 2              # housekeeping, such as keep-alive polls
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SendScheduler(object):
+    """
+    A paced sender of Z21 datasets, with priority classes and datagram packing
+    """
+
+    __DEFAULT_RATE = 20.0                           # datasets per second, sustained
+    __DEFAULT_BURST = 8                             # datasets
+    __DEFAULT_MAX_DATAGRAM_SIZE = 256               # bytes
+
+
+    @classmethod
+    def construct(cls, sendto: Callable[[bytes], None]):
+        return cls(sendto, TokenBucket(cls.__DEFAULT_RATE, cls.__DEFAULT_BURST), cls.__DEFAULT_MAX_DATAGRAM_SIZE)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, sendto: Callable[[bytes], None], bucket: TokenBucket, max_datagram_size: int):
+        self.__sendto = sendto                      # passes one datagram to the transport
+        self.__bucket = bucket
+        self.__max_datagram_size = max_datagram_size
+
+        self.__queues = {priority: deque() for priority in SendPriority if priority != SendPriority.URGENT}
+        self.__pending = asyncio.Event()
+        self.__task = None
+
+        self.__datasets = 0
+        self.__datagrams = 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    async def send(self, chars: bytes, priority: SendPriority = SendPriority.NORMAL):
+        if priority == SendPriority.URGENT:
+            self.__transmit([chars])                # fast path - jumps the queues
+            return
+
+        if not self.is_running:
+            self.__task = asyncio.get_running_loop().create_task(self.run())
+
+        sent = asyncio.get_running_loop().create_future()
+
+        self.__queues[priority].append((chars, sent))
+        self.__pending.set()
+
+        await sent
+
+
+    async def stop(self):
+        if self.__task is not None:
+            self.__task.cancel()
+
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+
+            self.__task = None
+
+        for queue in self.__queues.values():
+            while queue:
+                _, sent = queue.popleft()
+                sent.cancel()
+
+
+    async def run(self):
+        while True:
+            while len(self) == 0:
+                self.__pending.clear()
+                await self.__pending.wait()
+
+            await self.__bucket.acquire()
+            packed = [self.__pop()]
+
+            while len(self) > 0 and self.__fits(packed, self.__peek()) and self.__bucket.take():
+                packed.append(self.__pop())
+
+            try:
+                self.__transmit([chars for chars, _ in packed])
+
+            except Exception as exc:
+                exc.with_traceback(None)            # the traceback would hold this task's frame alive in senders
+
+                for _, sent in packed:
+                    if not sent.done():
+                        sent.set_exception(exc)
+                continue
+
+            for _, sent in packed:
+                if not sent.done():
+                    sent.set_result(None)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __transmit(self, datasets: list[bytes]):
+        self.__sendto(b''.join(datasets))
+
+        self.__datasets += len(datasets)
+        self.__datagrams += 1
+
+
+    def __fits(self, packed, chars: bytes) -> bool:
+        return sum(len(packed_chars) for packed_chars, _ in packed) + len(chars) <= self.max_datagram_size
+
+
+    def __peek(self) -> bytes:
+        for queue in self.__queues.values():
+            if queue:
+                return queue[0][0]
+
+        raise IndexError('peek from an empty scheduler')
+
+
+    def __pop(self):
+        for queue in self.__queues.values():
+            if queue:
+                return queue.popleft()
+
+        raise IndexError('pop from an empty scheduler')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def bucket(self):
+        return self.__bucket
+
+
+    @property
+    def max_datagram_size(self):
+        return self.__max_datagram_size
+
+
+    @property
+    def is_running(self):
+        return self.__task is not None and not self.__task.done()
+
+
+    @property
+    def datasets(self):
+        return self.__datasets
+
+
+    @property
+    def datagrams(self):
+        return self.__datagrams
+
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.__queues.values())
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'SendScheduler:{{bucket:{self.bucket}, max_datagram_size:{self.max_datagram_size}, '
+                f'is_running:{self.is_running}, waiting:{len(self)}, datasets:{self.datasets}, '
+                f'datagrams:{self.datagrams}}}')
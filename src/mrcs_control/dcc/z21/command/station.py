@@ -5,6 +5,15 @@ Created on 6 Jun 2026
 
 Z21 command station
 
+Commands are paced by a SendScheduler - a token bucket allows a burst of commands to an idle station, and holds a busy
+station to a sustained rate. Waiting commands are packed into shared datagrams. Urgent commands, such as emergency
+stop and track power, take a fast path: they are sent immediately, ahead of any commands waiting for their turn.
+Keep-alive polls are sent in the background class, behind any operational commands.
+
+Queries, such as get_system_state and get_loco, await their own replies: a ReplyCorrelator resolves each query when
+a dataset with the expected (header, x_header, address) is received, or times it out, independently of any other
+queries in flight.
+
 Classes in support of the Rocco Z21 DCC command station:
 https://www.z21.eu/en/products/z21
 
@@ -15,17 +24,22 @@ https://gitlab.com/z21-fpm/z21_python
 
 import asyncio
 import errno
+import logging
 from asyncio import DatagramTransport
+from collections import Counter
 from typing import Any, Callable, Self
 
 from mrcs_control.dcc.z21.command.broadcast import Broadcast
-from mrcs_control.dcc.z21.command.command import Command
-from mrcs_control.dcc.z21.command.dataset import Dataset
-from mrcs_control.dcc.z21.command.header import Header
+from mrcs_control.dcc.z21.command.command import Command, XCommand
+from mrcs_control.dcc.z21.command.header import Header, XHeader
 from mrcs_control.dcc.z21.command.protocol import Z21Protocol
+from mrcs_control.dcc.z21.command.reply_correlator import ReplyCorrelator
+from mrcs_control.dcc.z21.command.send_scheduler import SendPriority, SendScheduler
 from mrcs_control.dcc.z21.equipment.z21_equpiment_report import Z21EquipmentReport
 from mrcs_core.equipment.control_router.control_router_conf import ControlRouterConf
+from mrcs_core.equipment.control_router.control_router_report import ControlRouterReport
 from mrcs_core.equipment.control_router.control_router_subscription import ControlRouterSubscription
+from mrcs_core.equipment.motive_power_unit.mpu_configuration_report import MPUConfigurationReport
 from mrcs_core.sys.ipv4_address import IPv4Address
 from mrcs_core.sys.logging import Logging
 
@@ -42,7 +56,6 @@ class Z21Station(object):
     DEFAULT_TIMEOUT = 2.0
     DEFAULT_SUBSCRIPTION = ControlRouterSubscription(Broadcast.CAN_DETECTOR, Broadcast.RAILCOM_DATA_ALL,
                                                      Broadcast.TRACK, Broadcast.X_LOCO_INFO_ALL)
-    __DEFAULT_TIME_BETWEEN_SENDS = 0.1
     __KEEP_ALIVE_INTERVAL = 30.0
 
 
@@ -92,7 +105,9 @@ class Z21Station(object):
         self.__transport: DatagramTransport | None = None
         self.__protocol: Z21Protocol | None = None
         self.__has_connection = False
-        self.__response_event = asyncio.Event()
+        self.__replies = ReplyCorrelator()
+        self.__unsupported_counts = Counter()   # (header, x_header): datasets received
+        self.__scheduler = SendScheduler.construct(self.__sendto)
 
         self.__logger = Logging.getLogger()
 
@@ -112,17 +127,28 @@ class Z21Station(object):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def station_dataset_handler(self, dataset: Dataset) -> None:
-        self.logger.debug(f'station_dataset_handler:{dataset}')
+    def station_dataset_handler(self, buffer: memoryview, offset: int, length: int) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f'station_dataset_handler:{buffer[offset:offset + length].hex(" ")}')
 
-        if dataset.header == Header.LAN_SYSTEMSTATE_DATACHANGED:
-            self.__response_event.set()
+        report = Z21EquipmentReport.construct_from_buffer(buffer, offset, length)
+        self.__replies.resolve(buffer, offset, length, report)
 
-        try:
-            self.on_response(Z21EquipmentReport.construct_from_dataset(dataset))
+        if report is None:
+            header = buffer[offset + 2] | (buffer[offset + 3] << 8)
+            self.__unsupported(header, buffer[offset + 4] if length > 4 else None)
+            return
+
+        self.on_response(report)
 
-        except TypeError:
-            self.logger.warning(f'dataset_handler unsupported: {dataset}')
+
+    def __unsupported(self, header: int, x_header: int | None) -> None:
+        key = (Header.construct(header), XHeader.construct(x_header) if header == Header.LAN_X else None)
+
+        if key not in self.__unsupported_counts:
+            self.logger.warning(f'dataset_handler unsupported: header:{key[0]}, x_header:{key[1]}')  # once each
+
+        self.__unsupported_counts[key] += 1
 
 
     def station_connection_lost_handler(self) -> None:
@@ -131,6 +157,8 @@ class Z21Station(object):
 
         self.__has_connection = False
         self.logger.warning(f'station_connection_lost_handler')
+
+        self.__replies.fail_all(ConnectionError('Z21 connection lost'))
         self.on_connection_lost()
 
 
@@ -143,19 +171,26 @@ class Z21Station(object):
         await self.send_command(command)
 
 
-    async def get_system_state(self, timeout: float = DEFAULT_TIMEOUT) -> None:
-        self.__response_event.clear()
-
+    async def get_system_state(self, timeout: float = DEFAULT_TIMEOUT) -> ControlRouterReport:
         command = Command.construct(Header.LAN_SYSTEMSTATE_GETDATA)
-        await self.send_command(command)
 
         try:
-            await asyncio.wait_for(self.__response_event.wait(), timeout)
+            return await self.query(command, Header.LAN_SYSTEMSTATE_DATACHANGED, timeout=timeout,
+                                    priority=SendPriority.BACKGROUND)
+
         except asyncio.TimeoutError as exc:
             self.station_connection_lost_handler()
             raise ConnectionError('Z21 control router did not respond') from exc
 
 
+    async def get_loco(self, mpu_address: int, timeout: float = DEFAULT_TIMEOUT) -> MPUConfigurationReport:
+        # raises asyncio.TimeoutError if the Z21 does not reply
+        command = XCommand.construct_x(XHeader.LAN_X_GET_LOCO, mpu_address)
+
+        return await self.query(command, Header.LAN_X, x_header=XHeader.LAN_X_LOCO_INFO,
+                                address=mpu_address & 0x3fff, timeout=timeout)
+
+
     async def logout(self) -> None:
         command = Command.construct(Header.LAN_LOGOFF)
         await self.send_command(command)
@@ -163,15 +198,37 @@ class Z21Station(object):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    async def send_command(self, command: Command) -> None:
+    async def query(self, command: Command, header: Header, x_header: XHeader | None = None,
+                    address: int | None = None, timeout: float = DEFAULT_TIMEOUT,
+                    priority: SendPriority | None = None) -> Any:
+        reply = self.__replies.expect(header, x_header=x_header, address=address)
+
+        try:
+            await self.send_command(command, priority=priority)
+        except BaseException:
+            reply.cancel()
+            raise
+
+        return await self.__replies.wait(reply, timeout)
+
+
+    async def send_command(self, command: Command, priority: SendPriority | None = None) -> None:
+        if priority is None:
+            priority = SendPriority.URGENT if command.is_urgent else SendPriority.NORMAL
+
+        if self.__transport is None:
+            raise ConnectionError('not connected to a Z21 station')
+
+        await self.__scheduler.send(command.as_bytes(), priority=priority)
+
+
+    def __sendto(self, chars: bytes) -> None:
         if self.__transport is None:
             raise ConnectionError('not connected to a Z21 station')
 
-        chars = command.dataset.as_bytes()
         self.logger.debug(f'send_command:{chars.hex(" ")}')
 
-        self.__transport.sendto(command.dataset.as_bytes())
-        await asyncio.sleep(self.__DEFAULT_TIME_BETWEEN_SENDS)
+        self.__transport.sendto(chars)
 
 
     async def close(self) -> None:
@@ -182,6 +239,9 @@ class Z21Station(object):
         except (OSError, ConnectionError) as exc:
             self.logger.warning(f'send_command:{exc}')
 
+        await self.__scheduler.stop()
+        self.__replies.fail_all(ConnectionError('Z21 station closed'))
+
         if self.__transport is not None:
             self.__transport.close()
             self.__transport = None
@@ -209,6 +269,21 @@ class Z21Station(object):
         return self.__has_connection
 
 
+    @property
+    def scheduler(self):
+        return self.__scheduler
+
+
+    @property
+    def replies(self):
+        return self.__replies
+
+
+    @property
+    def unsupported(self):
+        return dict(self.__unsupported_counts)
+
+
     @property
     def logger(self):
         return self.__logger
@@ -222,4 +297,4 @@ class Z21Station(object):
 
         return (f'Z21Station:{{conf:{self.conf}, on_response:{on_response}, '
                 f'on_connection_lost:{on_connection_lost}, has_connection:{self.has_connection}, '
-                f'transport:{bool(self.__transport)}, protocol:{self.__protocol}}}')
+                f'transport:{bool(self.__transport)}, protocol:{self.__protocol}, scheduler:{self.scheduler}}}')
@@ -0,0 +1,17 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+Initialises the Z21EquipmentReport dispatch tables
+
+Classes in support of the Rocco Z21 DCC command station:
+https://www.z21.eu/en/products/z21
+"""
+
+from mrcs_control.dcc.z21.equipment.z21_equpiment_report import Z21EquipmentReport
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+Z21EquipmentReport.init()
@@ -31,8 +31,11 @@ class Z21BlockReport(object):
 
     @classmethod
     def construct_from_dataset(cls, dataset: Dataset) -> BlockVoltageReport | BlockOccupancyReport:
-        data = dataset.data
+        return cls.construct_from_data(dataset.data)
 
+
+    @classmethod
+    def construct_from_data(cls, data: bytes | memoryview) -> BlockVoltageReport | BlockOccupancyReport:
         if len(data) != 10:
             raise ValueError(f'Z21BlockReport data requires 10 bytes, got {data.hex(" ")}')
 
@@ -29,8 +29,11 @@ class Z21ControlRouterReport(object):
 
     @classmethod
     def construct_from_dataset(cls, dataset: Dataset) -> ControlRouterReport:
-        data = dataset.data
+        return cls.construct_from_data(dataset.data)
 
+
+    @classmethod
+    def construct_from_data(cls, data: bytes | memoryview) -> ControlRouterReport:
         if len(data) != 16:
             raise ValueError(f'Z21ControlRouterReport data requires 16 bytes, got {data.hex(" ")}')
 
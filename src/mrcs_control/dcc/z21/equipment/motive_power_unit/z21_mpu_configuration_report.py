@@ -29,8 +29,11 @@ class Z21MPUConfigurationReport(object):
 
     @classmethod
     def construct_from_dataset(cls, dataset: Dataset) -> MPUConfigurationReport:
-        data = dataset.data
+        return cls.construct_from_data(dataset.data)
 
+
+    @classmethod
+    def construct_from_data(cls, data: bytes | memoryview) -> MPUConfigurationReport:
         if len(data) < 2:
             raise ValueError(f'Z21MPUConfigurationReport data requires at least 2 bytes, got {data.hex(" ")}')
 
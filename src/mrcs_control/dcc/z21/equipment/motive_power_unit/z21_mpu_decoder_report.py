@@ -29,8 +29,11 @@ class Z21MPUDecoderReport(object):
 
     @classmethod
     def construct_from_dataset(cls, dataset: Dataset) -> MPUDecoderReport:
-        data = dataset.data
+        return cls.construct_from_data(dataset.data)
 
+
+    @classmethod
+    def construct_from_data(cls, data: bytes | memoryview) -> MPUDecoderReport:
         if len(data) != 13:
             raise ValueError(f'Z21MPUDecoderReport data requires 13 bytes, got {data.hex(" ")}')
 
@@ -28,8 +28,11 @@ class Z21TrackReport(object):
 
     @classmethod
     def construct_from_dataset(cls, dataset: Dataset) -> TrackReport:
-        data = dataset.data
+        return cls.construct_from_data(dataset.data)
 
+
+    @classmethod
+    def construct_from_data(cls, data: bytes | memoryview) -> TrackReport:
         if len(data) != 1:
             raise ValueError(f'Z21TrackReport data requires 1 byte, got {data.hex(" ")}')
 
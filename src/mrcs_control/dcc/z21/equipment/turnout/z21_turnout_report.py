@@ -30,8 +30,11 @@ class Z21TurnoutReport(object):
 
     @classmethod
     def construct_from_dataset(cls, dataset: Dataset) -> TurnoutReport:
-        data = dataset.data
+        return cls.construct_from_data(dataset.data)
 
+
+    @classmethod
+    def construct_from_data(cls, data: bytes | memoryview) -> TurnoutReport:
         if len(data) != 3:
             raise ValueError(f'Z21TurnoutReport data requires 3 bytes, got {data.hex(" ")}')
 
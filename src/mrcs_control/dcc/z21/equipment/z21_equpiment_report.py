@@ -5,6 +5,12 @@ Created on 20 Jun 2026
 
 A constructor to unmarshall equipment reports from Z21 datasets
 
+Received datasets are decoded through dispatch tables, indexed by the raw header and x-header integers, that are built
+once, from the header mappings. construct_from_buffer decodes a dataset in place, at an offset in a datagram, without
+constructing a Dataset or Header enum members: for a LAN_X dataset, the checksum is verified by XOR-ing the x-header,
+the data and the checksum byte, which must come to zero. Datasets with unsupported headers return None, so that the
+caller may count them - malformed datasets raise ValueError.
+
 Classes in support of the Rocco Z21 DCC command station:
 https://www.z21.eu/en/products/z21
 
@@ -13,6 +19,10 @@ https://github.com/botmonster/z21aio/tree/main
 https://gitlab.com/z21-fpm/z21_python
 """
 
+from functools import reduce
+from operator import xor
+from typing import Callable
+
 from mrcs_control.dcc.z21.command.dataset import Dataset
 from mrcs_control.dcc.z21.command.header import Header, XHeader
 from mrcs_control.dcc.z21.equipment.block.z21_block_report import Z21BlockReport
@@ -43,23 +53,62 @@ class Z21EquipmentReport(object):
         XHeader.LAN_X_TURNOUT_INFO: Z21TurnoutReport
     }
 
+    __LAN_X = int(Header.LAN_X)
+
+    __DECODERS: list[Callable | None]               # indexed by header int - Z21 headers are all less than 0x100
+    __X_DECODERS: list[Callable | None]             # indexed by x-header int
+
+
+    @classmethod
+    def init(cls):
+        cls.__DECODERS = [None] * 0x100
+        cls.__X_DECODERS = [None] * 0x100
+
+        for header, equipment_cls in cls.__HEADER_MAPPING.items():
+            cls.__DECODERS[header] = equipment_cls.construct_from_data
+
+        for x_header, equipment_cls in cls.__X_HEADER_MAPPING.items():
+            cls.__X_DECODERS[x_header] = equipment_cls.construct_from_data
+
 
     @classmethod
-    def __class_find(cls, header: Header, x_header: XHeader):
-        if header == Header.LAN_X:
-            return cls.__X_HEADER_MAPPING[x_header]
+    def __decoder(cls, header: int, x_header: int | None) -> Callable | None:
+        if header == cls.__LAN_X:
+            return cls.__X_DECODERS[x_header] if x_header is not None else None
 
-        return cls.__HEADER_MAPPING[header]
+        return cls.__DECODERS[header] if header < 0x100 else None
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
+    @classmethod
+    def construct_from_buffer(cls, buffer: memoryview, offset: int, length: int) -> JSONable | None:
+        header = buffer[offset + 2] | (buffer[offset + 3] << 8)
+
+        if header != cls.__LAN_X:
+            decoder = cls.__DECODERS[header] if header < 0x100 else None
+
+            return None if decoder is None else decoder(buffer[offset + 4:offset + length])
+
+        if length < 6:
+            raise ValueError(f'LAN_X dataset requires at least 6 bytes, got:{length}')
+
+        decoder = cls.__X_DECODERS[buffer[offset + 4]]
+
+        if decoder is None:
+            return None
+
+        if reduce(xor, buffer[offset + 4:offset + length]) != 0:
+            raise ValueError(f'XDataset xor does not match: {buffer[offset:offset + length].hex(" ")}')
+
+        return decoder(buffer[offset + 5:offset + length - 1])
+
+
     @classmethod
     def construct_from_dataset(cls, dataset: Dataset) -> JSONable:
-        try:
-            equipment_cls = cls.__class_find(dataset.header, dataset.x_header)
+        decoder = cls.__decoder(dataset.header, dataset.x_header)
 
-        except KeyError:
+        if decoder is None:
             raise TypeError(f'unsupported header:{dataset.header}, x_header:{dataset.x_header}')
 
-        return equipment_cls.construct_from_dataset(dataset)
+        return decoder(dataset.data)
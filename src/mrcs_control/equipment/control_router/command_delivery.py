@@ -0,0 +1,89 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+The delivery policy for commands to the control router
+
+Commands to the control router are URGENT if their Command is urgent (emergency stop, track power), so that they
+overtake any backlog of queued commands, and expire according to their Command's ttl. These properties belong to the
+command's metadata, so a command published as a JSON document is classified by its header and x-header, without
+constructing a Command. The metadata for each header is found once, and memoized.
+
+The policy is registered with the DeliveryPolicy catalogue by register(), which must be called by any process that
+publishes commands to the control router.
+"""
+
+from typing import Any
+
+from mrcs_control.dcc.z21.command.command import Command, XCommand
+from mrcs_control.dcc.z21.command.command_metadata import CommandMetadata, XCommandMetadata
+from mrcs_control.dcc.z21.command.header import Header, XHeader
+from mrcs_control.messaging.delivery_policy import DeliveryPolicy, MessageKind
+from mrcs_control.messaging.mq_enums import MQPriority
+from mrcs_core.data.equipment_identity import EquipmentType
+from mrcs_core.messaging.message import Message
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class CommandDelivery(object):
+    """
+    The delivery policy for commands to the control router
+    """
+
+    __METADATA = {}                                 # (type name, header name): CommandMetadata
+
+
+    @classmethod
+    def register(cls):
+        policy = DeliveryPolicy(True, None, None, True, assessor=cls.assess)
+        DeliveryPolicy.register(EquipmentType.CRT, MessageKind.COMMAND, policy)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def assess(cls, message: Message) -> tuple[MQPriority, float | None]:
+        # returns the priority and ttl of the command - the body is examined once, for both
+        meta = cls.metadata(message.body)
+
+        if meta is None:
+            return MQPriority.NORMAL, None
+
+        return (MQPriority.URGENT if meta.urgent else MQPriority.NORMAL), meta.ttl
+
+
+    @classmethod
+    def metadata(cls, body: Any) -> CommandMetadata | None:
+        # None if the body is not a valid command - the subscriber will reject it
+        if isinstance(body, Command):
+            return body.meta
+
+        try:
+            type_name = body['type']
+            header_name = body['x_header'] if type_name == XCommand.type_name() else body['header']
+        except (KeyError, TypeError):
+            return None
+
+        try:
+            return cls.__METADATA[(type_name, header_name)]
+        except KeyError:
+            pass
+        except TypeError:
+            return None                             # not hashable, so not a header name
+
+        try:
+            if type_name == XCommand.type_name():
+                meta = XCommandMetadata.find_x(XHeader[header_name])
+            elif type_name == Command.type_name():
+                meta = CommandMetadata.find(Header[header_name])
+            else:
+                return None
+
+        except (KeyError, TypeError):
+            return None
+
+        cls.__METADATA[(type_name, header_name)] = meta     # keys are bounded by the header enumerations
+
+        return meta
@@ -10,26 +10,61 @@ produced by the station are published.
 
 In this implementation, the ControlRouterNode runs a keep-alive. If this fails, then the station is marked as
 unavailable. In this case, subsequent command messages remain on the queue. Once the station is available again,
-those command messages are processed. Messages that are received while the station is unavailable - but before its
-unavailabily is determined - may be lost.
+those command messages are processed - except for those whose time-to-live has expired, which are dropped and
+counted. Messages that are received while the station is unavailable - but before its unavailabily is determined -
+may be lost.
+
+Urgent commands - emergency stop and track power - are published at a raised priority, so they are delivered ahead
+of any backlog on the queue, and the station sends them without waiting for its pacing interval. The delay of an urgent
+command is therefore bounded by the prefetch window, rather than by the size of the backlog.
+
+Reports are published on behalf of the equipment that they concern - blocks (BLK.<detector address>.<channel>),
+turnouts (TRN.*.<address>) and motive power units (MPU.*.<address>) - so the topic exchange delivers each subscriber
+only the traffic that it subscribes to. Track and other station reports are published as the control router's own.
+
+Reports are published as JSON by default. Where every subscriber host has the msgpack package, the node may be
+constructed with the compact MessagePack encoding instead - a subscriber without msgpack would drop every report.
+
+State reports are conflated before publication: while the publisher is busy, only the newest unsent report for each
+(report type, equipment address) is kept. Subscribers still converge to the current state, but publication load scales
+with the amount of equipment, not with the Z21 broadcast rate.
+
+While the broker is unreachable, the outbox holds up to __OUTBOX_CAPACITY reports in memory, then overflows to an
+append-only journal beside the node's databases. On reconnection, the outbox drains in order. Each report carries a
+sequence number within its stream - its report type and equipment - including in the journal. A report whose
+publication is not confirmed is returned to the outbox only if it is the newest of its stream: otherwise, a newer report
+is waiting, in flight or published, and supersedes it. While the broker applies flow control (connection.blocked), the
+outbox is not drawn on, so reports conflate there.
 
 Test with:
 mrcs_control_router -t -r -v
 mrcs_control_publisher -t -v -r 'CRT.*.1' -m '{"type": "XCommand", "x_header": "LAN_X_SET_TRACK_POWER", "argv": [129]}'
 mrcs_control_subscriber -t -v   -s 'CRT.*.*'
+mrcs_control_subscriber -t -v   -s 'TRN.*.*'
 """
 
 import asyncio
+import functools
+import itertools
+import time
 
 from mrcs_control.dcc.z21.command.command import Command
 from mrcs_control.dcc.z21.command.station import Z21Station
+from mrcs_control.messaging.mq_codec import MQEncoding
 from mrcs_control.messaging.mq_enums import MQTopology
+from mrcs_control.messaging.routing_key_cache import RoutingKeyCache
 from mrcs_control.operations.async_messaging_node import AsyncSubscriberNode
 from mrcs_control.operations.node_enums import NodeTopology
+from mrcs_control.sys.spill_queue import SpillQueue
 from mrcs_core.data.equipment_identity import EquipmentFilter, EquipmentIdentifier, EquipmentType
 from mrcs_core.data.json import JSONable, JSONify
+from mrcs_core.equipment.block.block_report import BlockOccupancyReport, BlockVoltageReport
 from mrcs_core.equipment.control_router.control_router_conf import ControlRouterConf
 from mrcs_core.equipment.control_router.control_router_report import ControlRouterReport
+from mrcs_core.equipment.motive_power_unit.mpu_configuration_report import MPUConfigurationReport
+from mrcs_core.equipment.motive_power_unit.mpu_decoder_report import MPUDecoderReport
+from mrcs_core.equipment.track.track_report import TrackReport
+from mrcs_core.equipment.turnout.turnout_report import TurnoutReport
 from mrcs_core.messaging.message import Message
 from mrcs_core.messaging.routing_key import PublicationRoutingKey, SubscriptionRoutingKey
 
@@ -44,6 +79,16 @@ class ControlRouterNode(AsyncSubscriberNode):
     __KEEP_ALIVE_INTERVAL = 10.0  # seconds
     __RETRY_INTERVAL = 5.0  # seconds
 
+    __PREFETCH_COUNT = 32  # deliveries
+    __MAX_CONCURRENCY = 8  # messages processed at once - ordering is kept per source
+
+    __OUTBOX_CAPACITY = 1000  # reports held in memory - more are journalled to disk
+
+    # report types whose streams are conflated - reports of other types, such as block occupancy events, are not
+    __CONFLATED_TYPES = frozenset(report_type.__name__ for report_type in
+                                  (MPUConfigurationReport, MPUDecoderReport, TurnoutReport, BlockVoltageReport,
+                                   TrackReport))
+
 
     # ----------------------------------------------------------------------------------------------------------------
 
@@ -58,36 +103,104 @@ class ControlRouterNode(AsyncSubscriberNode):
 
 
     @classmethod
-    def publication_routing_key(cls):
-        return PublicationRoutingKey(cls.id(), EquipmentFilter.any())
+    def publication_routing_key(cls, report: JSONable | None = None):
+        source = cls.id() if report is None else cls.publication_source(report)
+
+        return PublicationRoutingKey(source, EquipmentFilter.any())
+
+
+    @classmethod
+    def publication_source(cls, report: JSONable) -> EquipmentIdentifier:
+        if isinstance(report, (MPUConfigurationReport, MPUDecoderReport)):
+            return EquipmentIdentifier(EquipmentType.MPU, None, report.mpu_address)
+
+        if isinstance(report, TurnoutReport):
+            return EquipmentIdentifier(EquipmentType.TRN, None, report.turnout_address)
+
+        if isinstance(report, (BlockVoltageReport, BlockOccupancyReport)):
+            detector_address, channel = report.block_address.split('/')     # as for BlockStatus
+            return EquipmentIdentifier(EquipmentType.BLK, int(detector_address), int(channel))
+
+        return cls.id()
+
+
+    @classmethod
+    def stream(cls, report: JSONable) -> tuple[str, str]:
+        # the report type and the equipment that it concerns - a newer report of a stream supersedes an older one
+        return type(report).__name__, JSONify.dumps(cls.publication_source(report))
+
+
+    @classmethod
+    def conflation_key(cls, stream: tuple[str, str]) -> tuple[str, str] | None:
+        report_type, _ = stream
+
+        return stream if report_type in cls.__CONFLATED_TYPES else None
+
+
+    @staticmethod
+    def encode_outgoing(outgoing: tuple) -> str:
+        # outgoing is (stream, sequence, message)
+        (report_type, source), sequence, message = outgoing
+        wire = RoutingKeyCache.instance().wire(message.routing_key)
+
+        return '\t'.join((str(sequence), report_type, source, wire, JSONify.dumps(message.payload)))
+
+
+    @staticmethod
+    def decode_outgoing(line: str) -> tuple:
+        sequence, report_type, source, wire, payload = line.split('\t', 4)
+        message = Message.construct_from_callback(RoutingKeyCache.instance().parse(wire), payload)
+
+        return (report_type, source), int(sequence), message
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, ops: NodeTopology.ServiceConfiguration, conf: ControlRouterConf):
-        super().__init__(ops, MQTopology.SINGLE)
+    def __init__(self, ops: NodeTopology.ServiceConfiguration, conf: ControlRouterConf,
+                 encoding: MQEncoding = MQEncoding.JSON):
+        # the compact encoding is for deployments where every subscriber can decode it
+        super().__init__(ops, MQTopology.SINGLE, prefetch_count=self.__PREFETCH_COUNT,
+                         max_concurrency=self.__MAX_CONCURRENCY, encoding=encoding)
         self.__conf = conf
 
         self.__station = None
         self.__monitor_task = None
+        self.__outbox = SpillQueue(ops.state_path('control_router.outbox'), self.__OUTBOX_CAPACITY,
+                                   self.encode_outgoing, self.decode_outgoing)
+        self.__outbox_task = None
+
+        # sequences are seeded from the clock, so that they also order reports journalled by an earlier process
+        self.__sequence = itertools.count(time.time_ns())
+        self.__newest = {}                      # stream: the sequence of its newest report
+
         self.__station_ready = False
         self.__station_ready_event = asyncio.Event()
 
+        self.__dropped_commands = 0
+
 
     # ----------------------------------------------------------------------------------------------------------------
     # messaging handlers...
 
     def handle_startup(self):
         self.logger.debug('handle_startup')
+        if self.__outbox_task is None:
+            self.__outbox_task = self.async_loop.create_task(self.publish_outbox())
+
         if self.__monitor_task is None:
             self.__monitor_task = self.async_loop.create_task(self.monitor())
 
 
-    async def handle_message(self, message: Message):
+    async def handle_message(self, message: Message, deadline: float | None = None):
         self.logger.info(f'handle_message:{JSONify.as_jdict(message)}')
 
         await self.__wait_until_station_ready()
 
+        if self.mq_client.is_expired(deadline):
+            self.__dropped_commands += 1
+            self.logger.info(f'handle_message - expired:{message} dropped_commands:{self.dropped_commands}')
+            return
+
         try:
             command = Command.construct_from_jdict(message.body)
             await self.station.send_command(command)
@@ -115,10 +228,12 @@ class ControlRouterNode(AsyncSubscriberNode):
         if isinstance(report, ControlRouterReport):
             return
 
-        # TODO: publish with different IDs, depending on the report type?
+        stream = self.stream(report)
+        sequence = next(self.__sequence)
+        self.__newest[stream] = sequence
 
-        outgoing = Message(self.publication_routing_key(), report)
-        self.async_loop.create_task(self.mq_client.publish(outgoing))
+        message = Message(self.publication_routing_key(report), report)
+        self.__outbox.put(self.conflation_key(stream), (stream, sequence, message))
 
 
     def on_connection_lost(self):
@@ -128,6 +243,47 @@ class ControlRouterNode(AsyncSubscriberNode):
 
     # ----------------------------------------------------------------------------------------------------------------
 
+    async def publish_outbox(self):
+        self.logger.debug('publish_outbox')
+
+        while True:
+            await self.mq_client.wait_until_unblocked()     # while the broker is blocked, reports conflate
+            outgoing = await self.__outbox.get()
+            stream, sequence, message = outgoing
+
+            # a report journalled by an earlier process may be the newest of its stream
+            self.__newest[stream] = max(sequence, self.__newest.get(stream, sequence))
+
+            try:
+                confirmation = await self.publish(message)     # waits while unavailable or the window is full
+            except (asyncio.CancelledError, ConnectionError):
+                self.requeue(outgoing)              # reconnection has been abandoned, or the node is halting
+                raise
+            except Exception as exc:
+                self.logger.warning(f'publish_outbox:{type(exc).__name__}:{exc} on:{message}')
+                continue
+
+            if confirmation is not None:
+                confirmation.add_done_callback(functools.partial(self.on_confirmation, outgoing))
+
+
+    def on_confirmation(self, outgoing: tuple, confirmation: asyncio.Future):
+        if not confirmation.cancelled() and confirmation.result():
+            return
+
+        self.requeue(outgoing)
+
+
+    def requeue(self, outgoing: tuple):
+        stream, sequence, message = outgoing
+
+        if sequence < self.__newest.get(stream, sequence):
+            self.logger.info(f'requeue - superseded:{message}')
+            return
+
+        self.__outbox.put(self.conflation_key(stream), outgoing)
+
+
     async def monitor(self):
         self.logger.debug('monitor')
 
@@ -174,6 +330,16 @@ class ControlRouterNode(AsyncSubscriberNode):
     async def shutdown(self):
         self.logger.debug('shutdown')
 
+        outbox_task = self.__outbox_task
+        if outbox_task is not None and not outbox_task.done():
+            outbox_task.cancel()
+            try:
+                await outbox_task
+            except asyncio.CancelledError:
+                pass
+
+        self.__outbox.close()           # journalled reports are published on restart - those in memory are not
+
         task = self.__monitor_task
         if task is not None and not task.done() and task is not asyncio.current_task():
             task.cancel()
@@ -213,6 +379,16 @@ class ControlRouterNode(AsyncSubscriberNode):
         return self.__station
 
 
+    @property
+    def dropped_commands(self):
+        return self.__dropped_commands + self.mq_client.expired
+
+
+    @property
+    def outbox(self):
+        return self.__outbox
+
+
     @property
     def station_ready(self):
         return self.__station_ready
@@ -236,4 +412,4 @@ class ControlRouterNode(AsyncSubscriberNode):
 
     def __str__(self, *args, **kwargs):
         return (f'ControlRouterNode:{{conf:{self.conf}, station:{self.station}, station_ready:{self.station_ready}, '
-                f'ops:{self.ops}, mq_client:{self.mq_client}}}')
+                f'outbox:{self.outbox}, ops:{self.ops}, mq_client:{self.mq_client}}}')
@@ -0,0 +1,187 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+Coalesces the acknowledgements for the deliveries on a channel
+
+Deliveries are registered in delivery order. When the batch is flushed, the longest run of settled deliveries at the
+head of the channel's outstanding deliveries is released: failed deliveries in the run are rejected individually with
+basic_nack - requeued, or discarded - and the successful deliveries are then acknowledged with a single basic_ack,
+using multiple=True. Since a rejected delivery is no longer outstanding, the multiple ack does not cover it, and a
+failure does not break the run. Deliveries behind a still-pending delivery are acknowledged or rejected individually.
+
+Delivery tags are scoped to a channel, so a batcher must be retired when its channel closes - it then ignores any
+further outcomes, from processing that was in progress at the time.
+
+https://www.rabbitmq.com/docs/confirms#consumer-acks-multiple-parameter
+"""
+
+from collections import OrderedDict
+from typing import Callable
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class AckBatcher(object):
+    """
+    Coalesces the acknowledgements for the deliveries on a channel
+    """
+
+    __PENDING = 'pending'
+    __SUCCEEDED = 'succeeded'
+    __REQUEUED = 'requeued'
+    __DISCARDED = 'discarded'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, ack: Callable[[int, bool], None], nack: Callable[[int, bool], None], batch_size: int):
+        if batch_size < 1:
+            raise ValueError(f'batch_size must be at least 1, got {batch_size}')
+
+        self.__ack = ack                            # ack(delivery_tag, multiple)
+        self.__nack = nack                          # nack(delivery_tag, requeue)
+        self.__batch_size = batch_size
+
+        self.__deliveries = OrderedDict()           # delivery_tag: state, in delivery order
+        self.__unflushed = 0                        # settled deliveries awaiting acknowledgement or rejection
+        self.__is_retired = False
+
+        self.__frames = 0
+        self.__acked = 0
+        self.__nacked = 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def delivered(self, delivery_tag: int):
+        if not self.is_retired:
+            self.__deliveries[delivery_tag] = self.__PENDING
+
+
+    def succeeded(self, delivery_tag: int) -> bool:
+        # returns True if the batch should be flushed now
+        return self.__settle(delivery_tag, self.__SUCCEEDED)
+
+
+    def failed(self, delivery_tag: int, requeue: bool = True) -> bool:
+        # returns True if the batch should be flushed now
+        return self.__settle(delivery_tag, self.__REQUEUED if requeue else self.__DISCARDED)
+
+
+    def flush(self):
+        if self.is_retired or self.__unflushed == 0:
+            return
+
+        # the run of settled deliveries at the head...
+        highest = None
+        count = 0
+
+        while self.__deliveries:
+            delivery_tag, state = next(iter(self.__deliveries.items()))
+
+            if state == self.__PENDING:
+                break
+
+            self.__deliveries.popitem(last=False)
+
+            if state == self.__SUCCEEDED:
+                highest = delivery_tag
+                count += 1
+            else:
+                self.__reject(delivery_tag, state)
+
+        if highest is not None:
+            self.__send(highest, True, count)
+
+        # the stragglers...
+        for delivery_tag, state in list(self.__deliveries.items()):
+            if state == self.__PENDING:
+                continue
+
+            del self.__deliveries[delivery_tag]
+
+            if state == self.__SUCCEEDED:
+                self.__send(delivery_tag, False, 1)
+            else:
+                self.__reject(delivery_tag, state)
+
+        self.__unflushed = 0
+
+
+    def retire(self):
+        self.__is_retired = True
+        self.__deliveries.clear()
+        self.__unflushed = 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __settle(self, delivery_tag: int, state: str) -> bool:
+        if self.is_retired or self.__deliveries.get(delivery_tag) != self.__PENDING:
+            return False
+
+        self.__deliveries[delivery_tag] = state
+        self.__unflushed += 1
+
+        return self.__unflushed >= self.batch_size
+
+
+    def __send(self, delivery_tag: int, multiple: bool, count: int):
+        self.__ack(delivery_tag, multiple)
+
+        self.__frames += 1
+        self.__acked += count
+
+
+    def __reject(self, delivery_tag: int, state: str):
+        self.__nack(delivery_tag, state == self.__REQUEUED)
+
+        self.__frames += 1
+        self.__nacked += 1
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def batch_size(self):
+        return self.__batch_size
+
+
+    @property
+    def is_retired(self):
+        return self.__is_retired
+
+
+    @property
+    def outstanding(self):
+        return len(self.__deliveries)
+
+
+    @property
+    def unflushed(self):
+        return self.__unflushed
+
+
+    @property
+    def frames(self):
+        return self.__frames
+
+
+    @property
+    def acked(self):
+        return self.__acked
+
+
+    @property
+    def nacked(self):
+        return self.__nacked
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'AckBatcher:{{batch_size:{self.batch_size}, outstanding:{self.outstanding}, '
+                f'unflushed:{self.unflushed}, frames:{self.frames}, acked:{self.acked}, nacked:{self.nacked}, '
+                f'is_retired:{self.is_retired}}}')
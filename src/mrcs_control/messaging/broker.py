@@ -4,20 +4,30 @@ Created on 1 Nov 2025
 @author: Bruno Beloff (bbeloff@me.com)
 
 Access to the RabbitMQ broker API
-Note that queues (and exchanges) should only be deleted using messaging clients.
+Note that queues (and exchanges) should only be deleted using messaging clients. Queues may be drained - their ready
+messages purged - while their clients are running.
+
+Broker makes a request (and a connection) per call, for occasional use by scripts. AsyncBroker holds an HTTP/1.1
+keep-alive connection pool for its lifetime, for use by long-running nodes - per-queue requests are made concurrently,
+up to the size of the pool.
 
 https://www.rabbitmq.com/docs/http-api-reference
 https://stackoverflow.com/questions/4287941/how-can-i-list-or-discover-queues-on-a-rabbitmq-exchange-using-python
+https://www.python-httpx.org/advanced/resource-limits/
 """
 
+import asyncio
+from typing import Any, Self
+from urllib.parse import quote
+
 import httpx
 
+from mrcs_control.messaging.queue_depth_poller import QueueDepth
 from mrcs_core.messaging.exchange import Exchange
 from mrcs_core.messaging.queue import Queue
 from mrcs_core.sys.logging import Logging
 
 
-# TODO: add functionality to drain (individual) queues without needing to stop all clients
 # --------------------------------------------------------------------------------------------------------------------
 
 class Broker(object):
@@ -31,6 +41,7 @@ class Broker(object):
     __DEFAULT_PASSWORD = 'guest'
 
     __DEFAULT_VIRTUAL_HOST = ''
+    __DEFAULT_VIRTUAL_HOST_NAME = '%2F'                       # '/', URL-encoded
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -76,6 +87,14 @@ class Broker(object):
         return queues
 
 
+    def drain(self, queue_name: str):
+        url = f'{self.__base_url()}/api/queues/{self.__DEFAULT_VIRTUAL_HOST_NAME}/{quote(queue_name, safe="")}/contents'
+        response = httpx.delete(url, auth=(self.username, self.password))
+        response.raise_for_status()
+
+        self.__logger.info(f'drain:{queue_name}')
+
+
     def __base_url(self):
         return f'http://127.0.0.1:{self.port}'          # host literal to prevent security warning
 
@@ -101,3 +120,188 @@ class Broker(object):
 
     def __str__(self, *args, **kwargs):
         return f'Broker:{{host:127.0.0.1, port:{self.port}, username:{self.username}, password:{self.password}}}'
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class AsyncBroker(object):
+    """
+    Access to the RabbitMQ broker API, over a pool of keep-alive connections
+    """
+
+    __DEFAULT_PORT = 15672
+
+    __DEFAULT_USERNAME = 'guest'
+    __DEFAULT_PASSWORD = 'guest'
+
+    __DEFAULT_VIRTUAL_HOST = ''
+    __DEFAULT_VIRTUAL_HOST_NAME = '%2F'                       # '/', URL-encoded
+
+    __DEFAULT_CONCURRENCY = 4                                 # connections in the pool, and requests in flight
+    __DEFAULT_TIMEOUT = 5.0                                   # seconds
+    __KEEP_ALIVE_EXPIRY = 30.0                                # seconds - longer than the queue depth poll interval
+
+    __DEPTH_COLUMNS = 'name,messages,messages_ready,messages_unacknowledged,consumers'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def construct(cls, port=None, username=None, password=None):
+        mgr_port = cls.__DEFAULT_PORT if port is None else port
+
+        mgr_username = cls.__DEFAULT_USERNAME if username is None else username
+        mgr_password = cls.__DEFAULT_PASSWORD if password is None else password
+
+        return cls(mgr_port, mgr_username, mgr_password, cls.__DEFAULT_CONCURRENCY, cls.__DEFAULT_TIMEOUT)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, port, username, password, concurrency: int, timeout: float):
+        if concurrency < 1:
+            raise ValueError(f'concurrency must be at least 1, got:{concurrency}')
+
+        self.__port = port
+
+        self.__username = username
+        self.__password = password
+
+        self.__concurrency = concurrency
+        self.__timeout = timeout
+
+        self.__client = None                                    # opened lazily
+        self.__in_flight = asyncio.Semaphore(concurrency)
+
+        self.__logger = Logging.getLogger()
+
+
+    async def __aenter__(self) -> Self:
+        return self
+
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: Any,
+    ) -> None:
+        await self.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    async def list_exchanges(self):
+        jdicts = await self.__get(f'/api/exchanges/{self.__DEFAULT_VIRTUAL_HOST}')
+
+        return [Exchange.construct_from_jdict(q) for q in jdicts]
+
+
+    async def list_queues(self):
+        jdicts = await self.__get(f'/api/queues/{self.__DEFAULT_VIRTUAL_HOST}')
+
+        return [Queue.construct_from_jdict(q) for q in jdicts]
+
+
+    async def queue(self, queue_name: str):
+        return Queue.construct_from_jdict(await self.__get(self.__queue_path(queue_name)))
+
+
+    async def queues(self, queue_names: list[str]):
+        # details are fetched concurrently - the order of queue_names is preserved
+        return list(await asyncio.gather(*[self.queue(queue_name) for queue_name in queue_names]))
+
+
+    async def queue_depths(self, queue_names: list[str] | None = None) -> list[QueueDepth | None]:
+        if queue_names is None:
+            jdicts = await self.__get(f'/api/queues/{self.__DEFAULT_VIRTUAL_HOST}',
+                                      params={'columns': self.__DEPTH_COLUMNS, 'disable_stats': 'true',
+                                              'enable_queue_totals': 'true'})
+        else:
+            jdicts = await asyncio.gather(*[self.__get(self.__queue_path(queue_name),
+                                                       params={'columns': self.__DEPTH_COLUMNS})
+                                            for queue_name in queue_names])
+
+        return [QueueDepth.construct_from_jdict(jdict) for jdict in jdicts]
+
+
+    async def drain(self, queue_name: str):
+        async with self.__in_flight:
+            response = await self.client.delete(f'{self.__queue_path(queue_name)}/contents')
+
+        response.raise_for_status()
+
+        self.__logger.info(f'drain:{queue_name}')
+
+
+    async def close(self):
+        if self.__client is None:
+            return
+
+        await self.__client.aclose()
+        self.__client = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    async def __get(self, path: str, params: dict | None = None):
+        async with self.__in_flight:
+            response = await self.client.get(path, params=params)
+
+        response.raise_for_status()
+
+        return response.json()
+
+
+    def __queue_path(self, queue_name: str):
+        return f'/api/queues/{self.__DEFAULT_VIRTUAL_HOST_NAME}/{quote(queue_name, safe="")}'
+
+
+    def __base_url(self):
+        return f'http://127.0.0.1:{self.port}'          # host literal to prevent security warning
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self.__client is None:
+            limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency,
+                                  keepalive_expiry=self.__KEEP_ALIVE_EXPIRY)
+
+            self.__client = httpx.AsyncClient(base_url=self.__base_url(), auth=(self.username, self.password),
+                                              limits=limits, timeout=self.__timeout)
+
+        return self.__client
+
+
+    @property
+    def port(self):
+        return self.__port
+
+
+    @property
+    def username(self):
+        return self.__username
+
+
+    @property
+    def password(self):
+        return self.__password
+
+
+    @property
+    def concurrency(self):
+        return self.__concurrency
+
+
+    @property
+    def is_open(self):
+        return self.__client is not None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'AsyncBroker:{{host:127.0.0.1, port:{self.port}, username:{self.username}, '
+                f'password:{self.password}, concurrency:{self.concurrency}, is_open:{self.is_open}}}')
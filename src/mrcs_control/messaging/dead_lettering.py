@@ -0,0 +1,197 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+Dead-lettering for a subscriber queue: a dead-letter exchange, tiered delay queues and a poison queue
+
+When a message handler fails, the message is acked, and a copy is published to a delay queue, with its retry count
+incremented in a header. Delay queues have no consumers - when the delay expires, the broker dead-letters the copy
+to the dead-letter exchange (<exchange>.dlx), which routes it back to the subscriber's queue, and only that queue.
+Successive retries use successively longer delays. Once max_attempts have failed, the message is published to the
+subscriber's poison queue (<queue>.dead), where it remains for inspection.
+
+A failing message therefore never blocks the queue, and is never redelivered in a hot loop.
+
+The routing key of a retried message is carried in a header, since the delay queue is addressed by name. So is its
+time-to-live: a copy cannot keep its AMQP expiration - the delay queue would discard it - but the subscriber still
+needs the original expiration, with the original timestamp, to compute the message's deadline.
+
+A message must only be acked once its copy has been confirmed by the broker - otherwise a lost copy loses the message.
+
+https://www.rabbitmq.com/docs/dlx
+https://www.rabbitmq.com/docs/ttl#queue-ttl
+"""
+
+import pika
+from pika.exchange_type import ExchangeType
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class DeadLettering(object):
+    """
+    Dead-lettering for a subscriber queue: a dead-letter exchange, tiered delay queues and a poison queue
+    """
+
+    RETRIES_HEADER = 'x-mrcs-retries'
+    ROUTING_KEY_HEADER = 'x-mrcs-routing-key'
+    EXPIRATION_HEADER = 'x-mrcs-expiration'
+
+    __DEFAULT_DELAYS = (1.0, 10.0, 60.0)        # seconds
+    __DEFAULT_MAX_ATTEMPTS = 5
+
+
+    @classmethod
+    def construct(cls, exchange_name: str, queue_name: str):
+        return cls(exchange_name, queue_name, cls.__DEFAULT_DELAYS, cls.__DEFAULT_MAX_ATTEMPTS)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def retries(cls, properties: pika.BasicProperties) -> int:
+        headers = properties.headers or {}
+
+        try:
+            return int(headers.get(cls.RETRIES_HEADER, 0))
+        except (TypeError, ValueError):
+            return 0
+
+
+    @classmethod
+    def routing_key(cls, delivered_routing_key: str, properties: pika.BasicProperties) -> str:
+        headers = properties.headers or {}
+
+        return headers.get(cls.ROUTING_KEY_HEADER, delivered_routing_key)
+
+
+    @classmethod
+    def expiration(cls, properties: pika.BasicProperties) -> str | None:
+        # the AMQP expiration of the original message, in milliseconds, as a string
+        if properties.expiration is not None:
+            return properties.expiration
+
+        headers = properties.headers or {}
+
+        return headers.get(cls.EXPIRATION_HEADER)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, exchange_name: str, queue_name: str, delays: tuple[float, ...], max_attempts: int):
+        if not delays:
+            raise ValueError('at least one delay is required')
+
+        if max_attempts < 1:
+            raise ValueError(f'max_attempts must be at least 1, got {max_attempts}')
+
+        self.__exchange_name = exchange_name
+        self.__queue_name = queue_name
+        self.__delays = delays
+        self.__max_attempts = max_attempts
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def declare(self, channel):
+        # valid for blocking and async channels - async RPCs are serialised by the channel
+        channel.exchange_declare(exchange=self.dlx_name, exchange_type=ExchangeType.direct, durable=True)
+        channel.queue_bind(queue=self.queue_name, exchange=self.dlx_name, routing_key=self.queue_name)
+
+        for tier in range(len(self.delays)):
+            channel.queue_declare(queue=self.delay_queue_name(tier), durable=True,
+                                  arguments=self.delay_queue_arguments(tier))
+
+        channel.queue_declare(queue=self.dead_queue_name, durable=True)
+
+
+    def reject(self, channel, delivered_routing_key: str, properties: pika.BasicProperties, body: bytes) -> bool:
+        # returns True if the message will be retried, False if it has been poisoned
+        # on a blocking channel in confirm mode, raises NackError or UnroutableError if the copy is not confirmed
+        destination, retry_properties, will_retry = self.redirect(delivered_routing_key, properties)
+
+        channel.basic_publish(exchange='', routing_key=destination, body=body, properties=retry_properties,
+                              mandatory=True)
+
+        return will_retry
+
+
+    def redirect(self, delivered_routing_key: str,
+                 properties: pika.BasicProperties) -> tuple[str, pika.BasicProperties, bool]:
+        # returns the destination queue, the properties of the copy, and True if the message will be retried
+        retries = self.retries(properties)
+        is_poisoned = retries + 1 >= self.max_attempts
+
+        destination = self.dead_queue_name if is_poisoned else \
+            self.delay_queue_name(min(retries, len(self.delays) - 1))
+
+        headers = dict(properties.headers or {})
+        headers[self.RETRIES_HEADER] = retries + 1
+        headers[self.ROUTING_KEY_HEADER] = self.routing_key(delivered_routing_key, properties)
+
+        expiration = self.expiration(properties)
+
+        if expiration is not None:
+            headers[self.EXPIRATION_HEADER] = expiration
+
+        # per-message expiration is carried in a header - the delay queue would otherwise discard the message
+        retry_properties = pika.BasicProperties(content_type=properties.content_type,
+                                                delivery_mode=pika.DeliveryMode.Persistent,
+                                                priority=properties.priority, timestamp=properties.timestamp,
+                                                headers=headers)
+
+        return destination, retry_properties, not is_poisoned
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def delay_queue_name(self, tier: int) -> str:
+        return f'{self.queue_name}.retry.{tier}'
+
+
+    def delay_queue_arguments(self, tier: int) -> dict:
+        return {
+            'x-message-ttl': int(self.delays[tier] * 1000),
+            'x-dead-letter-exchange': self.dlx_name,
+            'x-dead-letter-routing-key': self.queue_name,
+        }
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def exchange_name(self):
+        return self.__exchange_name
+
+
+    @property
+    def queue_name(self):
+        return self.__queue_name
+
+
+    @property
+    def delays(self):
+        return self.__delays
+
+
+    @property
+    def max_attempts(self):
+        return self.__max_attempts
+
+
+    @property
+    def dlx_name(self):
+        return f'{self.exchange_name}.dlx'
+
+
+    @property
+    def dead_queue_name(self):
+        return f'{self.queue_name}.dead'
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'DeadLettering:{{exchange_name:{self.exchange_name}, queue_name:{self.queue_name}, '
+                f'delays:{self.delays}, max_attempts:{self.max_attempts}}}')
@@ -0,0 +1,189 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+A bounded, time-expiring set of the origins and routing keys of recently-processed messages
+
+A subscriber records the origin and wire routing key of each message that it has processed successfully. A relay
+republishes a message under its own routing key, but with its original origin, so the origin alone does not identify a
+delivery. A delivery whose origin and routing key have been recorded is a redelivery - typically following a channel
+drop before the original was acked - so it is acked without running the handler again. Handlers then have exactly-once
+effect, provided that redeliveries arrive within ttl seconds, and before max_size later messages have been processed.
+
+Given a path, the set is persisted as an append-only journal of (key, time) lines, so that it survives restarts -
+this is appropriate for subscribers to SINGLE-topology queues, whose unacked messages outlive the process. The journal
+is compacted when it is loaded, and when it grows to twice max_size lines.
+
+https://www.rabbitmq.com/docs/reliability#consumer-side
+"""
+
+import os
+import time
+from collections import OrderedDict
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class DedupCache(object):
+    """
+    A bounded, time-expiring set of the origins and routing keys of recently-processed messages
+    """
+
+    __DEFAULT_MAX_SIZE = 10000
+    __DEFAULT_TTL = 3600.0                  # seconds
+
+
+    @classmethod
+    def construct(cls, path: str | None = None):
+        return cls(cls.__DEFAULT_MAX_SIZE, cls.__DEFAULT_TTL, path=path)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, max_size: int, ttl: float, path: str | None = None):
+        if max_size < 1:
+            raise ValueError(f'max_size must be at least 1, got:{max_size}')
+
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__path = path                  # None for an in-memory set
+
+        self.__keys = OrderedDict()         # key: time recorded (epoch seconds), oldest first
+        self.__writer = None
+        self.__journalled = 0               # lines in the journal
+
+        self.__duplicates = 0
+
+        if path is not None:
+            self.__load()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def is_duplicate(self, origin: str | None, routing_key: str) -> bool:
+        if origin is None:
+            return False
+
+        self.__expire(time.time())
+
+        if self.key(origin, routing_key) not in self.__keys:
+            return False
+
+        self.__duplicates += 1
+        return True
+
+
+    def record(self, origin: str | None, routing_key: str):
+        if origin is None:
+            return
+
+        key = self.key(origin, routing_key)
+        now = time.time()
+
+        self.__keys.pop(key, None)
+        self.__keys[key] = now
+        self.__expire(now)
+
+        if self.path is not None:
+            self.__append(key, now)
+
+
+    @staticmethod
+    def key(origin: str, routing_key: str) -> str:
+        return f'{routing_key} {origin}'
+
+
+    def close(self):
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __expire(self, now: float):
+        while self.__keys:
+            key, recorded = next(iter(self.__keys.items()))
+
+            if len(self.__keys) <= self.max_size and now - recorded <= self.ttl:
+                break
+
+            del self.__keys[key]
+
+
+    def __append(self, key: str, recorded: float):
+        if self.__journalled >= 2 * self.max_size:
+            self.__compact()
+
+        if self.__writer is None:
+            self.__writer = open(self.path, 'a')
+
+        self.__writer.write(f'{key}\t{recorded}\n')
+        self.__writer.flush()
+
+        self.__journalled += 1
+
+
+    def __load(self):
+        try:
+            with open(self.path) as reader:
+                for line in reader:
+                    try:
+                        key, recorded = line.rstrip('\n').split('\t')
+                        self.__keys.pop(key, None)
+                        self.__keys[key] = float(recorded)
+                    except ValueError:
+                        pass            # a line torn by a crash
+
+        except FileNotFoundError:
+            return
+
+        self.__expire(time.time())
+        self.__compact()
+
+
+    def __compact(self):
+        self.close()
+
+        interim = self.path + '.tmp'
+
+        with open(interim, 'w') as writer:
+            for key, recorded in self.__keys.items():
+                writer.write(f'{key}\t{recorded}\n')
+
+        os.replace(interim, self.path)
+        self.__journalled = len(self.__keys)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def max_size(self):
+        return self.__max_size
+
+
+    @property
+    def ttl(self):
+        return self.__ttl
+
+
+    @property
+    def path(self):
+        return self.__path
+
+
+    @property
+    def duplicates(self):
+        return self.__duplicates
+
+
+    def __len__(self):
+        return len(self.__keys)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'DedupCache:{{max_size:{self.max_size}, ttl:{self.ttl}, path:{self.path}, size:{len(self)}, '
+                f'duplicates:{self.duplicates}}}')
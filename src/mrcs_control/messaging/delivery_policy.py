@@ -0,0 +1,220 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+Per-topic delivery policies, applied by the publishers
+
+* MessageKind - a message is a REPORT if it is broadcast (its target filter has no equipment type), otherwise it is
+a COMMAND, directed at specific equipment.
+
+* DeliveryPolicy - the persistence, time-to-live, priority and mandatory flag for a kind of message, keyed by the
+equipment type concerned - the source of a REPORT, or the target of a COMMAND. Messages without a catalogued policy
+are persistent, with no expiry.
+
+Commands stay durable. High-rate telemetry, such as control router reports, is transient and short-lived - a
+subscriber only needs the current state, and persisting every broadcast causes unnecessary broker disk I/O. The control
+router publishes reports on behalf of the equipment concerned - blocks, turnouts and motive power units - so these
+equipment types share its report policy.
+
+A policy may also give individual messages a priority and a time-to-live, with an assessor, which examines each
+message once, for both. An assessor knows the content of the messages, so it is supplied by the equipment concerned,
+which registers its policy with the catalogue - for example, the control router registers the policy for its commands
+(see CommandDelivery). Where an assessor returns None, or fails, the policy's own priority or ttl applies.
+
+The catalogue is built on first use - by find or register - rather than on import. init() rebuilds it, discarding
+any policies that have been registered.
+
+Messages with a time-to-live carry an AMQP expiration, so the broker discards them if they wait too long on the queue,
+and an AMQP timestamp, so that the subscriber can discard them if they wait too long after delivery. Expiry by
+timestamp assumes that the publisher and subscriber hosts have synchronised clocks.
+
+https://www.rabbitmq.com/docs/persistence-conf
+https://www.rabbitmq.com/docs/ttl#per-message-ttl-in-publishers
+https://www.rabbitmq.com/docs/publishers#unroutable
+https://www.rabbitmq.com/docs/priority
+https://www.rabbitmq.com/docs/ttl#per-message-ttl-caveats
+"""
+
+import time
+from enum import StrEnum, unique
+from typing import Callable, Dict
+
+import pika
+
+from mrcs_core.data.equipment_identity import EquipmentType
+from mrcs_core.data.meta_enum import MetaEnum
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey
+from mrcs_core.sys.logging import Logging
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+@unique
+class MessageKind(StrEnum, metaclass=MetaEnum):
+    """
+    An enumeration of the kinds of message
+    """
+
+    COMMAND = 'command'  # directed at specific equipment
+    REPORT = 'report'  # broadcast state
+
+
+    @classmethod
+    def of(cls, routing_key: PublicationRoutingKey) -> MessageKind:
+        return cls.REPORT if routing_key.target.equipment_type is None else cls.COMMAND
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class DeliveryPolicy(object):
+    """
+    How messages of a given kind, concerning a given equipment type, should be delivered
+    """
+
+    __DEFAULT: DeliveryPolicy | None = None
+    __CATALOG: Dict[tuple[EquipmentType, MessageKind], DeliveryPolicy] | None = None
+
+
+    @classmethod
+    def init(cls):
+        cls.__DEFAULT = cls(True, None, None, False)
+
+        telemetry = cls(False, 10.0, None, False)
+
+        cls.__CATALOG = {
+            (EquipmentType.CRT, MessageKind.REPORT): telemetry,
+            (EquipmentType.BLK, MessageKind.REPORT): telemetry,
+            (EquipmentType.TRN, MessageKind.REPORT): telemetry,
+            (EquipmentType.MPU, MessageKind.REPORT): telemetry,
+            (EquipmentType.CRT, MessageKind.COMMAND): cls(True, None, None, True),
+        }
+
+
+    @classmethod
+    def register(cls, equipment_type: EquipmentType, kind: MessageKind, policy: DeliveryPolicy):
+        if cls.__CATALOG is None:
+            cls.init()
+
+        cls.__CATALOG[(equipment_type, kind)] = policy
+
+
+    @classmethod
+    def find(cls, routing_key: PublicationRoutingKey) -> DeliveryPolicy:
+        if cls.__CATALOG is None:
+            cls.init()
+
+        kind = MessageKind.of(routing_key)
+        equipment = routing_key.source if kind == MessageKind.REPORT else routing_key.target
+
+        return cls.__CATALOG.get((equipment.equipment_type, kind), cls.__DEFAULT)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, persistent: bool, ttl: float | None, priority: int | None, mandatory: bool,
+                 assessor: Callable[[Message], tuple[int | None, float | None]] | None = None):
+        self.__persistent = persistent
+        self.__ttl = ttl                    # seconds
+        self.__priority = priority          # None for the queue's lowest priority
+        self.__mandatory = mandatory
+        self.__assessor = assessor          # per-message (priority, ttl), overriding priority and ttl
+
+        self.__properties = {}              # (content_type, priority): pika.BasicProperties
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def priority_of(self, message: Message) -> int | None:
+        priority, _ = self.__assess(message)
+
+        return priority
+
+
+    def ttl_of(self, message: Message) -> float | None:
+        _, ttl = self.__assess(message)
+
+        return self.ttl if ttl is None else ttl
+
+
+    def properties_for(self, message: Message, content_type: str) -> pika.BasicProperties:
+        priority, ttl = self.__assess(message)
+
+        if ttl is None:
+            return self.properties(content_type, priority)
+
+        # stamped with the time of publication, so cannot be cached
+        return pika.BasicProperties(content_type=content_type, delivery_mode=self.__delivery_mode(),
+                                    expiration=self.__expiration(ttl), priority=priority,
+                                    timestamp=int(time.time()))
+
+
+    def properties(self, content_type: str, priority: int | None = None) -> pika.BasicProperties:
+        key = (content_type, priority)
+
+        try:
+            return self.__properties[key]
+        except KeyError:
+            pass
+
+        properties = pika.BasicProperties(content_type=content_type, delivery_mode=self.__delivery_mode(),
+                                          expiration=self.__expiration(self.ttl), priority=priority)
+
+        self.__properties[key] = properties
+        return properties
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __assess(self, message: Message) -> tuple[int | None, float | None]:
+        # returns the priority, and the per-message ttl, or None where the policy's ttl applies
+        if self.__assessor is None:
+            return self.priority, None
+
+        try:
+            priority, ttl = self.__assessor(message)
+        except Exception as exc:
+            Logging.getLogger().warning(f'assess:{type(exc).__name__}:{exc} - message:{message}')
+            return self.priority, None
+
+        return (self.priority if priority is None else int(priority)), ttl
+
+
+    def __delivery_mode(self):
+        return pika.DeliveryMode.Persistent if self.persistent else pika.DeliveryMode.Transient
+
+
+    @staticmethod
+    def __expiration(ttl: float | None) -> str | None:
+        return None if ttl is None else str(int(ttl * 1000))       # milliseconds, as a string
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def persistent(self):
+        return self.__persistent
+
+
+    @property
+    def ttl(self):
+        return self.__ttl
+
+
+    @property
+    def priority(self):
+        return self.__priority
+
+
+    @property
+    def mandatory(self):
+        return self.__mandatory
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'DeliveryPolicy:{{persistent:{self.persistent}, ttl:{self.ttl}, priority:{self.priority}, '
+                f'mandatory:{self.mandatory}}}')
+
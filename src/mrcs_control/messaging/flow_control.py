@@ -0,0 +1,135 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+The broker's flow control state for a connection, with the time spent blocked
+
+When RabbitMQ raises a memory or disk alarm, it sends connection.blocked to publishing connections, and stops reading
+from them. Publishing into a blocked connection only fills buffers, so clients pause their outbound path until
+connection.unblocked is received. A connection that is closed while blocked is treated as unblocked - its successor
+will be told afresh if the alarm persists.
+
+Listeners are called with True when the connection is blocked, and with False when it is unblocked. They are called on
+the thread that services the connection. Other threads may wait for the connection to be unblocked.
+
+https://www.rabbitmq.com/docs/connection-blocked
+https://www.rabbitmq.com/docs/alarms
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class FlowControl(object):
+    """
+    The broker's flow control state for a connection, with the time spent blocked
+    """
+
+    def __init__(self):
+        self.__listeners = []               # Callable[[bool], None]
+
+        self.__reason = None
+        self.__blocked_since = None         # monotonic seconds, while blocked
+        self.__blocked_time = 0.0           # seconds, for completed blocks
+        self.__blocks = 0
+
+        self.__unblocked = threading.Event()
+        self.__unblocked.set()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def add_listener(self, listener: Callable[[bool], None]):
+        if listener not in self.__listeners:
+            self.__listeners.append(listener)
+
+
+    def remove_listener(self, listener: Callable[[bool], None]):
+        try:
+            self.__listeners.remove(listener)
+        except ValueError:
+            pass
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def on_blocked(self, _connection, method_frame):
+        reason = getattr(method_frame.method, 'reason', None)
+        self.blocked(reason)
+
+
+    def on_unblocked(self, _connection, _method_frame):
+        self.unblocked()
+
+
+    def blocked(self, reason: str | None):
+        if self.is_blocked:
+            return
+
+        self.__reason = reason
+        self.__blocked_since = time.monotonic()
+        self.__blocks += 1
+        self.__unblocked.clear()
+
+        self.__notify(True)
+
+
+    def unblocked(self):
+        if not self.is_blocked:
+            return
+
+        self.__blocked_time += time.monotonic() - self.__blocked_since
+        self.__reason = None
+        self.__blocked_since = None
+        self.__unblocked.set()
+
+        self.__notify(False)
+
+
+    def wait_until_unblocked(self, timeout: float | None = None) -> bool:
+        # for threads other than the one that services the connection - False if the timeout elapsed
+        return self.__unblocked.wait(timeout)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __notify(self, is_blocked: bool):
+        for listener in list(self.__listeners):
+            listener(is_blocked)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def is_blocked(self):
+        return self.__blocked_since is not None
+
+
+    @property
+    def reason(self):
+        return self.__reason
+
+
+    @property
+    def blocks(self):
+        return self.__blocks
+
+
+    @property
+    def blocked_time(self):
+        # seconds, including any block in progress
+        if self.__blocked_since is None:
+            return self.__blocked_time
+
+        return self.__blocked_time + time.monotonic() - self.__blocked_since
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'FlowControl:{{is_blocked:{self.is_blocked}, reason:{self.reason}, blocks:{self.blocks}, '
+                f'blocked_time:{round(self.blocked_time, 3)}, listeners:{len(self.__listeners)}}}')
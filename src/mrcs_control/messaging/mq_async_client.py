@@ -7,6 +7,40 @@ Created on 11 Jan 2026
 * MQAsyncPublisher - a RabbitMQ peer that can act as a publisher only
 * MQAsyncSubscriber - a RabbitMQ peer that can act as a publisher and subscriber
 
+Publishing uses pipelined publisher confirms: publish() returns a future that resolves to True when the broker
+acks the message, or False when it is nacked or the channel is lost before confirmation. The number of unconfirmed
+messages is bounded by max_in_flight - when the window is full, publish() waits for confirmations.
+
+publish_many() validates and encodes a batch in one pass, then writes every frame that fits in the window without
+yielding to the event loop, so that the batch reaches the socket in one write. It returns a confirmation future, or
+None for an invalid message, for each message in order.
+
+Consumer acks and nacks are coalesced by an AckBatcher, and flushed when a count threshold is reached or after a short
+interval. Deliveries that cannot be decoded are discarded; those whose retry copy cannot be confirmed are requeued.
+
+Deliveries that carry an AMQP timestamp and expiration have a deadline - a retried delivery carries the expiration of
+the original in a header, since it cannot keep its AMQP expiration. Deliveries that have already expired are
+acked and dropped on arrival. Each message is passed to the handler with its deadline - None if it has none - so
+handlers that wait before acting on a message can check is_expired(deadline).
+
+Given a DedupCache, a subscriber acks deliveries whose origin and routing key it has already processed, without running
+the handler.
+
+A message whose handler fails is retried through delay queues, if the queue configuration calls for dead-lettering,
+or otherwise discarded - it is never left unacked, to be redelivered in a hot loop.
+
+Clients hold their own channels, on connections provided by the process-wide MQConnectionPool. Readiness is signalled
+by an asyncio.Event - if the connection is lost, clients reconnect with exponential backoff. If the reconnect strategy
+gives up, the client fails: unconfirmed publications resolve to False, and connection_is_available() - and therefore
+publish() - raises the ConnectionError, rather than waiting forever.
+
+While the broker has blocked the connection (connection.blocked, on a memory or disk alarm), publishers pause before
+writing. Nodes can await wait_until_unblocked() to stop drawing work from their own queues, so that it is conflated
+there instead. The FlowControl of the connection records the time spent blocked.
+
+https://www.rabbitmq.com/docs/confirms#publisher-confirms
+https://www.rabbitmq.com/docs/dlx
+https://www.rabbitmq.com/docs/connection-blocked
 https://www.rabbitmq.com/tutorials/tutorial-four-python
 https://github.com/aiidateam/aiida-core/issues/1142
 https://stackoverflow.com/questions/15150207/connection-in-rabbitmq-server-auto-lost-after-600s
@@ -15,20 +49,28 @@ https://stackoverflow.com/questions/15150207/connection-in-rabbitmq-server-auto-
 import asyncio
 import functools
 import inspect
+import time
 from abc import ABC, abstractmethod
-from typing import Callable
+from collections import OrderedDict
+from typing import Callable, Iterable
 
-import pika
-from pika.adapters.asyncio_connection import AsyncioConnection
-from pika.exceptions import AMQPError, ChannelWrongStateError
+from pika.exceptions import AMQPError, ChannelClosedByClient, ChannelWrongStateError
 from pika.exchange_type import ExchangeType
 
-from mrcs_control.messaging.mq_client import MQMode
+from mrcs_control.messaging.ack_batcher import AckBatcher
+from mrcs_control.messaging.dead_lettering import DeadLettering
+from mrcs_control.messaging.dedup_cache import DedupCache
+from mrcs_control.messaging.delivery_policy import DeliveryPolicy
+from mrcs_control.messaging.mq_client import MQManager, MQMode
+from mrcs_control.messaging.mq_codec import MQEncoding
+from mrcs_control.messaging.mq_connection_pool import MQConnectionPool
 from mrcs_control.messaging.mq_enums import MQTopology
+from mrcs_control.messaging.routing_key_cache import RoutingKeyCache
+from mrcs_control.sys.reconnect_strategy import ReconnectStrategy
 from mrcs_core.data.equipment_identity import EquipmentIdentifier
 from mrcs_core.data.json import JSONify
 from mrcs_core.messaging.message import Message
-from mrcs_core.messaging.routing_key import PublicationRoutingKey, SubscriptionRoutingKey
+from mrcs_core.messaging.routing_key import SubscriptionRoutingKey
 from mrcs_core.sys.logging import Logging
 
 
@@ -39,20 +81,21 @@ class MQAsyncClient(ABC):
     An abstract RabbitMQ client
     """
 
-    __HOST = '127.0.0.1'  # do not use 'localhost' - IPv4 issues
-    __PORT = 5672
-
-    __URL = f'amqp://{__HOST}:{__PORT}/'
-
-
-    # ----------------------------------------------------------------------------------------------------------------
-
-    def __init__(self, on_startup_complete: Callable | None = None):
+    def __init__(self, on_startup_complete: Callable | None = None,
+                 reconnect_strategy: ReconnectStrategy | None = None):
         self.__on_startup_complete = on_startup_complete
+        self.__reconnect_strategy = ReconnectStrategy.construct() if reconnect_strategy is None \
+            else reconnect_strategy
 
-        self.__connection = None
         self._channel = None
-        self._is_connected = False
+        self.__ready = asyncio.Event()      # also set on failure, to release waiters
+        self.__failure = None               # ConnectionError, once reconnection has been abandoned
+        self.__startup_notified = False
+        self.__reconnect_task = None
+
+        self.__flow_control = None
+        self.__unblocked = asyncio.Event()
+        self.__unblocked.set()
 
         self.__logger = Logging.getLogger()
 
@@ -67,17 +110,25 @@ class MQAsyncClient(ABC):
     # ----------------------------------------------------------------------------------------------------------------
 
     def connect(self):
-        self.logger.debug(f'connect:{self.__URL}')
+        pool = MQConnectionPool.instance()
+        self.logger.debug(f'connect:{pool.url}')
+
+        # the channel is opened on a connection shared with other clients in this process
+        flow_control = pool.async_channel(self.on_channel_open, self.on_connection_closed,
+                                          self.on_connection_open_error)
 
-        AsyncioConnection(
-            parameters=pika.URLParameters(self.__URL),
-            on_open_callback=self.on_connection_open,
-            on_open_error_callback=self.on_connection_open_error,
-            on_close_callback=self.on_connection_closed)
+        if flow_control is not self.__flow_control:
+            if self.__flow_control is not None:
+                self.__flow_control.remove_listener(self.on_flow_control)
+
+            flow_control.add_listener(self.on_flow_control)
+            self.__flow_control = flow_control
+
+        self.on_flow_control(flow_control.is_blocked)
 
 
     def close(self):
-        self.logger.debug(f'close:{self.__URL}')
+        self.logger.debug('close')
         try:
             self.channel.close()
         except (AttributeError, ChannelWrongStateError):
@@ -90,26 +141,79 @@ class MQAsyncClient(ABC):
     # ----------------------------------------------------------------------------------------------------------------
 
     async def connection_is_available(self):
-        while not self._is_connected:
-            await asyncio.sleep(0.1)
+        await self.__ready.wait()
 
+        if self.__failure is not None:
+            raise self.__failure
+
+
+    async def wait_until_unblocked(self):
+        await self.__unblocked.wait()
+
+
+    def schedule_reconnect(self):
+        self.is_connected = False
+
+        if self.__reconnect_task is not None and not self.__reconnect_task.done():
+            return  # already reconnecting
+
+        self.__reconnect_task = asyncio.get_event_loop().create_task(self.reconnect())
+
+
+    async def reconnect(self):
+        self.close()
+
+        try:
+            await self.reconnect_strategy.async_wait()
+        except ConnectionError as exc:
+            self.logger.error(f'reconnect:{exc}')
+            self.on_reconnect_failed(exc)
+            return
+
+        self.logger.info(f'reconnect - attempt:{self.reconnect_strategy.attempts}')
+        self.connect()
 
-    # ----------------------------------------------------------------------------------------------------------------
 
-    def on_connection_open(self, connection):
-        self.logger.debug(f'on_connection_open:{connection}')
+    def on_reconnect_failed(self, exc: ConnectionError):
+        self.__failure = exc
+        self.__ready.set()
 
-        self.__connection = connection
-        self.__connection.channel(on_open_callback=self.on_channel_open)
 
+    def notify_startup_complete(self):
+        self.is_connected = True
+
+        if self.__startup_notified:
+            return  # startup is notified once only - not on reconnection
+
+        self.__startup_notified = True
+
+        if self.on_startup_complete is not None:
+            self.on_startup_complete()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
 
     def on_connection_open_error(self, _unused_connection, err):
         self.logger.warning(f'on_connection_open_error:{err}')
+        self.schedule_reconnect()
 
 
     def on_connection_closed(self, _unused_connection, reason):
         self.logger.debug(f'on_connection_closed{reason}')
         self._channel = None
+        self.schedule_reconnect()
+
+
+    def on_flow_control(self, is_blocked: bool):
+        if is_blocked == self.is_blocked:
+            return
+
+        if is_blocked:
+            self.logger.warning(f'on_flow_control - blocked:{self.flow_control.reason}')
+            self.__unblocked.clear()
+        else:
+            self.logger.info(f'on_flow_control - unblocked, blocked_time:{self.flow_control.blocked_time}')
+            self.__unblocked.set()
 
 
     def add_on_channel_close_callback(self):
@@ -120,21 +224,57 @@ class MQAsyncClient(ABC):
     def on_channel_closed(self, _channel, reason):
         self.logger.debug(f'on_channel_closed:{reason}')
 
-        self._channel = None
-        self.connection.close()
+        self._channel = None    # the connection is shared, so is left open
+
+        if not isinstance(reason, ChannelClosedByClient):
+            self.schedule_reconnect()
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     @property
     def on_startup_complete(self):
-        self._is_connected = True
         return self.__on_startup_complete
 
 
+    @property
+    def reconnect_strategy(self):
+        return self.__reconnect_strategy
+
+
+    @property
+    def is_connected(self):
+        return self.__ready.is_set() and self.__failure is None
+
+
+    @is_connected.setter
+    def is_connected(self, connected: bool):
+        if connected:
+            self.reconnect_strategy.reconnected()
+            self.__failure = None
+            self.__ready.set()
+        else:
+            self.__ready.clear()
+
+
+    @property
+    def failure(self):
+        return self.__failure
+
+
     @property
     def connection(self):
-        return self.__connection
+        return None if self.channel is None else self.channel.connection
+
+
+    @property
+    def flow_control(self):
+        return self.__flow_control
+
+
+    @property
+    def is_blocked(self):
+        return not self.__unblocked.is_set()
 
 
     @property
@@ -154,56 +294,134 @@ class MQAsyncPublisher(MQAsyncClient):
     A RabbitMQ peer that can act as a publisher only
     """
 
+    __DEFAULT_MAX_IN_FLIGHT = 256       # unconfirmed messages
+
 
     @classmethod
-    def construct_pub(cls, exchange_name: MQMode, on_startup_complete: Callable | None = None):
-        return cls(exchange_name, on_startup_complete=on_startup_complete)
+    def construct_pub(cls, exchange_name: MQMode, on_startup_complete: Callable | None = None,
+                      max_in_flight: int | None = None, encoding: MQEncoding = MQEncoding.JSON):
+        return cls(exchange_name, on_startup_complete=on_startup_complete, max_in_flight=max_in_flight,
+                   encoding=encoding)
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, exchange_name: MQMode, on_startup_complete: Callable | None = None):
-        super().__init__(on_startup_complete=on_startup_complete)
+    def __init__(self, exchange_name: MQMode, on_startup_complete: Callable | None = None,
+                 max_in_flight: int | None = None, encoding: MQEncoding = MQEncoding.JSON,
+                 reconnect_strategy: ReconnectStrategy | None = None):
+        super().__init__(on_startup_complete=on_startup_complete, reconnect_strategy=reconnect_strategy)
+
+        if not encoding.value.is_available():
+            raise ValueError(f'encoding {encoding.name} is not available')
+
         self.__exchange_name = exchange_name
+        self.__encoding = encoding
+
+        self.__max_in_flight = self.__DEFAULT_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+        self.__window = asyncio.Semaphore(self.__max_in_flight)
+
+        self.__delivery_tag = 0
+        self.__pending = OrderedDict()      # delivery_tag: (future, message)
+        self.__nacked_count = 0
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    async def publish(self, message: Message):
+    async def publish(self, message: Message) -> asyncio.Future | None:
         self.logger.debug(f'publish:{message}')
 
+        frame = self.frame(message)
+
+        if frame is None:
+            return None
+
+        return await self.__transmit(message, *frame)
+
+
+    async def publish_many(self, messages: Iterable[Message]) -> list[asyncio.Future | None]:
+        # uncontended awaits below complete without yielding, so frames are written back-to-back
+        framed = [(message, self.frame(message)) for message in messages]
+        self.logger.debug(f'publish_many:{len(framed)}')
+
+        confirmations = []
+
+        for message, frame in framed:
+            confirmations.append(None if frame is None else await self.__transmit(message, *frame))
+
+        return confirmations
+
+
+    def frame(self, message: Message) -> tuple | None:
+        # returns (routing_key, body, properties, mandatory), or None if the message cannot be published
         try:
-            routing_key = JSONify.as_jdict(message.routing_key)
+            routing_key = RoutingKeyCache.instance().wire(message.routing_key)
+            policy = DeliveryPolicy.find(message.routing_key)
+            properties = policy.properties_for(message, self.encoding.value.content_type)
         except Exception:
             self.logger.warn(f'publish - invalid routing_key:{message.routing_key}')
-            return
+            return None
 
         try:
-            body = JSONify.dumps(message.payload)
+            body = self.encoding.value.encode(message.payload)
         except Exception:
             self.logger.warn(f'publish - invalid body:{message.payload}')
-            return
+            return None
 
-        while True:
-            try:
-                properties = pika.BasicProperties(
-                    content_type='application/json',
-                    delivery_mode=pika.DeliveryMode.Persistent)
-
-                self.channel.basic_publish(
-                    exchange=self.exchange_name,
-                    routing_key=routing_key,
-                    body=body,
-                    properties=properties)
-                break
-
-            except (AttributeError, AMQPError):
-                self.logger.info('remaking connection')
-                self._is_connected = False
-                self.close()
-                self.connect()
+        return routing_key, body, properties, policy.mandatory
+
+
+    async def __transmit(self, message: Message, routing_key: str, body: bytes, properties,
+                         mandatory: bool) -> asyncio.Future:
+        await self.__window.acquire()       # backpressure - wait for a slot in the confirmation window
+
+        try:
+            while True:
                 await self.connection_is_available()
-                self.logger.info('connection re-established')
+                await self.wait_until_unblocked()
+
+                try:
+                    self.channel.basic_publish(
+                        exchange=self.exchange_name,
+                        routing_key=routing_key,
+                        body=body,
+                        properties=properties,
+                        mandatory=mandatory)
+                    break
+
+                except (AttributeError, AMQPError) as exc:
+                    self.logger.info(f'publish - remaking connection:{exc}')
+                    self.schedule_reconnect()
+
+        except BaseException:
+            self.__window.release()
+            raise
+
+        return self.__awaiting_confirmation(message)
+
+
+    async def redirect(self, queue_name: str, body: bytes, properties, message: Message) -> asyncio.Future | None:
+        # publishes to a queue by name, on the current channel only - returns None if the channel is lost
+        await self.wait_until_unblocked()
+
+        channel = self.channel
+        await self.__window.acquire()
+
+        try:
+            if channel is None or channel is not self.channel:
+                raise ChannelWrongStateError('channel replaced')
+
+            channel.basic_publish(exchange='', routing_key=queue_name, body=body, properties=properties)
+
+        except (AMQPError, ChannelWrongStateError) as exc:
+            self.logger.info(f'redirect - failed:{exc.__class__.__name__}:{exc}')
+            self.__window.release()
+            return None
+
+        except BaseException:
+            self.__window.release()
+            raise
+
+        return self.__awaiting_confirmation(message)
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -213,9 +431,20 @@ class MQAsyncPublisher(MQAsyncClient):
 
         self._channel = channel
         self.add_on_channel_close_callback()
+        self.channel.add_on_return_callback(self.on_return)
         self.setup_exchange(self.exchange_name)
 
 
+    def on_channel_closed(self, channel, reason):
+        self.__abandon_pending(reason)
+        super().on_channel_closed(channel, reason)
+
+
+    def on_reconnect_failed(self, exc: ConnectionError):
+        self.__abandon_pending(exc)
+        super().on_reconnect_failed(exc)
+
+
     def setup_exchange(self, exchange_name):
         self.logger.debug(f'setup_exchange:{exchange_name}')
 
@@ -231,16 +460,67 @@ class MQAsyncPublisher(MQAsyncClient):
     def start_publishing(self, notify_startup=True):
         self.logger.debug(f'start_publishing')
 
+        self.__delivery_tag = 0             # delivery tags are numbered per channel
         self.channel.confirm_delivery(self.on_delivery_confirmation)
-        self._is_connected = True
 
-        if notify_startup and self.on_startup_complete is not None:
-            self.on_startup_complete()
+        if notify_startup:
+            self.notify_startup_complete()
 
 
     def on_delivery_confirmation(self, method_frame):
         confirmation_type = method_frame.method.NAME.split('.')[1].lower()
-        self.logger.debug(f'on_delivery_confirmation:{confirmation_type}')
+        delivery_tag = method_frame.method.delivery_tag
+        multiple = method_frame.method.multiple
+
+        self.logger.debug(f'on_delivery_confirmation:{confirmation_type} delivery_tag:{delivery_tag} '
+                          f'multiple:{multiple}')
+
+        if multiple:
+            delivery_tags = [tag for tag in self.__pending if tag <= delivery_tag]
+        else:
+            delivery_tags = [delivery_tag]
+
+        for tag in delivery_tags:
+            self.__confirm(tag, confirmation_type == 'ack')
+
+
+    def on_return(self, _channel, method, _properties, _body):
+        self.logger.warning(f'on_return - unroutable:{method.routing_key} reply:{method.reply_text}')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __awaiting_confirmation(self, message) -> asyncio.Future:
+        self.__delivery_tag += 1
+
+        confirmation = asyncio.get_running_loop().create_future()
+        self.__pending[self.__delivery_tag] = (confirmation, message)
+
+        return confirmation
+
+
+    def __confirm(self, delivery_tag, acked: bool):
+        try:
+            confirmation, message = self.__pending.pop(delivery_tag)
+        except KeyError:
+            return
+
+        if not acked:
+            self.__nacked_count += 1
+            self.logger.warning(f'on_delivery_confirmation - nacked:{message}')
+
+        if not confirmation.done():
+            confirmation.set_result(acked)
+
+        self.__window.release()
+
+
+    def __abandon_pending(self, reason):
+        if self.__pending:
+            self.logger.warning(f'abandoning {len(self.__pending)} unconfirmed messages:{reason}')
+
+        for delivery_tag in list(self.__pending):
+            self.__confirm(delivery_tag, False)
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -250,10 +530,31 @@ class MQAsyncPublisher(MQAsyncClient):
         return self.__exchange_name
 
 
+    @property
+    def encoding(self):
+        return self.__encoding
+
+
+    @property
+    def max_in_flight(self):
+        return self.__max_in_flight
+
+
+    @property
+    def in_flight(self):
+        return len(self.__pending)
+
+
+    @property
+    def nacked_count(self):
+        return self.__nacked_count
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
-        return f'{self.__class__.__name__}:{{exchange_name:{self.exchange_name}, is_connected:{self._is_connected}}}'
+        return (f'{self.__class__.__name__}:{{exchange_name:{self.exchange_name}, is_connected:{self.is_connected}, '
+                f'encoding:{self.encoding.name}, max_in_flight:{self.max_in_flight}, in_flight:{self.in_flight}}}')
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -261,29 +562,67 @@ class MQAsyncPublisher(MQAsyncClient):
 class MQAsyncSubscriber(MQAsyncPublisher):
     """
     A RabbitMQ peer that can act as a publisher or subscriber
+
+    Up to prefetch_count deliveries may be outstanding from the broker, and up to max_concurrency messages may be
+    processed at once. Messages from the same source EquipmentIdentifier are always processed in delivery order.
+
+    Acks are batched - up to half the prefetch window, at most __ACK_BATCH_SIZE - so that they never hold back
+    deliveries for long. With a prefetch_count of 1, every message is acked as soon as it is processed.
     """
 
+    __DEFAULT_PREFETCH_COUNT = 1
+    __DEFAULT_MAX_CONCURRENCY = 1
+
+    __ACK_BATCH_SIZE = 32
+    __ACK_FLUSH_INTERVAL = 0.05             # seconds
+
+    __DEADLINE_TOLERANCE = 1.0              # seconds - AMQP timestamps have a resolution of one second
+
 
     @classmethod
     def construct_sub(cls, exchange_name: MQMode, queuing: MQTopology, id: EquipmentIdentifier, on_message: Callable,
                       *subscription_routing_keys: SubscriptionRoutingKey,
-                      on_startup_complete: Callable | None = None):
+                      on_startup_complete: Callable | None = None,
+                      prefetch_count: int | None = None, max_concurrency: int | None = None,
+                      encoding: MQEncoding = MQEncoding.JSON, dedup: DedupCache | None = None):
 
         return cls(exchange_name, id, queuing.value, on_message,
-                   *subscription_routing_keys, on_startup_complete=on_startup_complete)
+                   *subscription_routing_keys, on_startup_complete=on_startup_complete,
+                   prefetch_count=prefetch_count, max_concurrency=max_concurrency, encoding=encoding, dedup=dedup)
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     def __init__(self, exchange_name: MQMode, id: EquipmentIdentifier, queue_config: MQTopology.QueueConfiguration,
                  on_message: Callable, *subscription_routing_keys: SubscriptionRoutingKey,
-                 on_startup_complete: Callable | None = None):
-        super().__init__(exchange_name, on_startup_complete=on_startup_complete)
+                 on_startup_complete: Callable | None = None,
+                 prefetch_count: int | None = None, max_concurrency: int | None = None,
+                 encoding: MQEncoding = MQEncoding.JSON, dedup: DedupCache | None = None):
+        super().__init__(exchange_name, on_startup_complete=on_startup_complete, encoding=encoding)
 
         self.__id = id
         self.__queue_config = queue_config
+        self.__queue_name = queue_config.queue_name(exchange_name, id)
+        self.__legacy_name = queue_config.legacy_name(exchange_name, id)      # None once migrated
         self.__on_message = on_message
         self.__subscription_routing_keys = subscription_routing_keys
+        self.__dedup = dedup                # None for no deduplication
+
+        self.__prefetch_count = self.__DEFAULT_PREFETCH_COUNT if prefetch_count is None else prefetch_count
+        self.__max_concurrency = self.__DEFAULT_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+
+        self.__concurrency = asyncio.Semaphore(self.__max_concurrency)
+        self.__source_tails = {}            # source: last task for that source - preserves per-source ordering
+
+        self.__acks = None                  # AckBatcher for the current channel
+        self.__ack_flush_handle = None
+
+        self.__expired = 0
+
+        self.__dead_lettering = DeadLettering.construct(exchange_name, self.queue_name) \
+            if queue_config.dead_lettering else None
+        self.__retried = 0
+        self.__poisoned = 0
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -302,13 +641,16 @@ class MQAsyncSubscriber(MQAsyncPublisher):
         exclusive = self.queue_config.exclusive
 
         self.channel.queue_declare(queue=self.queue_name, durable=durable, exclusive=exclusive, auto_delete=False,
-                                   callback=self.on_queue_declare_ok)
+                                   arguments=self.queue_config.arguments, callback=self.on_queue_declare_ok)
 
 
     def on_queue_declare_ok(self, _unused_frame):
         self.logger.debug(f'on_queue_declare_ok - exchange_name:{self.exchange_name}, '
                           f'queue_name:{self.queue_name}')
 
+        if self.__dead_lettering is not None:
+            self.__dead_lettering.declare(self.channel)     # RPCs are serialised, ahead of the binds
+
         last_index = len(self.subscription_routing_keys) - 1
         for i, routing_key in enumerate(self.subscription_routing_keys):
             cb = functools.partial(self.on_bind_ok, start=i == last_index)
@@ -323,17 +665,39 @@ class MQAsyncSubscriber(MQAsyncPublisher):
             self.logger.debug('on_bind_ok - starting')
             self.start_publishing(notify_startup=False)
             self.start_consuming()
+            self.migrate_legacy()
+
+
+    def migrate_legacy(self):
+        # moves messages from the queue declared by an earlier version - the migration blocks, so runs on a worker
+        if self.__legacy_name is None:
+            return
+
+        legacy_name, self.__legacy_name = self.__legacy_name, None          # attempted once per process
+        asyncio.get_event_loop().run_in_executor(None, self.__migrate, legacy_name)
+
+
+    def __migrate(self, legacy_name: str):
+        try:
+            moved = MQManager.migrate_legacy(legacy_name, self.queue_name)
+            self.logger.info(f'migrate_legacy - moved:{moved} from:{legacy_name}')
+
+        except AMQPError as exc:
+            # for example, the legacy queue is still in use - it can be migrated later, with mrcs_control_broker
+            self.logger.warning(f'migrate_legacy - failed:{exc.__class__.__name__}:{exc} - legacy queue:{legacy_name}')
 
 
     def start_consuming(self):
         self.logger.debug('start_consuming')
 
         self.add_on_cancel_callback()
-        self.channel.basic_qos(prefetch_count=1)
+        self.channel.basic_qos(prefetch_count=self.prefetch_count)
+
+        self.__acks = AckBatcher(functools.partial(self.__basic_ack, self.channel),
+                                 functools.partial(self.__basic_nack, self.channel), self.ack_batch_size)
         self.channel.basic_consume(self.queue_name, self.on_consume)
 
-        if self.on_startup_complete is not None:
-            self.on_startup_complete()
+        self.notify_startup_complete()
 
 
     def add_on_cancel_callback(self):
@@ -346,43 +710,187 @@ class MQAsyncSubscriber(MQAsyncPublisher):
         self.channel.close()
 
 
-    def acknowledge_message(self, delivery_tag):
+    def acknowledge_message(self, delivery_tag, acks: AckBatcher):
         self.logger.debug(f'acknowledge_message:{delivery_tag}')
-        self.channel.basic_ack(delivery_tag)
+
+        self.__on_settled(acks, acks.succeeded(delivery_tag))
+
+
+    def nack_message(self, delivery_tag, acks: AckBatcher, requeue: bool):
+        self.logger.debug(f'nack_message:{delivery_tag} requeue:{requeue}')
+
+        self.__on_settled(acks, acks.failed(delivery_tag, requeue=requeue))
+
+
+    def flush_acks(self):
+        if self.__ack_flush_handle is not None:
+            self.__ack_flush_handle.cancel()
+            self.__ack_flush_handle = None
+
+        if self.__acks is not None:
+            self.__acks.flush()
+
+
+    def close(self):
+        self.flush_acks()
+
+        if self.dedup is not None:
+            self.dedup.close()
+
+        super().close()
+
+
+    def on_channel_closed(self, channel, reason):
+        if self.__acks is not None:
+            self.__acks.retire()            # unacked deliveries will be redelivered
+            self.__acks = None
+
+        super().on_channel_closed(channel, reason)
+
+
+    def __on_settled(self, acks: AckBatcher, flush_now: bool):
+        if flush_now:
+            self.flush_acks()
+
+        elif self.__ack_flush_handle is None and not acks.is_retired:
+            self.__ack_flush_handle = asyncio.get_event_loop().call_later(self.__ACK_FLUSH_INTERVAL, self.flush_acks)
+
+
+    def __basic_ack(self, channel, delivery_tag, multiple):
+        try:
+            channel.basic_ack(delivery_tag, multiple=multiple)
+        except (AMQPError, ChannelWrongStateError) as exc:
+            self.logger.info(f'acknowledge_message - ack failed:{exc.__class__.__name__}:{exc}')
+
+
+    def __basic_nack(self, channel, delivery_tag, requeue):
+        try:
+            channel.basic_nack(delivery_tag, requeue=requeue)
+        except (AMQPError, ChannelWrongStateError) as exc:
+            self.logger.info(f'nack_message - nack failed:{exc.__class__.__name__}:{exc}')
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def on_consume(self, _channel, delivery, _props, payload):
+    def on_consume(self, _channel, delivery, properties, payload):
         self.logger.debug(f'on_consume:{delivery.delivery_tag}')
 
+        acks = self.__acks
+        acks.delivered(delivery.delivery_tag)
+
+        wire_key = DeadLettering.routing_key(delivery.routing_key, properties)   # retries arrive by queue name
+
         try:
-            routing_key = PublicationRoutingKey.construct_from_jdict(delivery.routing_key)
+            routing_key = RoutingKeyCache.instance().parse(wire_key)
         except Exception:
-            self.logger.warn(f'on_consume - invalid routing_key:{delivery.routing_key}')
+            self.logger.warn(f'on_consume - invalid routing_key:{wire_key}')
+            self.nack_message(delivery.delivery_tag, acks, False)
             return
 
         if routing_key.source == self.id:
-            self.acknowledge_message(delivery.delivery_tag)
+            self.acknowledge_message(delivery.delivery_tag, acks)
             return  # do not send message to self
 
-        message = Message.construct_from_callback(routing_key, payload)
-        asyncio.create_task(self.process_message(delivery.delivery_tag, message))
+        try:
+            message = MQEncoding.find(properties.content_type).value.message(routing_key, payload)
+        except Exception as exc:
+            self.logger.warn(f'on_consume - invalid body:{type(exc).__name__}:{exc} - '
+                             f'content_type:{properties.content_type}')
+            self.nack_message(delivery.delivery_tag, acks, False)
+            return
+
+        if self.dedup is not None and self.dedup.is_duplicate(message.origin, wire_key):
+            self.logger.info(f'on_consume - duplicate:{message.origin}')
+            self.acknowledge_message(delivery.delivery_tag, acks)
+            return
+
+        deadline = self.deadline(properties)
+
+        if self.is_expired(deadline):
+            self.logger.info(f'on_consume - expired:{message}')
+            self.__expired += 1
+            self.acknowledge_message(delivery.delivery_tag, acks)
+            return
+
+        source = routing_key.source.as_json()
+        predecessor = self.__source_tails.get(source)
+
+        delivered = (wire_key, properties, payload)
 
+        task = asyncio.create_task(self.process_message(delivery.delivery_tag, message, acks,
+                                                        predecessor=predecessor, delivered=delivered,
+                                                        deadline=deadline))
+        task.add_done_callback(functools.partial(self.__on_processed, source))
+        self.__source_tails[source] = task
 
-    async def process_message(self, delivery_tag, message):
+
+    async def process_message(self, delivery_tag, message, acks: AckBatcher, predecessor: asyncio.Task | None = None,
+                              delivered: tuple | None = None, deadline: float | None = None):
         self.logger.debug(f'process_message:{message}')
 
+        if predecessor is not None:
+            await asyncio.wait((predecessor,))      # same source - wait its turn, whatever its outcome
+
+        async with self.__concurrency:
+            try:
+                result = self.on_message(message, deadline)
+                if inspect.isawaitable(result):
+                    await result
+
+                if self.dedup is not None and delivered is not None:
+                    self.dedup.record(message.origin, delivered[0])
+
+                self.acknowledge_message(delivery_tag, acks)
+
+            except Exception as exc:
+                self.logger.warn(f'process_message:{type(exc).__name__}:{exc} - message:{message}')
+                await self.reject(delivery_tag, message, acks, delivered)
+
+
+    async def reject(self, delivery_tag, message, acks: AckBatcher, delivered: tuple | None):
+        # delivered is (wire_key, properties, payload) - the message is retried later, poisoned or discarded
+        if self.__dead_lettering is None or delivered is None:
+            self.acknowledge_message(delivery_tag, acks)
+            return
+
+        wire_key, properties, payload = delivered
+        queue_name, retry_properties, will_retry = self.__dead_lettering.redirect(wire_key, properties)
+
+        confirmation = await self.redirect(queue_name, payload, retry_properties, message)
+
+        if confirmation is None or not await confirmation:
+            self.nack_message(delivery_tag, acks, True)     # the copy may be lost - redeliver the original
+            return
+
+        if will_retry:
+            self.__retried += 1
+        else:
+            self.__poisoned += 1
+            self.logger.warning(f'reject - poisoned:{wire_key} queue:{queue_name}')
+
+        self.acknowledge_message(delivery_tag, acks)
+
+
+    def deadline(self, properties) -> float | None:
+        expiration = DeadLettering.expiration(properties)      # a retry carries its expiration in a header
+
+        if properties.timestamp is None or expiration is None:
+            return None
+
         try:
-            result = self.on_message(message)
-            if inspect.isawaitable(result):
-                await result
+            return properties.timestamp + int(expiration) / 1000.0 + self.__DEADLINE_TOLERANCE
+        except (TypeError, ValueError):
+            return None
 
-            self.acknowledge_message(delivery_tag)
 
-        except Exception as exc:
-            self.logger.warn(f'process_message:{type(exc).__name__}:{exc} - message:{message}')
-            # Leave the message unacknowledged so it is requeued when the channel closes.
+    @staticmethod
+    def is_expired(deadline: float | None) -> bool:
+        return deadline is not None and time.time() > deadline
+
+
+    def __on_processed(self, source, task):
+        if self.__source_tails.get(source) is task:
+            del self.__source_tails[source]
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -399,7 +907,7 @@ class MQAsyncSubscriber(MQAsyncPublisher):
 
     @property
     def queue_name(self):
-        return self.queue_config.queue_name(self.exchange_name, self.id)
+        return self.__queue_name
 
 
     @property
@@ -412,11 +920,47 @@ class MQAsyncSubscriber(MQAsyncPublisher):
         return self.__subscription_routing_keys
 
 
+    @property
+    def prefetch_count(self):
+        return self.__prefetch_count
+
+
+    @property
+    def max_concurrency(self):
+        return self.__max_concurrency
+
+
+    @property
+    def expired(self):
+        return self.__expired
+
+
+    @property
+    def dedup(self):
+        return self.__dedup
+
+
+    @property
+    def retried(self):
+        return self.__retried
+
+
+    @property
+    def poisoned(self):
+        return self.__poisoned
+
+
+    @property
+    def ack_batch_size(self):
+        return max(1, min(self.__ACK_BATCH_SIZE, self.prefetch_count // 2))
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
         routing_keys = [JSONify.as_jdict(key) for key in self.subscription_routing_keys]
 
-        return (f'{self.__class__.__name__}:{{exchange_name:{self.exchange_name}, is_connected:{self._is_connected}, '
+        return (f'{self.__class__.__name__}:{{exchange_name:{self.exchange_name}, is_connected:{self.is_connected}, '
                 f'id:{self.id}, queue_config:{self.queue_config}, queue_name:{self.queue_name}, '
-                f'channel:{self.channel}, routing_keys:{routing_keys}}}')
+                f'channel:{self.channel}, routing_keys:{routing_keys}, prefetch_count:{self.prefetch_count}, '
+                f'max_concurrency:{self.max_concurrency}, retried:{self.retried}, poisoned:{self.poisoned}}}')
@@ -8,25 +8,61 @@ Created on 1 Nov 2025
 * Publisher - a RabbitMQ peer that can act as a publisher only
 * Subscriber - a RabbitMQ peer that can act as a publisher and subscriber
 
+Clients hold their own channels, on connections provided by the process-wide MQConnectionPool. Readiness is signalled
+by a threading.Event - if the connection is lost, clients reconnect with exponential backoff.
+
+By default, a Subscriber runs its message handler on pika's IO thread, so a slow handler stalls heartbeats. Given
+max_workers, handlers run on a thread pool instead. Deliveries wait in a queue for their source, drained by one task at
+a time, so messages from the same source are handled in delivery order, while other sources proceed - no worker waits
+on another. Acks and nacks are passed back to the IO thread with add_callback_threadsafe. Handlers must then be
+thread-safe.
+
+Publishers can send a batch with publish_many: messages are validated and encoded in one pass, then written in order,
+with one outcome per message.
+
+While the broker has blocked the connection (connection.blocked, on a memory or disk alarm), publishers pause, servicing
+the connection until it is unblocked. The FlowControl of the connection records the time spent blocked.
+
+Given a DedupCache, a Subscriber acks deliveries whose origin and routing key it has already processed, without running
+the handler.
+
+A message whose handler fails is retried through delay queues, if the queue configuration calls for dead-lettering,
+or otherwise discarded - it is never left unacked, to be redelivered in a hot loop. Retry copies are published on a
+channel of their own, in confirm mode, and the failed message is acked only once its copy has been confirmed.
+
 https://www.rabbitmq.com/tutorials/tutorial-four-python
 https://github.com/aiidateam/aiida-core/issues/1142
 https://stackoverflow.com/questions/15150207/connection-in-rabbitmq-server-auto-lost-after-600s
+https://github.com/pika/pika/blob/main/examples/basic_consumer_threaded.py
+https://www.rabbitmq.com/docs/dlx
+https://www.rabbitmq.com/docs/connection-blocked
 """
 
+import functools
+import threading
 from abc import ABC
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import StrEnum, unique
-from typing import Callable
+from typing import Callable, Iterable
 
 import pika
-from pika.exceptions import AMQPError, ChannelWrongStateError
+from pika.adapters.blocking_connection import BlockingChannel
+from pika.exceptions import AMQPError, ChannelClosedByBroker, ChannelWrongStateError, NackError, UnroutableError
 from pika.exchange_type import ExchangeType
 
+from mrcs_control.messaging.dead_lettering import DeadLettering
+from mrcs_control.messaging.dedup_cache import DedupCache
+from mrcs_control.messaging.delivery_policy import DeliveryPolicy
+from mrcs_control.messaging.mq_codec import MQEncoding
+from mrcs_control.messaging.mq_connection_pool import MQConnectionPool
 from mrcs_control.messaging.mq_enums import MQTopology
+from mrcs_control.messaging.routing_key_cache import RoutingKeyCache
+from mrcs_control.sys.reconnect_strategy import ReconnectStrategy
 from mrcs_core.data.equipment_identity import EquipmentIdentifier
-from mrcs_core.data.json import JSONify
 from mrcs_core.data.meta_enum import MetaEnum
 from mrcs_core.messaging.message import Message
-from mrcs_core.messaging.routing_key import PublicationRoutingKey, RoutingKey
+from mrcs_core.messaging.routing_key import RoutingKey
 from mrcs_core.sys.logging import Logging
 
 
@@ -49,13 +85,19 @@ class MQClient(ABC):
     An abstract RabbitMQ client
     """
 
-    __DEFAULT_HOST = '127.0.0.1'  # do not use localhost - IPv6 issues
+    __BLOCKED_POLL_INTERVAL = 1.0       # seconds
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self):
+    def __init__(self, reconnect_strategy: ReconnectStrategy | None = None):
+        self.__reconnect_strategy = ReconnectStrategy.construct() if reconnect_strategy is None \
+            else reconnect_strategy
+
         self.__channel = None
+        self.__flow_control = None
+        self.__owner = None                 # the thread that services the channel's connection
+        self.__ready = threading.Event()
         self.__logger = Logging.getLogger()
 
 
@@ -64,15 +106,34 @@ class MQClient(ABC):
     def connect(self):
         self.logger.debug('connect')
 
-        connection = pika.BlockingConnection(
-            pika.ConnectionParameters(host=self.__DEFAULT_HOST),
-        )
+        # the channel is opened on a connection shared with other clients in this process
+        pool = MQConnectionPool.instance()
+        self.__channel = pool.blocking_channel()
+        self.__flow_control = pool.blocking_flow_control(self.__channel)
+        self.__owner = threading.get_ident()
+
+        self.reconnect_strategy.reconnected()
+        self.__ready.set()
+
+
+    def reconnect(self):
+        MQClient.close(self)        # release the channel only - subscriber queues must survive reconnection
 
-        self.__channel = connection.channel()
+        while True:
+            self.reconnect_strategy.wait()      # raises ConnectionError when attempts are exhausted
+            self.logger.info(f'reconnect - attempt:{self.reconnect_strategy.attempts}')
+
+            try:
+                self.connect()
+                return
+
+            except AMQPError as exc:
+                self.logger.info(f'reconnect - failed:{exc.__class__.__name__}:{exc}')
 
 
     def close(self):
         self.logger.debug('close')
+        self.__ready.clear()
 
         try:
             self.channel.close()
@@ -88,13 +149,53 @@ class MQClient(ABC):
             self.__channel = None
 
 
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        return self.__ready.wait(timeout)
+
+
+    def wait_until_unblocked(self):
+        if not self.is_blocked:
+            return
+
+        self.logger.warning(f'wait_until_unblocked - blocked:{self.flow_control.reason}')
+
+        while self.is_blocked:
+            if threading.get_ident() == self.__owner:
+                # only the owner may service the connection - sleep does so, so that connection.unblocked is received
+                self.channel.connection.sleep(self.__BLOCKED_POLL_INTERVAL)
+            else:
+                self.flow_control.wait_until_unblocked(self.__BLOCKED_POLL_INTERVAL)
+
+        self.logger.info(f'wait_until_unblocked - unblocked, blocked_time:{self.flow_control.blocked_time}')
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
+    @property
+    def reconnect_strategy(self):
+        return self.__reconnect_strategy
+
+
+    @property
+    def is_connected(self):
+        return self.__ready.is_set()
+
+
     @property
     def channel(self):
         return self.__channel
 
 
+    @property
+    def flow_control(self):
+        return self.__flow_control
+
+
+    @property
+    def is_blocked(self):
+        return self.flow_control is not None and self.flow_control.is_blocked
+
+
     @property
     def logger(self):
         return self.__logger
@@ -140,6 +241,64 @@ class MQManager(MQClient):
         self.channel.queue_delete(queue_name, if_unused=True, if_empty=False)
 
 
+    def queue_migrate(self, queue_name: str, successor_name: str) -> int:
+        # moves the messages on queue_name to successor_name, then deletes queue_name - returns the number moved
+        self.logger.debug(f'queue_migrate:{queue_name} successor:{successor_name}')
+
+        if self.channel is None:
+            raise RuntimeError('queue_migrate: no channel')
+
+        return self.migrate(self.channel, queue_name, successor_name)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def migrate_legacy(cls, legacy_name: str, successor_name: str) -> int:
+        # on a connection of its own, so may be called from any thread - returns 0 if there is no legacy queue
+        pool = MQConnectionPool.instance()
+        connection = pika.BlockingConnection(pika.ConnectionParameters(host=pool.host, port=pool.port))
+
+        try:
+            try:
+                connection.channel().queue_declare(legacy_name, passive=True)
+            except ChannelClosedByBroker:
+                return 0                                        # NOT_FOUND - the channel is closed by the broker
+
+            return cls.migrate(connection.channel(), legacy_name, successor_name)
+
+        finally:
+            if connection.is_open:
+                connection.close()
+
+
+    @staticmethod
+    def migrate(channel: BlockingChannel, queue_name: str, successor_name: str) -> int:
+        channel.queue_declare(successor_name, passive=True)     # declared by its subscriber
+        channel.confirm_delivery()
+
+        moved = 0
+
+        while True:
+            method, properties, body = channel.basic_get(queue_name)
+
+            if method is None:
+                break
+
+            # the successor is addressed by name, so the routing key travels in a header, as for a retry
+            headers = dict(properties.headers or {})
+            headers[DeadLettering.ROUTING_KEY_HEADER] = DeadLettering.routing_key(method.routing_key, properties)
+            properties.headers = headers
+
+            channel.basic_publish(exchange='', routing_key=successor_name, body=body, properties=properties)
+            channel.basic_ack(method.delivery_tag)              # once the broker has confirmed the copy
+            moved += 1
+
+        channel.queue_delete(queue_name, if_unused=True, if_empty=True)
+
+        return moved
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
@@ -155,16 +314,20 @@ class MQPublisher(MQClient):
 
 
     @classmethod
-    def construct_pub(cls, exchange_name: MQMode):
-        return cls(exchange_name)
+    def construct_pub(cls, exchange_name: MQMode, encoding: MQEncoding = MQEncoding.JSON):
+        return cls(exchange_name, encoding=encoding)
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, exchange_name: MQMode):
+    def __init__(self, exchange_name: MQMode, encoding: MQEncoding = MQEncoding.JSON):
         super().__init__()
 
+        if not encoding.value.is_available():
+            raise ValueError(f'encoding {encoding.name} is not available')
+
         self.__exchange_name = exchange_name  # string
+        self.__encoding = encoding
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -174,44 +337,73 @@ class MQPublisher(MQClient):
 
         super().connect()
         self.channel.exchange_declare(exchange=self.exchange_name, exchange_type=ExchangeType.topic, durable=True)
+        self.channel.add_on_return_callback(self.on_return)
         self.logger.debug(f'connect - channel:{self.channel}')
 
 
     def publish(self, message: Message):
         self.logger.debug(f'publish:{message}')
 
+        frame = self.frame(message)
+
+        if frame is not None:
+            self.__transmit(*frame)
+
+
+    def publish_many(self, messages: Iterable[Message]) -> list[bool]:
+        # returns an outcome for each message, in order - False where the message was invalid
+        frames = [self.frame(message) for message in messages]
+        self.logger.debug(f'publish_many:{len(frames)}')
+
+        for frame in frames:
+            if frame is not None:
+                self.__transmit(*frame)
+
+        return [frame is not None for frame in frames]
+
+
+    def frame(self, message: Message) -> tuple | None:
+        # returns (routing_key, body, properties, mandatory), or None if the message cannot be published
         try:
-            routing_key = JSONify.as_jdict(message.routing_key)
+            routing_key = RoutingKeyCache.instance().wire(message.routing_key)
+            policy = DeliveryPolicy.find(message.routing_key)
+            properties = policy.properties_for(message, self.encoding.value.content_type)
         except Exception:
             self.logger.warn(f'publish - invalid routing_key:{message.routing_key}')
-            return
+            return None
 
         try:
-            body = JSONify.dumps(message.payload)
+            body = self.encoding.value.encode(message.payload)
         except Exception:
             self.logger.warn(f'publish - invalid body:{message.payload}')
-            return
+            return None
+
+        return routing_key, body, properties, policy.mandatory
 
+
+    def __transmit(self, routing_key: str, body: bytes, properties, mandatory: bool):
         while True:
             try:
-                properties = pika.BasicProperties(
-                    content_type='application/json',
-                    delivery_mode=pika.DeliveryMode.Persistent)
+                self.wait_until_unblocked()
 
                 self.channel.basic_publish(
                     exchange=self.exchange_name,
                     routing_key=routing_key,
                     body=body,
-                    properties=properties)
+                    properties=properties,
+                    mandatory=mandatory)
                 break
 
             except (AttributeError, AMQPError) as exc:
                 self.logger.info(f'publish - conect failed:{exc}')
-                self.close()
-                self.connect()
+                self.reconnect()
                 self.logger.info('publish - connection re-established')
 
 
+    def on_return(self, _channel, method, _properties, _body):
+        self.logger.warning(f'on_return - unroutable:{method.routing_key} reply:{method.reply_text}')
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     @property
@@ -219,10 +411,15 @@ class MQPublisher(MQClient):
         return self.__exchange_name
 
 
+    @property
+    def encoding(self):
+        return self.__encoding
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
-        return f'MQPublisher:{{exchange_name:{self.exchange_name}}}'
+        return f'MQPublisher:{{exchange_name:{self.exchange_name}, encoding:{self.encoding.name}}}'
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -232,22 +429,45 @@ class MQSubscriber(MQPublisher):
     A RabbitMQ peer that can act as a publisher and subscriber
     """
 
+    __PREFETCH_PER_WORKER = 4
+
 
     @classmethod
     def construct_sub(cls, exchange_name: MQMode, queuing: MQTopology, id: EquipmentIdentifier,
-                      on_message: Callable):
-        return cls(exchange_name, queuing.value, id, on_message)
+                      on_message: Callable, encoding: MQEncoding = MQEncoding.JSON, max_workers: int | None = None,
+                      dedup: DedupCache | None = None):
+        return cls(exchange_name, queuing.value, id, on_message, encoding=encoding, max_workers=max_workers,
+                   dedup=dedup)
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     def __init__(self, exchange_name: MQMode, queue_config: MQTopology.QueueConfiguration, id: EquipmentIdentifier,
-                 on_message: Callable):
-        super().__init__(exchange_name)
+                 on_message: Callable, encoding: MQEncoding = MQEncoding.JSON, max_workers: int | None = None,
+                 dedup: DedupCache | None = None):
+        super().__init__(exchange_name, encoding=encoding)
+
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f'max_workers must be at least 1, got {max_workers}')
+
+        self.__max_workers = max_workers            # None for handling on the IO thread
+        self.__executor = None if max_workers is None else \
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='MQSubscriber')
+
+        self.__sources = {}                         # source: deque of deliveries waiting for its drain task
+        self.__sources_lock = threading.Lock()
 
         self.__id = id
         self.__queue_config = queue_config
+        self.__queue_name = queue_config.queue_name(exchange_name, id)
+        self.__legacy_name = queue_config.legacy_name(exchange_name, id)      # None once migrated
         self.__on_message = on_message
+        self.__dedup = dedup                        # None for no deduplication
+
+        self.__dead_lettering = None
+        self.__retry_channel = None                 # in confirm mode
+        self.__retried = 0
+        self.__poisoned = 0
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -264,9 +484,20 @@ class MQSubscriber(MQPublisher):
         durable = self.queue_config.durable
         exclusive = self.queue_config.exclusive
 
+        if self.queue_config.dead_lettering:
+            self.__dead_lettering = DeadLettering.construct(self.exchange_name, self.queue_name)
+
         while True:
             try:
-                self.channel.queue_declare(self.queue_name, durable=durable, exclusive=exclusive, auto_delete=False)
+                if self.__executor is not None:
+                    self.channel.basic_qos(prefetch_count=self.max_workers * self.__PREFETCH_PER_WORKER)
+
+                self.channel.queue_declare(self.queue_name, durable=durable, exclusive=exclusive, auto_delete=False,
+                                           arguments=self.queue_config.arguments)
+
+                if self.__dead_lettering is not None:
+                    self.__dead_lettering.declare(self.channel)
+                    self.__open_retry_channel()
 
                 for routing_key in routing_keys:
                     self.channel.queue_bind(
@@ -275,6 +506,8 @@ class MQSubscriber(MQPublisher):
                         routing_key=routing_key.as_json(),
                     )
 
+                self.migrate_legacy()
+
                 self.channel.basic_consume(
                     queue=self.queue_name,
                     on_message_callback=self.on_consume,
@@ -283,11 +516,28 @@ class MQSubscriber(MQPublisher):
                 self.channel.start_consuming()
             except AMQPError as exc:
                 self.logger.info(f'subscribe - conect failed:{exc}')
-                self.close()
-                self.connect()
+                self.__clear_sources()              # unacked deliveries will be redelivered
+                self.reconnect()
                 self.logger.info('subscribe - connection re-established')
 
 
+    def migrate_legacy(self):
+        # moves messages from the queue declared by an earlier version, now that this queue is declared and bound
+        if self.__legacy_name is None:
+            return
+
+        try:
+            moved = MQManager.migrate_legacy(self.__legacy_name, self.queue_name)
+            self.logger.info(f'migrate_legacy - moved:{moved} from:{self.__legacy_name}')
+
+        except AMQPError as exc:
+            # for example, the legacy queue is still in use - it can be migrated later, with mrcs_control_broker
+            self.logger.warning(f'migrate_legacy - failed:{exc.__class__.__name__}:{exc} - '
+                                f'legacy queue:{self.__legacy_name}')
+
+        self.__legacy_name = None           # attempted once per process
+
+
     def close(self):
         self.logger.debug(f'close - deleting:{self.queue_name}')
 
@@ -297,29 +547,174 @@ class MQSubscriber(MQPublisher):
         except (AttributeError, AMQPError, ChannelWrongStateError):
             pass
         finally:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False, cancel_futures=True)
+
+            self.__clear_sources()
+            self.__close_retry_channel()
+
+            if self.dedup is not None:
+                self.dedup.close()
+
             super().close()
 
 
-    def on_consume(self, ch, method, _properties, payload):
+    def on_consume(self, ch, method, properties, payload):
         self.logger.debug(f'on_consume:{str(payload)}')
 
+        wire_key = DeadLettering.routing_key(method.routing_key, properties)     # retries arrive by queue name
+
         try:
-            routing_key = PublicationRoutingKey.construct_from_jdict(method.routing_key)
+            routing_key = RoutingKeyCache.instance().parse(wire_key)
         except Exception:
-            self.logger.warn(f'on_consume - invalid routing_key:{method.routing_key}')
+            self.logger.warn(f'on_consume - invalid routing_key:{wire_key}')
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
             return
 
         if routing_key.source == self.id:
+            ch.basic_ack(delivery_tag=method.delivery_tag)
             return  # do not send message to self
 
-        message = Message.construct_from_callback(routing_key, payload)
+        try:
+            message = MQEncoding.find(properties.content_type).value.message(routing_key, payload)
+        except Exception as exc:
+            self.logger.warn(f'on_consume - invalid body:{type(exc).__name__}:{exc} - '
+                             f'content_type:{properties.content_type}')
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+
+        if self.dedup is not None and self.dedup.is_duplicate(message.origin, wire_key):
+            self.logger.info(f'on_consume - duplicate:{message.origin}')
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            return
+
+        delivered = (method.delivery_tag, message, wire_key, properties, payload)
+
+        if self.__executor is None:
+            self.settle(ch, delivered, self.handle(message))
+            return
+
+        self.__enqueue(ch, routing_key.source.as_json(), delivered)
+
+
+    def settle(self, ch: BlockingChannel, delivered: tuple, handled: bool):
+        # runs on the IO thread - delivered is (delivery_tag, message, wire_key, properties, payload)
+        delivery_tag, message, wire_key, properties, payload = delivered
+
+        if not handled:
+            self.reject(ch, delivery_tag, wire_key, properties, payload)
+            return
+
+        self.__processed(message.origin, wire_key)
+
+        try:
+            ch.basic_ack(delivery_tag=delivery_tag)
+        except AMQPError as exc:
+            self.logger.info(f'settle - ack failed:{exc.__class__.__name__}:{exc}')
+
 
+    def handle(self, message: Message) -> bool:
         try:
             self.on_message_message(message)
-            ch.basic_ack(delivery_tag=method.delivery_tag)
+            return True
         except Exception as exc:
             self.logger.warn(f'on_consume:{type(exc).__name__}:{exc} - message:{message}')
-            # ch.basic_nack(delivery_tag=method.delivery_tag)   # TODO: enable as required
+            return False
+
+
+    def reject(self, ch: BlockingChannel, delivery_tag: int, wire_key: str, properties, payload: bytes):
+        # the message is retried later, poisoned or discarded - it is requeued only if its retry copy is not confirmed
+        try:
+            if self.__dead_lettering is None:
+                ch.basic_nack(delivery_tag=delivery_tag, requeue=False)
+                return
+
+            try:
+                will_retry = self.__dead_lettering.reject(self.__retry_channel, wire_key, properties, payload)
+            except (NackError, UnroutableError) as exc:
+                self.logger.warning(f'reject - copy not confirmed:{exc.__class__.__name__}:{exc}')
+                ch.basic_nack(delivery_tag=delivery_tag, requeue=True)     # redeliver the original
+                return
+
+            if will_retry:
+                self.__retried += 1
+            else:
+                self.__poisoned += 1
+                self.logger.warning(f'reject - poisoned:{wire_key} queue:{self.__dead_lettering.dead_queue_name}')
+
+            ch.basic_ack(delivery_tag=delivery_tag)                         # the copy is safe
+
+        except AMQPError as exc:
+            self.logger.info(f'reject - failed:{exc.__class__.__name__}:{exc}')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __enqueue(self, ch: BlockingChannel, source: str, delivered: tuple):
+        # runs on the IO thread - a source has at most one drain task, which is started by its first delivery
+        with self.__sources_lock:
+            waiting = self.__sources.get(source)
+
+            if waiting is not None:
+                waiting.append(delivered)
+                return
+
+            waiting = deque((delivered,))
+            self.__sources[source] = waiting
+
+        self.__executor.submit(self.__drain, ch, source, waiting)
+
+
+    def __drain(self, ch: BlockingChannel, source: str, waiting: deque):
+        # runs on a worker thread, until the source has nothing waiting
+        while True:
+            with self.__sources_lock:
+                if not waiting:
+                    if self.__sources.get(source) is waiting:
+                        del self.__sources[source]
+                    return
+
+                delivered = waiting.popleft()
+
+            handled = self.handle(delivered[1])
+
+            try:
+                ch.connection.add_callback_threadsafe(functools.partial(self.settle, ch, delivered, handled))
+            except AMQPError as exc:
+                self.logger.info(f'drain - cannot settle:{exc.__class__.__name__}:{exc}')
+
+
+    def __clear_sources(self):
+        # the deliveries of a lost channel cannot be acked - they will be redelivered
+        with self.__sources_lock:
+            for waiting in self.__sources.values():
+                waiting.clear()
+
+            self.__sources.clear()
+
+
+    def __open_retry_channel(self):
+        # a channel of its own, so that waiting for confirmations does not slow the subscriber's own publications
+        self.__close_retry_channel()
+
+        self.__retry_channel = MQConnectionPool.instance().blocking_channel()
+        self.__retry_channel.confirm_delivery()
+
+
+    def __close_retry_channel(self):
+        try:
+            if self.__retry_channel is not None and self.__retry_channel.is_open:
+                self.__retry_channel.close()
+        except (AMQPError, ChannelWrongStateError):
+            pass
+        finally:
+            self.__retry_channel = None
+
+
+    def __processed(self, origin: str, wire_key: str):
+        # recorded before the ack, so that a redelivery after a failed ack is recognised
+        if self.dedup is not None:
+            self.dedup.record(origin, wire_key)
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -336,7 +731,7 @@ class MQSubscriber(MQPublisher):
 
     @property
     def queue_name(self):
-        return self.queue_config.queue_name(self.exchange_name, self.id)
+        return self.__queue_name
 
 
     @property
@@ -344,8 +739,29 @@ class MQSubscriber(MQPublisher):
         return self.__on_message
 
 
+    @property
+    def max_workers(self):
+        return self.__max_workers
+
+
+    @property
+    def dedup(self):
+        return self.__dedup
+
+
+    @property
+    def retried(self):
+        return self.__retried
+
+
+    @property
+    def poisoned(self):
+        return self.__poisoned
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     def __str__(self, *args, **kwargs):
         return (f'MQSubscriber:{{exchange_name:{self.exchange_name}, id:{self.id}, queue_config:{self.queue_config}, '
-                f'queue_name:{self.queue_name}, channel:{self.channel}}}')
+                f'queue_name:{self.queue_name}, max_workers:{self.max_workers}, retried:{self.retried}, '
+                f'poisoned:{self.poisoned}, channel:{self.channel}}}')
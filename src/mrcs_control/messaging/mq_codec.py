@@ -0,0 +1,157 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+Message body codecs, selected by publishers and identified to subscribers by the AMQP content_type property
+
+* MQBodyCodec - an abstract message body codec
+* JSONBodyCodec - the default codec, 'application/json'
+* MsgPackBodyCodec - a compact binary codec, 'application/msgpack'
+* MQEncoding - an enumeration of the supported codecs
+
+Publishers choose an encoding. Subscribers decode by content_type, so JSON and binary publishers can share an exchange.
+Deliveries without a recognised content_type are decoded as JSON.
+
+The MessagePack codec requires the optional msgpack package - on the subscriber hosts, as well as on the publisher's.
+A subscriber without it cannot decode a MessagePack delivery, and drops it. Publishers therefore use JSON unless the
+deployment has opted in to the compact encoding.
+
+https://msgpack.org
+https://www.rabbitmq.com/docs/publishers#message-properties
+"""
+
+from abc import ABC, abstractmethod
+from enum import Enum, unique
+
+from mrcs_core.data.json import JSONable, JSONify
+from mrcs_core.data.meta_enum import MetaEnum
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import PublicationRoutingKey
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MQBodyCodec(ABC):
+    """
+    An abstract message body codec
+    """
+
+    @property
+    @abstractmethod
+    def content_type(self) -> str:
+        pass
+
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        pass
+
+
+    @abstractmethod
+    def encode(self, payload) -> bytes | str:
+        pass
+
+
+    @abstractmethod
+    def message(self, routing_key: PublicationRoutingKey, body: bytes) -> Message:
+        pass
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return f'{self.__class__.__name__}:{{content_type:{self.content_type}, is_available:{self.is_available()}}}'
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class JSONBodyCodec(MQBodyCodec):
+    """
+    The default codec
+    """
+
+    @property
+    def content_type(self):
+        return 'application/json'
+
+
+    def is_available(self):
+        return True
+
+
+    def encode(self, payload):
+        return JSONify.dumps(payload)
+
+
+    def message(self, routing_key, body):
+        return Message.construct_from_callback(routing_key, body)
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MsgPackBodyCodec(MQBodyCodec):
+    """
+    A compact binary codec
+    """
+
+    @property
+    def content_type(self):
+        return 'application/msgpack'
+
+
+    def is_available(self):
+        return msgpack is not None
+
+
+    def encode(self, payload):
+        return msgpack.packb(payload, default=self.__as_json)
+
+
+    def message(self, routing_key, body):
+        payload = msgpack.unpackb(body)
+
+        return Message(routing_key, payload['body'], origin=payload['origin'])
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def __as_json(obj):
+        if isinstance(obj, JSONable):
+            return obj.as_json()
+
+        raise TypeError(f'cannot encode:{type(obj).__name__}')
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+@unique
+class MQEncoding(Enum, metaclass=MetaEnum):
+    """
+    An enumeration of the supported message body codecs
+    """
+
+    JSON = JSONBodyCodec()
+    MSGPACK = MsgPackBodyCodec()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def find(cls, content_type: str | None) -> MQEncoding:
+        for encoding in cls:
+            if encoding.value.content_type == content_type:
+                return encoding
+
+        return cls.JSON
+
+
+    @classmethod
+    def compact(cls) -> MQEncoding:
+        return cls.MSGPACK if cls.MSGPACK.value.is_available() else cls.JSON
@@ -0,0 +1,333 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+A process-wide pool of AMQP connections, shared by the MQ clients
+
+Each client holds its own channel, but channels are opened on a small number of shared connections, so a process
+running several nodes makes a few TCP / AMQP handshakes, rather than one per node. Connections are opened lazily, and
+are re-opened on demand if they have been closed by the broker.
+
+Blocking connections (pika.BlockingConnection) and async connections (pika AsyncioConnection) are pooled separately.
+Blocking connections are not thread-safe, so each thread has a connection of its own, shared by the blocking clients
+that run on that thread. The connection of a thread that has terminated is closed when the next blocking channel is
+opened. Async connections are bound to an event loop, so each event loop has a pool of its own - the pool of a loop
+that has been closed is discarded.
+
+Each pooled connection has a FlowControl, which tracks the broker's connection.blocked / connection.unblocked
+notifications. Clients find the FlowControl for their channel's connection, and pause publishing while it is blocked.
+
+https://www.rabbitmq.com/docs/connections
+https://www.rabbitmq.com/docs/channels
+https://www.rabbitmq.com/docs/connection-blocked
+"""
+
+import asyncio
+import threading
+from typing import Callable
+
+import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+
+from mrcs_control.messaging.flow_control import FlowControl
+from mrcs_core.sys.logging import Logging
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MQConnectionPool(object):
+    """
+    A process-wide pool of AMQP connections, shared by the MQ clients
+    """
+
+    __HOST = '127.0.0.1'  # do not use 'localhost' - IPv6 issues
+    __PORT = 5672
+
+    __DEFAULT_SIZE = 2  # async connections per event loop - lets publishing and consuming channels be spread
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    __instance = None
+
+
+    @classmethod
+    def instance(cls) -> MQConnectionPool:
+        if cls.__instance is None:
+            cls.__instance = cls(cls.__HOST, cls.__PORT, cls.__DEFAULT_SIZE)
+
+        return cls.__instance
+
+
+    @classmethod
+    def kill(cls):
+        if cls.__instance is None:
+            return
+
+        cls.__instance.close_all()
+        cls.__instance = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, host: str, port: int, size: int):
+        self.__host = host
+        self.__port = port
+        self.__size = size
+
+        self.__blocking_connections = {}        # thread ident: (BlockingConnection, FlowControl)
+        self.__async_connections = {}           # event loop: list of PooledAsyncConnection
+
+        self.__next_async = 0
+
+        self.__lock = threading.Lock()
+        self.__logger = Logging.getLogger()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def blocking_channel(self):
+        owner = threading.get_ident()
+
+        with self.__lock:
+            self.__close_orphans()
+
+            pooled = self.__blocking_connections.get(owner)
+            connection, flow_control = (None, FlowControl()) if pooled is None else pooled
+
+            if connection is None or connection.is_closed:
+                self.__logger.debug(f'blocking_channel - opening connection for thread:{owner}')
+
+                connection = self._blocking_connection()
+                self.__blocking_connections[owner] = (connection, flow_control)
+
+                flow_control.unblocked()        # any block applied to the connection that was replaced
+
+                connection.add_on_connection_blocked_callback(flow_control.on_blocked)
+                connection.add_on_connection_unblocked_callback(flow_control.on_unblocked)
+
+        return connection.channel()
+
+
+    def blocking_flow_control(self, channel) -> FlowControl | None:
+        with self.__lock:
+            for connection, flow_control in self.__blocking_connections.values():
+                if connection is channel.connection:
+                    return flow_control
+
+        return None
+
+
+    def async_channel(self, on_channel_open: Callable, on_connection_closed: Callable,
+                      on_open_error: Callable | None = None) -> FlowControl:
+        loop = asyncio.get_event_loop()
+
+        with self.__lock:
+            for closed in [closed for closed in self.__async_connections if closed.is_closed()]:
+                del self.__async_connections[closed]        # its connections died with it
+
+            connections = self.__async_connections.get(loop)
+
+            if connections is None:
+                connections = [self._async_connection(loop) for _ in range(self.size)]
+                self.__async_connections[loop] = connections
+
+            index = self.__next_async
+            self.__next_async = (index + 1) % self.size
+
+        connection = connections[index]
+        connection.channel(on_channel_open, on_connection_closed, on_open_error)
+
+        return connection.flow_control
+
+
+    def close_all(self):
+        # blocking connections are closed from the calling thread, so their clients must have stopped
+        self.__logger.debug('close_all')
+
+        with self.__lock:
+            for connection, _ in self.__blocking_connections.values():
+                if connection.is_open:
+                    connection.close()
+
+            self.__blocking_connections = {}
+
+            for loop, connections in self.__async_connections.items():
+                if loop.is_closed():
+                    continue                    # its connections died with it
+
+                for connection in connections:
+                    connection.close()
+
+            self.__async_connections = {}
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def _blocking_connection(self):
+        return pika.BlockingConnection(pika.ConnectionParameters(host=self.host, port=self.port))
+
+
+    def _async_connection(self, loop: asyncio.AbstractEventLoop):
+        return PooledAsyncConnection(self.url, loop)
+
+
+    def __close_orphans(self):
+        # the connections of terminated threads - no other thread can be using them
+        alive = {thread.ident for thread in threading.enumerate()}
+
+        for owner in [owner for owner in self.__blocking_connections if owner not in alive]:
+            connection, _ = self.__blocking_connections.pop(owner)
+            self.__logger.debug(f'blocking_channel - closing connection of thread:{owner}')
+
+            if connection.is_open:
+                connection.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def host(self):
+        return self.__host
+
+
+    @property
+    def port(self):
+        return self.__port
+
+
+    @property
+    def url(self):
+        return f'amqp://{self.host}:{self.port}/'
+
+
+    @property
+    def size(self):
+        return self.__size
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        blocking_open = len([conn for conn, _ in self.__blocking_connections.values() if conn.is_open])
+        async_open = len([conn for conns in self.__async_connections.values() for conn in conns if conn.is_open])
+
+        return (f'MQConnectionPool:{{url:{self.url}, size:{self.size}, blocking_open:{blocking_open}, '
+                f'async_open:{async_open}}}')
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class PooledAsyncConnection(object):
+    """
+    A lazily-opened AsyncioConnection, shared by several async MQ clients on one event loop
+    """
+
+    def __init__(self, url: str, loop: asyncio.AbstractEventLoop):
+        self.__url = url
+        self.__loop = loop
+
+        self.__connection = None
+        self.__opening = False
+        self.__waiting = []                 # (on_channel_open, on_open_error) pending the connection opening
+        self.__closed_listeners = set()     # on_connection_closed callbacks of clients with channels
+        self.__flow_control = FlowControl()
+
+        self.__logger = Logging.getLogger()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def channel(self, on_channel_open: Callable, on_connection_closed: Callable, on_open_error: Callable | None):
+        self.__closed_listeners.add(on_connection_closed)
+
+        if self.is_open:
+            self.__connection.channel(on_open_callback=on_channel_open)
+            return
+
+        self.__waiting.append((on_channel_open, on_open_error))
+
+        if self.__opening:
+            return
+
+        self.__logger.debug(f'channel - opening connection:{self.__url}')
+        self.__opening = True
+
+        AsyncioConnection(
+            parameters=pika.URLParameters(self.__url),
+            on_open_callback=self.on_connection_open,
+            on_open_error_callback=self.on_connection_open_error,
+            on_close_callback=self.on_connection_closed,
+            custom_ioloop=self.__loop)
+
+
+    def close(self):
+        if self.is_open:
+            self.__connection.close()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def on_connection_open(self, connection):
+        self.__logger.debug(f'on_connection_open:{connection}')
+
+        self.__connection = connection
+        self.__opening = False
+
+        connection.add_on_connection_blocked_callback(self.flow_control.on_blocked)
+        connection.add_on_connection_unblocked_callback(self.flow_control.on_unblocked)
+
+        waiting = self.__waiting
+        self.__waiting = []
+
+        for on_channel_open, _ in waiting:
+            connection.channel(on_open_callback=on_channel_open)
+
+
+    def on_connection_open_error(self, connection, err):
+        self.__logger.warning(f'on_connection_open_error:{err}')
+
+        self.__connection = None
+        self.__opening = False
+
+        waiting = self.__waiting
+        self.__waiting = []
+
+        for _, on_open_error in waiting:
+            if on_open_error is not None:
+                on_open_error(connection, err)
+
+
+    def on_connection_closed(self, connection, reason):
+        self.__logger.debug(f'on_connection_closed:{reason}')
+
+        self.__connection = None
+        self.__opening = False
+
+        self.flow_control.unblocked()       # a new connection will be told afresh, if the alarm persists
+
+        listeners = self.__closed_listeners
+        self.__closed_listeners = set()
+
+        for on_connection_closed in listeners:
+            on_connection_closed(connection, reason)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def is_open(self):
+        return self.__connection is not None and self.__connection.is_open
+
+
+    @property
+    def flow_control(self):
+        return self.__flow_control
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'PooledAsyncConnection:{{url:{self.__url}, is_open:{self.is_open}, opening:{self.__opening}, '
+                f'listeners:{len(self.__closed_listeners)}, flow_control:{self.flow_control}}}')
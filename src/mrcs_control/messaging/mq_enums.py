@@ -5,7 +5,14 @@ Created on 3 Aug 2026
 
 * MQMode - covers the TEST and LIVE cases
 
-* QueueConfiguration - specifies how a queue should be configured for a given subscribing MQ client:
+* MQTransport - AMQP, via the RabbitMQ broker, or LOOPBACK, an in-process exchange for nodes that share a process,
+and for broker-free testing
+
+* MQPriority - message priorities. URGENT messages, such as emergency stop or track power commands, are delivered
+ahead of any NORMAL messages that are waiting on the queue.
+
+* QueueConfiguration - specifies how a queue should be configured for a given subscribing MQ client. Queues are
+declared as priority queues (x-max-priority), so a backlog cannot delay an urgent message:
 
 * MQTopology - anticipates the way in which an MQ subscriber client will be used. Two QueueConfiguration
 options are supported:
@@ -13,16 +20,27 @@ options are supported:
     * SINGLE - used where there should only be one queue for a subscriber type. The queue should be durable,
     so that when the single subscriber is restarted, no messages will be lost. To support durability, the name of the
     queue should never change. Logically, the queue should be exclusive, but RabbitMQ does not support this arrangement.
+    Messages whose handling fails are retried after a delay, then set aside as poison (see DeadLettering).
 
     * MULTIPLE - used where multiple instances of a subscriber type are possible, an example is the
     mrcs_control_subscriber CLU. In that case, we can deliver to multiple mrcs_control_subscribers, each sharing a
     topic, but each client with its own queue. The subscriber's queue has a unique name, and is exclusive.
-    The queue is discarded when the process terminates.
+    The queue is discarded when the process terminates. Messages whose handling fails are discarded.
+
+A QueueConfiguration is shared by every subscriber that uses its topology, so it does not hold a queue name: each
+subscriber asks for its name once, on construction, and keeps it.
+
+Note that the arguments of an existing queue cannot be changed - redeclaring a durable queue with x-max-priority fails
+with PRECONDITION_FAILED if it was first declared without. The name of a SINGLE priority queue therefore carries its
+max_priority (for example, mrcs.live.CRT.000.001.p1), so that it never collides with a queue declared by an earlier
+version. Messages left on a legacy queue are moved to its successor, and the legacy queue deleted, when the successor's
+subscriber starts - or by mrcs_control_broker --migrate, for a legacy queue that was still in use at that time.
 
 https://www.rabbitmq.com/tutorials
+https://www.rabbitmq.com/docs/priority
 """
 
-from enum import Enum, StrEnum, unique
+from enum import Enum, IntEnum, StrEnum, unique
 from uuid import uuid4
 
 from mrcs_core.data.equipment_identity import EquipmentIdentifier
@@ -41,6 +59,30 @@ class MQMode(StrEnum, metaclass=MetaEnum):
     LIVE = 'mrcs.live'  # production mode
 
 
+# --------------------------------------------------------------------------------------------------------------------
+
+@unique
+class MQTransport(StrEnum, metaclass=MetaEnum):
+    """
+    An enumeration of all the possible message transports
+    """
+
+    AMQP = 'amqp'  # RabbitMQ broker
+    LOOPBACK = 'loopback'  # in-process exchange
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+@unique
+class MQPriority(IntEnum, metaclass=MetaEnum):
+    """
+    An enumeration of all the possible message priorities
+    """
+
+    NORMAL = 0  # default
+    URGENT = 1  # delivered ahead of waiting NORMAL messages
+
+
 # --------------------------------------------------------------------------------------------------------------------
 
 @unique
@@ -59,27 +101,44 @@ class MQTopology(Enum, metaclass=MetaEnum):
         """
 
 
-        def __init__(self, unique_name: bool, durable: bool, exclusive: bool):
+        def __init__(self, unique_name: bool, durable: bool, exclusive: bool, max_priority: int | None = None,
+                     dead_lettering: bool = False):
             self.__unique_name = unique_name
             self.__durable = durable
             self.__exclusive = exclusive
-
-            self.__queue_name = None
+            self.__max_priority = max_priority      # None for a FIFO queue
+            self.__dead_lettering = dead_lettering  # retry and poison queues, rather than discarding failures
 
 
         # ------------------------------------------------------------------------------------------------------------
 
         def queue_name(self, exchange_name: MQMode, id: EquipmentIdentifier) -> str:
-            if self.__queue_name is not None:
-                return self.__queue_name  # generate the name only once
-
+            # a unique name is different on every call
             parts = [exchange_name, id.as_json()]
 
             if self.unique_name:
                 parts.append(uuid4().hex)
 
-            self.__queue_name = '.'.join(parts)
-            return self.__queue_name
+            elif self.max_priority is not None:
+                parts.append(self.priority_suffix)
+
+            return '.'.join(parts)
+
+
+        def legacy_name(self, exchange_name: MQMode, id: EquipmentIdentifier) -> str | None:
+            # the name under which an earlier version declared the queue, without x-max-priority
+            if self.unique_name or self.max_priority is None:
+                return None
+
+            return '.'.join([exchange_name, id.as_json()])
+
+
+        def successor_name(self, legacy_name: str) -> str | None:
+            # the queue that supersedes one declared, under legacy_name, without x-max-priority
+            if self.unique_name or self.max_priority is None:
+                return None
+
+            return f'{legacy_name}.{self.priority_suffix}'
 
 
         # ------------------------------------------------------------------------------------------------------------
@@ -99,14 +158,35 @@ class MQTopology(Enum, metaclass=MetaEnum):
             return self.__exclusive
 
 
+        @property
+        def max_priority(self):
+            return self.__max_priority
+
+
+        @property
+        def dead_lettering(self):
+            return self.__dead_lettering
+
+
+        @property
+        def priority_suffix(self):
+            return f'p{self.max_priority}'
+
+
+        @property
+        def arguments(self):
+            return None if self.max_priority is None else {'x-max-priority': self.max_priority}
+
+
         # ------------------------------------------------------------------------------------------------------------
 
         def __str__(self, *args, **kwargs):
             return (f'MQMode.QueueConfiguration:{{unique_name:{self.unique_name}, durable:{self.durable}, '
-                    f'exclusive:{self.exclusive}, queue_name:{self.__queue_name}}}')
+                    f'exclusive:{self.exclusive}, max_priority:{self.max_priority}, '
+                    f'dead_lettering:{self.dead_lettering}}}')
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    SINGLE = QueueConfiguration(False, True, False)
-    MULTIPLE = QueueConfiguration(True, False, True)
+    SINGLE = QueueConfiguration(False, True, False, max_priority=int(max(MQPriority)), dead_lettering=True)
+    MULTIPLE = QueueConfiguration(True, False, True, max_priority=int(max(MQPriority)))
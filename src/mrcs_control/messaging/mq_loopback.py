@@ -0,0 +1,784 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+An in-process message transport, for co-located nodes and broker-free testing
+
+* LoopbackBroker - a process-wide topic exchange, with named queues and bindings
+* MQLoopbackPublisher / MQLoopbackSubscriber - blocking peers, with the interface of MQPublisher / MQSubscriber
+* MQAsyncLoopbackPublisher / MQAsyncLoopbackSubscriber - async peers, with the interface of MQAsyncPublisher /
+MQAsyncSubscriber
+
+Exchanges are named by MQMode, and queues are named and shared according to MQTopology, exactly as they are for
+RabbitMQ: SINGLE queues outlive their subscribers, and are shared by competing consumers; MULTIPLE queues are unique to
+each subscriber. Routing follows AMQP topic exchange rules.
+
+Messages are delivered as Message objects - there is no broker round trip, and no codec: every subscriber receives
+the publisher's own Message, which must not be modified. (The encoding is checked for availability, as it is for
+RabbitMQ peers, but is otherwise unused.) There are no acknowledgements: a message whose handler fails is logged and
+dropped.
+
+The async subscriber has the concurrency contract of MQAsyncSubscriber: up to prefetch_count messages are taken from
+the queue at once, up to max_concurrency of them are processed at once, and messages from the same source
+EquipmentIdentifier are processed in delivery order. Given a DedupCache, messages already processed are skipped.
+
+Async publications are confirmed at once: the confirmation is True if the message was routed to at least one queue,
+and False if it was not. Since confirmation is immediate, the max_in_flight window of an async publisher never fills.
+
+https://www.rabbitmq.com/tutorials/tutorial-five-python#topic-exchange
+"""
+
+import asyncio
+import functools
+import inspect
+import queue
+import threading
+from collections import deque
+from typing import Callable, Iterable
+
+from mrcs_control.messaging.dedup_cache import DedupCache
+from mrcs_control.messaging.mq_client import MQMode
+from mrcs_control.messaging.mq_codec import MQEncoding
+from mrcs_control.messaging.mq_enums import MQTopology
+from mrcs_control.messaging.routing_key_cache import RoutingKeyCache
+from mrcs_core.data.equipment_identity import EquipmentIdentifier
+from mrcs_core.data.json import JSONify
+from mrcs_core.messaging.message import Message
+from mrcs_core.messaging.routing_key import RoutingKey, SubscriptionRoutingKey
+from mrcs_core.sys.logging import Logging
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LoopbackBroker(object):
+    """
+    A process-wide topic exchange, with named queues and bindings
+    """
+
+    __instance = None
+
+
+    @classmethod
+    def instance(cls) -> LoopbackBroker:
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+
+    @classmethod
+    def kill(cls):
+        cls.__instance = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @classmethod
+    def topic_matches(cls, pattern: list[str], words: list[str]) -> bool:
+        if not pattern:
+            return not words
+
+        head, rest = pattern[0], pattern[1:]
+
+        if head == '#':
+            return any(cls.topic_matches(rest, words[i:]) for i in range(len(words) + 1))
+
+        if not words:
+            return False
+
+        return (head == '*' or head == words[0]) and cls.topic_matches(rest, words[1:])
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self):
+        self.__queues = {}                  # queue_name: LoopbackQueue
+        self.__bindings = {}                # exchange_name: set of (pattern, queue_name)
+        self.__routes = {}                  # (exchange_name, routing_key): list of queue_name
+
+        self.__lock = threading.RLock()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def queue_declare(self, queue_name: str) -> LoopbackQueue:
+        with self.__lock:
+            if queue_name not in self.__queues:
+                self.__queues[queue_name] = LoopbackQueue(queue_name)
+
+            return self.__queues[queue_name]
+
+
+    def queue_bind(self, exchange_name: str, queue_name: str, pattern: str):
+        with self.__lock:
+            self.__bindings.setdefault(exchange_name, set()).add((pattern, queue_name))
+            self.__routes.clear()
+
+
+    def queue_delete(self, queue_name: str):
+        with self.__lock:
+            self.__queues.pop(queue_name, None)
+
+            for bindings in self.__bindings.values():
+                for binding in [binding for binding in bindings if binding[1] == queue_name]:
+                    bindings.discard(binding)
+
+            self.__routes.clear()
+
+
+    def publish(self, exchange_name: str, routing_key: str, message: Message) -> bool:
+        with self.__lock:
+            queues = [self.__queues[name] for name in self.__route(exchange_name, routing_key)]
+
+        for destination in queues:
+            destination.put(message)
+
+        return bool(queues)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __route(self, exchange_name: str, routing_key: str) -> list[str]:
+        key = (exchange_name, routing_key)
+
+        if key not in self.__routes:
+            words = routing_key.split('.')
+            bindings = self.__bindings.get(exchange_name, set())
+
+            self.__routes[key] = sorted({queue_name for pattern, queue_name in bindings
+                                         if self.topic_matches(pattern.split('.'), words)})
+
+        return self.__routes[key]
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return f'LoopbackBroker:{{queues:{sorted(self.__queues)}, exchanges:{sorted(self.__bindings)}}}'
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LoopbackQueue(object):
+    """
+    A named queue, with competing consumers
+    """
+
+    def __init__(self, name: str):
+        self.__name = name
+
+        self.__backlog = deque()            # messages held while there are no consumers
+        self.__consumers = []               # callables that accept a Message, and are thread-safe
+        self.__next_consumer = 0
+
+        self.__lock = threading.Lock()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def put(self, message: Message):
+        with self.__lock:
+            if not self.__consumers:
+                self.__backlog.append(message)
+                return
+
+            consumer = self.__consumers[self.__next_consumer % len(self.__consumers)]
+            self.__next_consumer += 1
+
+        consumer(message)
+
+
+    def add_consumer(self, consumer: Callable[[Message], None]):
+        with self.__lock:
+            self.__consumers.append(consumer)
+
+            backlog = list(self.__backlog)
+            self.__backlog.clear()
+
+        for message in backlog:
+            consumer(message)
+
+
+    def remove_consumer(self, consumer: Callable[[Message], None]):
+        with self.__lock:
+            if consumer in self.__consumers:
+                self.__consumers.remove(consumer)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def name(self):
+        return self.__name
+
+
+    @property
+    def depth(self):
+        return len(self.__backlog)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return f'LoopbackQueue:{{name:{self.name}, depth:{self.depth}, consumers:{len(self.__consumers)}}}'
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MQLoopbackPublisher(object):
+    """
+    An in-process peer that can act as a publisher only (blocking)
+    """
+
+
+    @classmethod
+    def construct_pub(cls, exchange_name: MQMode, encoding: MQEncoding = MQEncoding.JSON):
+        return cls(exchange_name, encoding=encoding)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, exchange_name: MQMode, encoding: MQEncoding = MQEncoding.JSON):
+        if not encoding.value.is_available():
+            raise ValueError(f'encoding {encoding.name} is not available')
+
+        self.__exchange_name = exchange_name
+        self.__encoding = encoding
+        self.__is_connected = False
+
+        self.__logger = Logging.getLogger()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self):
+        self.logger.debug('connect')
+        self.__is_connected = True
+
+
+    def close(self):
+        self.logger.debug('close')
+        self.__is_connected = False
+
+
+    def wait_until_ready(self, _timeout: float | None = None) -> bool:
+        return self.is_connected
+
+
+    def publish(self, message: Message) -> bool:
+        # returns True if the message was routed to at least one queue
+        self.logger.debug(f'publish:{message}')
+
+        frame = self.frame(message)
+
+        if frame is None:
+            return False
+
+        return LoopbackBroker.instance().publish(self.exchange_name, *frame)
+
+
+    def publish_many(self, messages: Iterable[Message]) -> list[bool]:
+        return [self.publish(message) for message in messages]
+
+
+    def frame(self, message: Message) -> tuple | None:
+        # returns (routing_key, message), or None if the message cannot be published
+        try:
+            routing_key = RoutingKeyCache.instance().wire(message.routing_key)
+        except Exception:
+            self.logger.warn(f'publish - invalid routing_key:{message.routing_key}')
+            return None
+
+        return routing_key, message
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def exchange_name(self):
+        return self.__exchange_name
+
+
+    @property
+    def encoding(self):
+        return self.__encoding
+
+
+    @property
+    def is_connected(self):
+        return self.__is_connected
+
+
+    @property
+    def logger(self):
+        return self.__logger
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'{self.__class__.__name__}:{{exchange_name:{self.exchange_name}, encoding:{self.encoding.name}, '
+                f'is_connected:{self.is_connected}}}')
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MQLoopbackSubscriber(MQLoopbackPublisher):
+    """
+    An in-process peer that can act as a publisher and subscriber (blocking)
+    """
+
+
+    @classmethod
+    def construct_sub(cls, exchange_name: MQMode, queuing: MQTopology, id: EquipmentIdentifier,
+                      on_message: Callable, encoding: MQEncoding = MQEncoding.JSON, dedup: DedupCache | None = None):
+        # no redeliveries, so nothing to deduplicate
+        return cls(exchange_name, queuing.value, id, on_message, encoding=encoding)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, exchange_name: MQMode, queue_config: MQTopology.QueueConfiguration, id: EquipmentIdentifier,
+                 on_message: Callable, encoding: MQEncoding = MQEncoding.JSON):
+        super().__init__(exchange_name, encoding=encoding)
+
+        self.__id = id
+        self.__queue_config = queue_config
+        self.__queue_name = queue_config.queue_name(exchange_name, id)
+        self.__on_message = on_message
+
+        self.__inbox = queue.Queue()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def subscribe(self, *routing_keys: RoutingKey):
+        self.logger.debug('subscribe')
+
+        if not self.is_connected:
+            raise RuntimeError('subscribe: not connected')
+
+        if not routing_keys:
+            raise RuntimeError('subscribe: no routing keys')
+
+        broker = LoopbackBroker.instance()
+        loopback_queue = broker.queue_declare(self.queue_name)
+
+        for routing_key in routing_keys:
+            broker.queue_bind(self.exchange_name, self.queue_name, JSONify.as_jdict(routing_key))
+
+        loopback_queue.add_consumer(self.__inbox.put)
+
+        try:
+            while True:
+                self.on_consume(self.__inbox.get())
+        finally:
+            loopback_queue.remove_consumer(self.__inbox.put)
+
+
+    def close(self):
+        self.logger.debug(f'close - deleting:{self.queue_name}')
+
+        if not self.queue_config.durable:
+            LoopbackBroker.instance().queue_delete(self.queue_name)
+
+        super().close()
+
+
+    def on_consume(self, message: Message):
+        self.logger.debug(f'on_consume:{message}')
+
+        if message.routing_key.source == self.id:
+            return  # do not send message to self
+
+        try:
+            self.on_message_message(message)
+        except Exception as exc:
+            self.logger.warn(f'on_consume:{type(exc).__name__}:{exc} - message:{message}')
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def id(self):
+        return self.__id
+
+
+    @property
+    def queue_config(self):
+        return self.__queue_config
+
+
+    @property
+    def queue_name(self):
+        return self.__queue_name
+
+
+    @property
+    def on_message_message(self):
+        return self.__on_message
+
+
+    @property
+    def retried(self):
+        return 0                            # failed loopback messages are discarded
+
+
+    @property
+    def poisoned(self):
+        return 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'{self.__class__.__name__}:{{exchange_name:{self.exchange_name}, id:{self.id}, '
+                f'queue_config:{self.queue_config}, queue_name:{self.queue_name}, is_connected:{self.is_connected}}}')
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MQAsyncLoopbackPublisher(object):
+    """
+    An in-process peer that can act as a publisher only (async)
+    """
+
+
+    @classmethod
+    def construct_pub(cls, exchange_name: MQMode, on_startup_complete: Callable | None = None,
+                      max_in_flight: int | None = None, encoding: MQEncoding = MQEncoding.JSON):
+        return cls(exchange_name, on_startup_complete=on_startup_complete, max_in_flight=max_in_flight,
+                   encoding=encoding)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, exchange_name: MQMode, on_startup_complete: Callable | None = None,
+                 max_in_flight: int | None = None, encoding: MQEncoding = MQEncoding.JSON):
+        self.__publisher = MQLoopbackPublisher(exchange_name, encoding=encoding)
+        self.__on_startup_complete = on_startup_complete
+        self.__max_in_flight = max_in_flight        # never reached - confirmation is immediate
+
+        self.__ready = asyncio.Event()
+        self.__logger = Logging.getLogger()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self):
+        self.logger.debug('connect')
+
+        self.__publisher.connect()
+        asyncio.get_event_loop().call_soon(self.notify_startup_complete)
+
+
+    def close(self):
+        self.logger.debug('close')
+
+        self.__publisher.close()
+        self.__ready.clear()
+
+
+    async def connection_is_available(self):
+        await self.__ready.wait()
+
+
+    async def wait_until_unblocked(self):
+        return                              # the loopback broker never applies flow control
+
+
+    def notify_startup_complete(self):
+        self.__ready.set()
+
+        if self.on_startup_complete is not None:
+            self.on_startup_complete()
+
+
+    async def publish(self, message: Message) -> asyncio.Future | None:
+        self.logger.debug(f'publish:{message}')
+
+        frame = self.__publisher.frame(message)
+
+        if frame is None:
+            return None
+
+        confirmation = asyncio.get_running_loop().create_future()
+        confirmation.set_result(LoopbackBroker.instance().publish(self.exchange_name, *frame))
+
+        return confirmation
+
+
+    async def publish_many(self, messages: Iterable[Message]) -> list[asyncio.Future | None]:
+        return [await self.publish(message) for message in messages]
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def exchange_name(self):
+        return self.__publisher.exchange_name
+
+
+    @property
+    def encoding(self):
+        return self.__publisher.encoding
+
+
+    @property
+    def max_in_flight(self):
+        return self.__max_in_flight
+
+
+    @property
+    def in_flight(self):
+        return 0
+
+
+    @property
+    def on_startup_complete(self):
+        return self.__on_startup_complete
+
+
+    @property
+    def flow_control(self):
+        return None
+
+
+    @property
+    def is_blocked(self):
+        return False
+
+
+    @property
+    def is_connected(self):
+        return self.__ready.is_set()
+
+
+    @property
+    def logger(self):
+        return self.__logger
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'{self.__class__.__name__}:{{exchange_name:{self.exchange_name}, is_connected:{self.is_connected}, '
+                f'encoding:{self.encoding.name}, max_in_flight:{self.max_in_flight}}}')
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class MQAsyncLoopbackSubscriber(MQAsyncLoopbackPublisher):
+    """
+    An in-process peer that can act as a publisher and subscriber (async)
+    """
+
+    __DEFAULT_PREFETCH_COUNT = 1
+    __DEFAULT_MAX_CONCURRENCY = 1
+
+
+    @classmethod
+    def construct_sub(cls, exchange_name: MQMode, queuing: MQTopology, id: EquipmentIdentifier, on_message: Callable,
+                      *subscription_routing_keys: SubscriptionRoutingKey,
+                      on_startup_complete: Callable | None = None,
+                      prefetch_count: int | None = None, max_concurrency: int | None = None,
+                      encoding: MQEncoding = MQEncoding.JSON, dedup: DedupCache | None = None):
+
+        return cls(exchange_name, id, queuing.value, on_message,
+                   *subscription_routing_keys, on_startup_complete=on_startup_complete,
+                   prefetch_count=prefetch_count, max_concurrency=max_concurrency, encoding=encoding, dedup=dedup)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, exchange_name: MQMode, id: EquipmentIdentifier, queue_config: MQTopology.QueueConfiguration,
+                 on_message: Callable, *subscription_routing_keys: SubscriptionRoutingKey,
+                 on_startup_complete: Callable | None = None,
+                 prefetch_count: int | None = None, max_concurrency: int | None = None,
+                 encoding: MQEncoding = MQEncoding.JSON, dedup: DedupCache | None = None):
+        super().__init__(exchange_name, on_startup_complete=on_startup_complete, encoding=encoding)
+
+        self.__id = id
+        self.__queue_config = queue_config
+        self.__queue_name = queue_config.queue_name(exchange_name, id)
+        self.__on_message = on_message
+        self.__subscription_routing_keys = subscription_routing_keys
+        self.__dedup = dedup                # None for no deduplication
+
+        self.__prefetch_count = self.__DEFAULT_PREFETCH_COUNT if prefetch_count is None else prefetch_count
+        self.__max_concurrency = self.__DEFAULT_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+
+        self.__concurrency = asyncio.Semaphore(self.__max_concurrency)
+        self.__source_tails = {}            # source: last task for that source - preserves per-source ordering
+
+        self.__loop = None
+        self.__queue = None
+
+        self.__unacked = 0                  # messages taken from the queue, and not yet processed
+        self.__held = deque()               # messages held back while prefetch_count are unacked
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def connect(self):
+        self.logger.debug('connect')
+        self.__loop = asyncio.get_event_loop()
+
+        broker = LoopbackBroker.instance()
+        self.__queue = broker.queue_declare(self.queue_name)
+
+        for routing_key in self.subscription_routing_keys:
+            broker.queue_bind(self.exchange_name, self.queue_name, JSONify.as_jdict(routing_key))
+
+        super().connect()
+        self.__queue.add_consumer(self.on_consume)
+
+
+    def close(self):
+        self.logger.debug('close')
+
+        if self.__queue is not None:
+            self.__queue.remove_consumer(self.on_consume)
+
+        self.__held.clear()
+
+        if not self.queue_config.durable:
+            LoopbackBroker.instance().queue_delete(self.queue_name)
+
+        super().close()
+
+
+    def on_consume(self, message: Message):
+        # may be called from any thread
+        if message.routing_key.source == self.id:
+            return  # do not send message to self
+
+        self.__loop.call_soon_threadsafe(self.__deliver, message)
+
+
+    @staticmethod
+    def is_expired(_deadline: float | None) -> bool:
+        return False                        # loopback messages carry no expiration
+
+
+    async def process_message(self, message: Message, predecessor: asyncio.Task | None = None):
+        self.logger.debug(f'process_message:{message}')
+
+        if predecessor is not None:
+            await asyncio.wait((predecessor,))      # same source - wait its turn, whatever its outcome
+
+        async with self.__concurrency:
+            try:
+                result = self.on_message(message, None)
+                if inspect.isawaitable(result):
+                    await result
+
+                if self.dedup is not None:
+                    self.dedup.record(message.origin, RoutingKeyCache.instance().wire(message.routing_key))
+
+            except Exception as exc:
+                self.logger.warn(f'process_message:{type(exc).__name__}:{exc} - message:{message}')
+
+
+    def __deliver(self, message: Message):
+        # runs on the event loop
+        if self.dedup is not None and \
+                self.dedup.is_duplicate(message.origin, RoutingKeyCache.instance().wire(message.routing_key)):
+            self.logger.info(f'on_consume - duplicate:{message.origin}')
+            return
+
+        if self.__unacked >= self.prefetch_count:
+            self.__held.append(message)
+            return
+
+        self.__dispatch(message)
+
+
+    def __dispatch(self, message: Message):
+        source = message.routing_key.source.as_json()
+        predecessor = self.__source_tails.get(source)
+
+        self.__unacked += 1
+
+        task = self.__loop.create_task(self.process_message(message, predecessor=predecessor))
+        task.add_done_callback(functools.partial(self.__on_processed, source))
+        self.__source_tails[source] = task
+
+
+    def __on_processed(self, source, task):
+        if self.__source_tails.get(source) is task:
+            del self.__source_tails[source]
+
+        self.__unacked -= 1
+
+        if self.__held:
+            self.__dispatch(self.__held.popleft())
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def id(self):
+        return self.__id
+
+
+    @property
+    def queue_config(self):
+        return self.__queue_config
+
+
+    @property
+    def queue_name(self):
+        return self.__queue_name
+
+
+    @property
+    def on_message(self):
+        return self.__on_message
+
+
+    @property
+    def subscription_routing_keys(self):
+        return self.__subscription_routing_keys
+
+
+    @property
+    def dedup(self):
+        return self.__dedup
+
+
+    @property
+    def prefetch_count(self):
+        return self.__prefetch_count
+
+
+    @property
+    def max_concurrency(self):
+        return self.__max_concurrency
+
+
+    @property
+    def expired(self):
+        return 0
+
+
+    @property
+    def retried(self):
+        return 0                            # failed loopback messages are discarded
+
+
+    @property
+    def poisoned(self):
+        return 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        routing_keys = [JSONify.as_jdict(key) for key in self.subscription_routing_keys]
+
+        return (f'{self.__class__.__name__}:{{exchange_name:{self.exchange_name}, is_connected:{self.is_connected}, '
+                f'id:{self.id}, queue_config:{self.queue_config}, queue_name:{self.queue_name}, '
+                f'routing_keys:{routing_keys}, prefetch_count:{self.prefetch_count}, '
+                f'max_concurrency:{self.max_concurrency}}}')
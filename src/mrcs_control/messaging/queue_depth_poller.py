@@ -0,0 +1,261 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+A background sampler of queue depths and consumer counts, via the RabbitMQ management API
+
+Every interval seconds, the poller takes one sample of all queues (or of the named queues) from an AsyncBroker, and
+keeps the last window samples for each queue. The backlog trend of a queue is the rate of change of its depth, in
+messages per second, across the samples held.
+
+A sample that fails - for example, because the management plugin is restarting - is counted, and skipped. An unexpected
+failure is also logged, and does not stop the poller. Queues that are absent from a successful sample of all queues -
+including those for which the broker returned nothing - are forgotten.
+
+https://www.rabbitmq.com/docs/http-api-reference
+https://www.rabbitmq.com/docs/monitoring
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import httpx
+
+from mrcs_control.sys.interval_timer import AsyncIntervalTimer
+from mrcs_core.sys.logging import Logging
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class QueueDepth(object):
+    """
+    The depth and consumer count of a queue, at a moment in time
+    """
+
+    @classmethod
+    def construct_from_jdict(cls, jdict, sampled: float | None = None):
+        if not jdict:
+            return None
+
+        sampled = time.time() if sampled is None else sampled
+
+        # message counts are absent until the broker has collected statistics for the queue...
+        return cls(jdict['name'], jdict.get('messages', 0), jdict.get('messages_ready', 0),
+                   jdict.get('messages_unacknowledged', 0), jdict.get('consumers', 0), sampled)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, name: str, messages: int, ready: int, unacked: int, consumers: int, sampled: float):
+        self.__name = name
+        self.__messages = messages
+        self.__ready = ready
+        self.__unacked = unacked
+        self.__consumers = consumers
+        self.__sampled = sampled                    # epoch seconds
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def name(self):
+        return self.__name
+
+
+    @property
+    def messages(self):
+        return self.__messages
+
+
+    @property
+    def ready(self):
+        return self.__ready
+
+
+    @property
+    def unacked(self):
+        return self.__unacked
+
+
+    @property
+    def consumers(self):
+        return self.__consumers
+
+
+    @property
+    def sampled(self):
+        return self.__sampled
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'QueueDepth:{{name:{self.name}, messages:{self.messages}, ready:{self.ready}, '
+                f'unacked:{self.unacked}, consumers:{self.consumers}, sampled:{round(self.sampled, 3)}}}')
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class QueueDepthPoller(object):
+    """
+    A background sampler of queue depths and consumer counts, via the RabbitMQ management API
+    """
+
+    __DEFAULT_INTERVAL = 10.0                       # seconds
+    __DEFAULT_WINDOW = 30                           # samples per queue
+
+
+    @classmethod
+    def construct(cls, broker, names: list[str] | None = None):
+        return cls(broker, cls.__DEFAULT_INTERVAL, cls.__DEFAULT_WINDOW, names=names)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, broker, interval: float, window: int, names: list[str] | None = None):
+        if window < 2:
+            raise ValueError(f'window must be at least 2, got:{window}')
+
+        self.__broker = broker                      # AsyncBroker
+        self.__interval = interval
+        self.__window = window
+        self.__names = names                        # None for all queues
+
+        self.__history = {}                         # name: deque of QueueDepth, oldest first
+        self.__task = None
+
+        self.__samples = 0
+        self.__errors = 0
+
+        self.__logger = Logging.getLogger()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def start(self):
+        if self.is_running:
+            return
+
+        self.__task = asyncio.get_running_loop().create_task(self.run())
+
+
+    async def stop(self):
+        if self.__task is None:
+            return
+
+        self.__task.cancel()
+
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+
+        self.__task = None
+
+
+    async def run(self):
+        timer = AsyncIntervalTimer(self.interval)
+
+        while True:
+            try:
+                await self.sample()
+            except Exception as exc:
+                self.__errors += 1
+                self.__logger.warning(f'run:{type(exc).__name__}:{exc}')
+
+            await timer.next()
+
+
+    async def sample(self) -> bool:
+        try:
+            depths = await self.__broker.queue_depths(self.__names)
+
+        except (httpx.HTTPError, ValueError):
+            self.__errors += 1
+            return False
+
+        depths = [depth for depth in depths if depth is not None]      # an empty response for a queue
+
+        if self.__names is None:
+            sampled = {depth.name for depth in depths}
+
+            for name in [name for name in self.__history if name not in sampled]:
+                del self.__history[name]
+
+        for depth in depths:
+            self.__history.setdefault(depth.name, deque(maxlen=self.window)).append(depth)
+
+        self.__samples += 1
+        return True
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def latest(self, name: str) -> QueueDepth | None:
+        history = self.__history.get(name)
+
+        return history[-1] if history else None
+
+
+    def history(self, name: str) -> list[QueueDepth]:
+        return list(self.__history.get(name, ()))
+
+
+    def trend(self, name: str) -> float | None:
+        # messages per second, from the oldest to the newest sample held - positive while a backlog is building
+        history = self.__history.get(name)
+
+        if not history or len(history) < 2:
+            return None
+
+        oldest = history[0]
+        newest = history[-1]
+
+        elapsed = newest.sampled - oldest.sampled
+
+        if elapsed <= 0:
+            return None
+
+        return (newest.messages - oldest.messages) / elapsed
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def interval(self):
+        return self.__interval
+
+
+    @property
+    def window(self):
+        return self.__window
+
+
+    @property
+    def queue_names(self):
+        return sorted(self.__history)
+
+
+    @property
+    def is_running(self):
+        return self.__task is not None and not self.__task.done()
+
+
+    @property
+    def samples(self):
+        return self.__samples
+
+
+    @property
+    def errors(self):
+        return self.__errors
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'QueueDepthPoller:{{interval:{self.interval}, window:{self.window}, names:{self.__names}, '
+                f'queues:{len(self.__history)}, is_running:{self.is_running}, samples:{self.samples}, '
+                f'errors:{self.errors}}}')
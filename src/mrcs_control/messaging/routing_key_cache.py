@@ -0,0 +1,106 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+A process-wide cache of parsed routing keys
+
+The set of distinct routing keys in a layout is small, so parsing the wire form of a routing key on every delivery,
+and formatting it on every publish, is repeated work. The cache maps wire strings to PublicationRoutingKey objects,
+and routing keys back to wire strings. Parsed routing keys are shared, and must be treated as immutable.
+
+Routing keys are looked up by value - their class, source and target - so routing keys that are built separately,
+but are equal, share an entry. The cache is shared by every thread in the process.
+
+Routing keys that fail to parse are not cached - the exception is raised to the caller, as before. Routing key
+objects without a source and target are formatted on every call.
+"""
+
+from mrcs_control.sys.lru_cache import LRUCache
+from mrcs_core.data.json import JSONify
+from mrcs_core.messaging.routing_key import PublicationRoutingKey, RoutingKey
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class RoutingKeyCache(object):
+    """
+    A process-wide cache of parsed routing keys
+    """
+
+    __DEFAULT_MAX_SIZE = 1024
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    __instance = None
+
+
+    @classmethod
+    def instance(cls) -> RoutingKeyCache:
+        if cls.__instance is None:
+            cls.__instance = cls(cls.__DEFAULT_MAX_SIZE)
+
+        return cls.__instance
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, max_size: int):
+        self.__parsed = LRUCache(max_size)      # wire string: PublicationRoutingKey
+        self.__wired = LRUCache(max_size)       # (class, source, target): wire string
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def parse(self, wire: str) -> PublicationRoutingKey:
+        routing_key = self.__parsed.get(wire)
+
+        if routing_key is None:
+            routing_key = PublicationRoutingKey.construct_from_jdict(wire)      # may raise exception
+            self.__parsed.put(wire, routing_key)
+
+        return routing_key
+
+
+    def wire(self, routing_key: RoutingKey) -> str:
+        try:
+            key = self.value_key(routing_key)
+        except AttributeError:
+            return JSONify.as_jdict(routing_key)                                # no source or target
+
+        wire = self.__wired.get(key)
+
+        if wire is None:
+            wire = JSONify.as_jdict(routing_key)                                # may raise exception
+            self.__wired.put(key, wire)
+
+        return wire
+
+
+    @staticmethod
+    def value_key(routing_key: RoutingKey) -> tuple:
+        return routing_key.__class__, routing_key.source.as_json(), routing_key.target.as_json()
+
+
+    def clear(self):
+        self.__parsed.clear()
+        self.__wired.clear()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def hits(self):
+        return self.__parsed.hits + self.__wired.hits
+
+
+    @property
+    def misses(self):
+        return self.__parsed.misses + self.__wired.misses
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return f'RoutingKeyCache:{{parsed:{self.__parsed}, wired:{self.__wired}}}'
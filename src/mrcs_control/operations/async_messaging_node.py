@@ -10,9 +10,13 @@ The AsyncMessagingNode class provides asyncio loop utilities to support concrete
 
 import asyncio
 from abc import ABC, abstractmethod
+from typing import Iterable
 
+from mrcs_control.messaging.dedup_cache import DedupCache
 from mrcs_control.messaging.mq_async_client import MQAsyncPublisher, MQAsyncSubscriber
+from mrcs_control.messaging.mq_codec import MQEncoding
 from mrcs_control.messaging.mq_enums import MQTopology
+from mrcs_control.messaging.mq_loopback import MQAsyncLoopbackPublisher, MQAsyncLoopbackSubscriber
 from mrcs_control.operations.node_enums import NodeTopology
 from mrcs_core.data.equipment_identity import EquipmentIdentifier
 from mrcs_core.messaging.message import Message
@@ -91,8 +95,10 @@ class AsyncPublisherNode(AsyncMessagingNode, ABC):
     """
 
 
-    def __init__(self, ops: NodeTopology.ServiceConfiguration):
-        publisher = MQAsyncPublisher.construct_pub(ops.mq_mode, on_startup_complete=self.handle_startup)
+    def __init__(self, ops: NodeTopology.ServiceConfiguration, encoding: MQEncoding = MQEncoding.JSON):
+        publisher_class = MQAsyncLoopbackPublisher if ops.is_loopback else MQAsyncPublisher
+        publisher = publisher_class.construct_pub(ops.mq_mode, on_startup_complete=self.handle_startup,
+                                                  encoding=encoding)
         super().__init__(ops, publisher)
         self.__async_loop = None
 
@@ -101,7 +107,12 @@ class AsyncPublisherNode(AsyncMessagingNode, ABC):
 
     async def publish(self, message: Message):
         self.logger.debug('AsyncPublisherNode - publish')
-        await self.mq_client.publish(message)
+        return await self.mq_client.publish(message)
+
+
+    async def publish_many(self, messages: Iterable[Message]):
+        self.logger.debug('AsyncPublisherNode - publish_many')
+        return await self.mq_client.publish_many(messages)
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -142,18 +153,32 @@ class AsyncSubscriberNode(AsyncMessagingNode, ABC):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, ops: NodeTopology.ServiceConfiguration, queuing: MQTopology):
-        subscriber = MQAsyncSubscriber.construct_sub(ops.mq_mode, queuing, self.id(), self.handle_message,
-                                                     *self.subscription_routing_keys(),
-                                                     on_startup_complete=self.handle_startup)
+    def __init__(self, ops: NodeTopology.ServiceConfiguration, queuing: MQTopology,
+                 prefetch_count: int | None = None, max_concurrency: int | None = None,
+                 encoding: MQEncoding = MQEncoding.JSON, deduplicate: bool = False):
+        dedup = DedupCache.construct(self.dedup_path(ops, queuing)) if deduplicate and not ops.is_loopback else None
+
+        subscriber_class = MQAsyncLoopbackSubscriber if ops.is_loopback else MQAsyncSubscriber
+        subscriber = subscriber_class.construct_sub(ops.mq_mode, queuing, self.id(), self.handle_message,
+                                                    *self.subscription_routing_keys(),
+                                                    on_startup_complete=self.handle_startup,
+                                                    prefetch_count=prefetch_count, max_concurrency=max_concurrency,
+                                                    encoding=encoding, dedup=dedup)
         super().__init__(ops, subscriber)
         self.__async_loop = None
 
 
+    @classmethod
+    def dedup_path(cls, ops: NodeTopology.ServiceConfiguration, queuing: MQTopology) -> str | None:
+        # only a durable queue outlives the process, along with its unacked messages
+        return ops.state_path(f'{cls.id().as_json()}.dedup') if queuing == MQTopology.SINGLE else None
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     @abstractmethod
-    def handle_message(self, message: Message):
+    def handle_message(self, message: Message, deadline: float | None = None):
+        # deadline is the epoch time after which the message has expired - None if it never expires
         pass
 
 
@@ -161,7 +186,12 @@ class AsyncSubscriberNode(AsyncMessagingNode, ABC):
 
     async def publish(self, message: Message):
         self.logger.debug('AsyncSubscriberNode - publish')
-        await self.mq_client.publish(message)
+        return await self.mq_client.publish(message)
+
+
+    async def publish_many(self, messages: Iterable[Message]):
+        self.logger.debug('AsyncSubscriberNode - publish_many')
+        return await self.mq_client.publish_many(messages)
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -7,8 +7,10 @@ Abstract blocking messaging nodes
 """
 from abc import ABC, abstractmethod
 
+from mrcs_control.messaging.dedup_cache import DedupCache
 from mrcs_control.messaging.mq_client import MQClient, MQPublisher, MQSubscriber
 from mrcs_control.messaging.mq_enums import MQTopology
+from mrcs_control.messaging.mq_loopback import MQLoopbackPublisher, MQLoopbackSubscriber
 from mrcs_control.operations.node_enums import NodeTopology
 from mrcs_core.data.equipment_identity import EquipmentIdentifier
 from mrcs_core.data.json import JSONify
@@ -85,7 +87,8 @@ class PublisherNode(MessagingNode, ABC):
     # ----------------------------------------------------------------------------------------------------------------
 
     def __init__(self, ops: NodeTopology.ServiceConfiguration):
-        mq_client = MQPublisher.construct_pub(ops.mq_mode)
+        publisher_class = MQLoopbackPublisher if ops.is_loopback else MQPublisher
+        mq_client = publisher_class.construct_pub(ops.mq_mode)
         super().__init__(ops, mq_client)
 
 
@@ -112,11 +115,24 @@ class SubscriberNode(MessagingNode, ABC):
 
     # ----------------------------------------------------------------------------------------------------------------
 
-    def __init__(self, ops: NodeTopology.ServiceConfiguration, queuing: MQTopology):
-        mq_client = MQSubscriber.construct_sub(ops.mq_mode, queuing, self.id(), self.handle_message)
+    def __init__(self, ops: NodeTopology.ServiceConfiguration, queuing: MQTopology, max_workers: int | None = None,
+                 deduplicate: bool = False):
+        # given max_workers, handle_message runs on a worker thread, off the connection's IO thread
+        if ops.is_loopback:
+            mq_client = MQLoopbackSubscriber.construct_sub(ops.mq_mode, queuing, self.id(), self.handle_message)
+        else:
+            dedup = DedupCache.construct(self.dedup_path(ops, queuing)) if deduplicate else None
+            mq_client = MQSubscriber.construct_sub(ops.mq_mode, queuing, self.id(), self.handle_message,
+                                                   max_workers=max_workers, dedup=dedup)
         super().__init__(ops, mq_client)
 
 
+    @classmethod
+    def dedup_path(cls, ops: NodeTopology.ServiceConfiguration, queuing: MQTopology) -> str | None:
+        # only a durable queue outlives the process, along with its unacked messages
+        return ops.state_path(f'{cls.id().as_json()}.dedup') if queuing == MQTopology.SINGLE else None
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     @abstractmethod
@@ -8,11 +8,14 @@ A gathering-together of service operation modes
 https://stackoverflow.com/questions/37678418/python-enums-with-complex-types
 """
 
+import os
 from enum import Enum, unique
 
 from mrcs_control.db.db_client import DbMode
 from mrcs_control.messaging.mq_client import MQMode
+from mrcs_control.messaging.mq_enums import MQTransport
 from mrcs_core.data.meta_enum import MetaEnum
+from mrcs_core.sys.host import Host
 
 
 # --------------------------------------------------------------------------------------------------------------------
@@ -36,10 +39,11 @@ class NodeTopology(Enum, metaclass=MetaEnum):
         # ------------------------------------------------------------------------------------------------------------
 
 
-        def __init__(self, id: str, db_mode: DbMode, mq_mode: MQMode):
+        def __init__(self, id: str, db_mode: DbMode, mq_mode: MQMode, mq_transport: MQTransport = MQTransport.AMQP):
             self.__id = id
             self.__db_mode = db_mode
             self.__mq_mode = mq_mode
+            self.__mq_transport = mq_transport
 
 
         # ------------------------------------------------------------------------------------------------------------
@@ -48,6 +52,14 @@ class NodeTopology(Enum, metaclass=MetaEnum):
             return [item for item in items if item.name.startswith(self.mq_mode)]
 
 
+        def state_path(self, filename: str) -> str:
+            # node state files, such as journals, are kept beside the databases for the mode
+            directory = Host.mrcs_db_abs_dir(self.db_mode)
+            os.makedirs(directory, exist_ok=True)
+
+            return os.path.join(directory, filename)
+
+
         # ------------------------------------------------------------------------------------------------------------
 
         @property
@@ -65,13 +77,25 @@ class NodeTopology(Enum, metaclass=MetaEnum):
             return self.__mq_mode
 
 
+        @property
+        def mq_transport(self):
+            return self.__mq_transport
+
+
+        @property
+        def is_loopback(self):
+            return self.mq_transport == MQTransport.LOOPBACK
+
+
         # ------------------------------------------------------------------------------------------------------------
 
         def __str__(self, *args, **kwargs):
-            return f'NodeTopology.ServiceConfiguration:{{id:{self.id}, db_mode:{self.db_mode}, mq_mode:{self.mq_mode}}}'
+            return (f'NodeTopology.ServiceConfiguration:{{id:{self.id}, db_mode:{self.db_mode}, '
+                    f'mq_mode:{self.mq_mode}, mq_transport:{self.mq_transport}}}')
 
 
     # ----------------------------------------------------------------------------------------------------------------
 
     TEST = ServiceConfiguration('TEST', DbMode.TEST, MQMode.TEST)
     LIVE = ServiceConfiguration('LIVE', DbMode.LIVE, MQMode.LIVE)
+    LOOPBACK = ServiceConfiguration('LOOPBACK', DbMode.TEST, MQMode.TEST, MQTransport.LOOPBACK)
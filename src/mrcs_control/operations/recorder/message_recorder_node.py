@@ -39,7 +39,8 @@ class MessageRecorderNode(SubscriberNode):
     # ----------------------------------------------------------------------------------------------------------------
 
     def __init__(self, ops: NodeTopology.ServiceConfiguration):
-        super().__init__(ops, MQTopology.SINGLE)
+        # writes run on a worker, so as not to hold up heartbeats - only one, since the process has one connection
+        super().__init__(ops, MQTopology.SINGLE, max_workers=1, deduplicate=True)     # a redelivery would insert a row
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -69,7 +69,7 @@ class CronNode(AsyncSubscriberNode):
         self.async_loop.create_task(self.monitor_clock())
 
 
-    def handle_message(self, message: Message):
+    def handle_message(self, message: Message, _deadline: float | None = None):
         self.logger.info(f'handle_message: {JSONify.as_jdict(message)}')
 
         try:
@@ -122,16 +122,25 @@ class CronNode(AsyncSubscriberNode):
                 saved_time = now
                 now.save(Host)
 
-            while True:
-                job = PersistentCronjob.find_next(now)
-                if not job:
-                    break
+            jobs = PersistentCronjob.find_due(now)
+            if not jobs:
+                continue
 
-                routing = PublicationRoutingKey(self.id(), job.target)
-                message = Message(routing, job)
-                await self.publish(message)
-                PersistentCronjob.delete(job.id)
+            messages = [Message(PublicationRoutingKey(self.id(), job.target), job) for job in jobs]
+            confirmations = await self.publish_many(messages)
+
+            # a job is deleted once the broker has confirmed it - otherwise it is due again at the next tick
+            for job, message, confirmation in zip(jobs, messages, confirmations):
+                if confirmation is None:
+                    PersistentCronjob.delete(job.id)                # it cannot be framed, so would never publish
+                    self.logger.warning(f'run - rejected: {JSONify.as_jdict(message)}')
+                    continue
 
+                if not await confirmation:
+                    self.logger.warning(f'run - not confirmed: {JSONify.as_jdict(message)}')
+                    continue
+
+                PersistentCronjob.delete(job.id)
                 self.logger.info(f'run - published: {JSONify.as_jdict(message)}')
 
 
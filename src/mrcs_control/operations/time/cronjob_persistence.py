@@ -111,6 +111,19 @@ class CronjobPersistence(PersistentObject, ABC):
         return cls.construct_from_db(row) if row else None
 
 
+    @classmethod
+    def find_due(cls, now: ISODatetime) -> List[Self]:
+        client = DbClient.instance(cls.db_name())
+        table = cls.table()
+
+        sql = (f'SELECT id, target, event_id, on_datetime '
+               f'FROM {table} WHERE on_datetime <= ? ORDER BY on_datetime, target')
+        client.execute(sql, data=(now.dbformat(),))
+        rows = client.fetchall()
+
+        return [cls.construct_from_db(row) for row in rows]
+
+
     # ----------------------------------------------------------------------------------------------------------------
 
     @classmethod
@@ -43,7 +43,7 @@ class CrontabNode(SubscriberNode):
     # ----------------------------------------------------------------------------------------------------------------
 
     def __init__(self, ops: NodeTopology.ServiceConfiguration):
-        super().__init__(ops, MQTopology.SINGLE)
+        super().__init__(ops, MQTopology.SINGLE, deduplicate=True)     # a redelivery would insert a duplicate row
 
 
     # ----------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,94 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+A latest-value conflation queue, for asyncio consumers
+
+Values are queued under a key. While a value is waiting to be taken, a newer value with the same key replaces it, in
+the same position in the queue - so a slow consumer sees the current value for each key, and the length of the queue
+is bounded by the number of keys, rather than by the rate of arrival. Values with a key of None are never conflated.
+
+https://www.kdb.plus/docs/conflation
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ConflationQueue(object):
+    """
+    A latest-value conflation queue, for asyncio consumers
+    """
+
+    def __init__(self):
+        self.__items = OrderedDict()        # key: value, in order of first arrival
+        self.__available = asyncio.Event()
+
+        self.__offered = 0
+        self.__conflated = 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def put(self, key: Hashable | None, value: Any):
+        if key is None:
+            key = object()                  # unique - never conflated
+
+        elif key in self.__items:
+            self.__conflated += 1
+
+        self.__items[key] = value
+        self.__offered += 1
+
+        self.__available.set()
+
+
+    def pop(self) -> Any:
+        if not self.__items:
+            raise IndexError('pop from an empty ConflationQueue')
+
+        _, value = self.__items.popitem(last=False)
+
+        return value
+
+
+    async def get(self) -> Any:
+        while not self.__items:
+            self.__available.clear()
+            await self.__available.wait()
+
+        return self.pop()
+
+
+    def clear(self):
+        self.__items.clear()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def offered(self):
+        return self.__offered
+
+
+    @property
+    def conflated(self):
+        return self.__conflated
+
+
+    def __len__(self):
+        return len(self.__items)
+
+
+    def __contains__(self, key: Hashable):
+        return key in self.__items
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return f'ConflationQueue:{{size:{len(self)}, offered:{self.offered}, conflated:{self.conflated}}}'
@@ -0,0 +1,100 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+A bounded least-recently-used cache, with hit / miss counters
+
+The cache may be shared between threads - lookups, insertions and evictions are made under a lock.
+
+https://docs.python.org/3/library/collections.html#ordereddict-examples-and-recipes
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class LRUCache(object):
+    """
+    A bounded least-recently-used cache, with hit / miss counters
+    """
+
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError(f'max_size must be at least 1, got:{max_size}')
+
+        self.__max_size = max_size
+        self.__entries = OrderedDict()
+
+        self.__hits = 0
+        self.__misses = 0
+
+        self.__lock = threading.Lock()
+
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+    def __contains__(self, key: Hashable):
+        return key in self.__entries
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def get(self, key: Hashable, default: Any = None):
+        with self.__lock:
+            try:
+                value = self.__entries[key]
+            except KeyError:
+                self.__misses += 1
+                return default
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+
+            return value
+
+
+    def put(self, key: Hashable, value: Any):
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+
+            if len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+            self.__hits = 0
+            self.__misses = 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def max_size(self):
+        return self.__max_size
+
+
+    @property
+    def hits(self):
+        return self.__hits
+
+
+    @property
+    def misses(self):
+        return self.__misses
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'LRUCache:{{max_size:{self.max_size}, size:{len(self)}, hits:{self.hits}, '
+                f'misses:{self.misses}}}')
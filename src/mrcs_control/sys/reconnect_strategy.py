@@ -0,0 +1,155 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+Exponential backoff, with jitter, for reconnection attempts. Available in both blocking and async flavours.
+
+The first attempt after a failure is made immediately. Subsequent attempts are delayed by
+initial_delay * multiplier ^ (attempt - 2), capped at max_delay, and randomised by +/- jitter (a proportion of the
+delay). Once max_attempts have been made, a ConnectionError is raised. The strategy records the number and duration
+of outages, so that reconnection behaviour can be monitored.
+
+https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+"""
+
+import asyncio
+import random
+import time
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class ReconnectStrategy(object):
+    """
+    exponential backoff, with jitter, for reconnection attempts
+    """
+
+    __DEFAULT_INITIAL_DELAY = 0.5       # seconds
+    __DEFAULT_MAX_DELAY = 30.0          # seconds
+    __DEFAULT_MULTIPLIER = 2.0
+    __DEFAULT_JITTER = 0.2              # proportion of delay
+
+
+    @classmethod
+    def construct(cls, max_attempts: int | None = None):
+        return cls(cls.__DEFAULT_INITIAL_DELAY, cls.__DEFAULT_MAX_DELAY, cls.__DEFAULT_MULTIPLIER,
+                   cls.__DEFAULT_JITTER, max_attempts)
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, initial_delay: float, max_delay: float, multiplier: float, jitter: float,
+                 max_attempts: int | None):
+        self.__initial_delay = initial_delay
+        self.__max_delay = max_delay
+        self.__multiplier = multiplier
+        self.__jitter = jitter
+        self.__max_attempts = max_attempts          # None for unlimited
+
+        self.__attempts = 0
+        self.__outage_start = None
+
+        self.__outages = 0
+        self.__last_outage_duration = None
+        self.__total_outage_duration = 0.0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def next_delay(self) -> float:
+        if self.max_attempts is not None and self.attempts >= self.max_attempts:
+            raise ConnectionError(f'reconnection failed after {self.attempts} attempts')
+
+        if self.__outage_start is None:
+            self.__outage_start = time.monotonic()
+
+        self.__attempts += 1
+
+        if self.attempts == 1:
+            return 0.0
+
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (self.attempts - 2))
+
+        return max(0.0, delay * (1.0 + random.uniform(-self.jitter, self.jitter)))
+
+
+    def wait(self):
+        time.sleep(self.next_delay())
+
+
+    async def async_wait(self):
+        await asyncio.sleep(self.next_delay())
+
+
+    def reconnected(self):
+        if self.__outage_start is None:
+            return
+
+        self.__last_outage_duration = time.monotonic() - self.__outage_start
+        self.__total_outage_duration += self.__last_outage_duration
+        self.__outages += 1
+
+        self.__attempts = 0
+        self.__outage_start = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def initial_delay(self):
+        return self.__initial_delay
+
+
+    @property
+    def max_delay(self):
+        return self.__max_delay
+
+
+    @property
+    def multiplier(self):
+        return self.__multiplier
+
+
+    @property
+    def jitter(self):
+        return self.__jitter
+
+
+    @property
+    def max_attempts(self):
+        return self.__max_attempts
+
+
+    @property
+    def attempts(self):
+        return self.__attempts
+
+
+    @property
+    def is_reconnecting(self):
+        return self.__outage_start is not None
+
+
+    @property
+    def outages(self):
+        return self.__outages
+
+
+    @property
+    def last_outage_duration(self):
+        return self.__last_outage_duration
+
+
+    @property
+    def total_outage_duration(self):
+        return self.__total_outage_duration
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'ReconnectStrategy:{{initial_delay:{self.initial_delay}, max_delay:{self.max_delay}, '
+                f'multiplier:{self.multiplier}, jitter:{self.jitter}, max_attempts:{self.max_attempts}, '
+                f'attempts:{self.attempts}, outages:{self.outages}, '
+                f'total_outage_duration:{self.total_outage_duration:.3f}}}')
@@ -0,0 +1,212 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+A bounded latest-value queue, for asyncio consumers, that overflows to an append-only journal on disk
+
+Up to capacity values are held in memory, in a ConflationQueue. When memory is full, values are appended to the
+journal, one encoded line per value - from then on, values are journalled, rather than overtaking those already on
+disk, until the journal has been read back. (A value whose key is already held in memory still replaces it there.)
+
+When the values in memory have been taken, the next capacity values are read from the journal, in order. Values read
+back from the journal are not conflated. The journal is removed when it has been read to the end.
+
+A journal left by an earlier process is read back, after any values already in memory. Lines that cannot be decoded -
+for example, a line torn by a crash - are discarded.
+
+https://en.wikipedia.org/wiki/Write-ahead_logging
+"""
+
+import asyncio
+import os
+from typing import Any, Callable, Hashable
+
+from mrcs_control.sys.conflation_queue import ConflationQueue
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class SpillQueue(object):
+    """
+    A bounded latest-value queue, for asyncio consumers, that overflows to an append-only journal on disk
+    """
+
+    def __init__(self, path: str, capacity: int, encode: Callable[[Any], str], decode: Callable[[str], Any]):
+        if capacity < 1:
+            raise ValueError(f'capacity must be at least 1, got:{capacity}')
+
+        self.__path = path
+        self.__capacity = capacity
+        self.__encode = encode                  # value -> single-line string
+        self.__decode = decode                  # single-line string -> value
+
+        self.__memory = ConflationQueue()
+        self.__available = asyncio.Event()
+
+        self.__writer = None                    # append handle, while the journal is in use
+        self.__read_offset = 0
+        self.__spilled = self.__recover()       # values in the journal, not yet read back
+
+        self.__offered = 0
+        self.__discarded = 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def put(self, key: Hashable | None, value: Any):
+        if key is not None and key in self.__memory:
+            self.__memory.put(key, value)
+
+        elif self.spilled == 0 and len(self.__memory) < self.capacity:
+            self.__memory.put(key, value)
+
+        else:
+            self.__append(value)
+
+        self.__offered += 1
+        self.__available.set()
+
+
+    def pop(self) -> Any:
+        self.__fill()
+
+        if len(self.__memory) == 0:
+            raise IndexError('pop from an empty SpillQueue')
+
+        return self.__memory.pop()
+
+
+    async def get(self) -> Any:
+        while True:
+            while len(self) == 0:
+                self.__available.clear()
+                await self.__available.wait()
+
+            self.__fill()
+
+            if len(self.__memory) > 0:
+                return self.__memory.pop()
+
+            # every line read back was discarded - wait again
+
+
+    def clear(self):
+        self.__memory.clear()
+        self.__remove_journal()
+
+
+    def close(self):
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __append(self, value: Any):
+        if self.__writer is None:
+            self.__writer = open(self.path, 'ab')
+
+        self.__writer.write(self.__encode(value).encode() + b'\n')
+        self.__writer.flush()
+
+        self.__spilled += 1
+
+
+    def __fill(self):
+        while len(self.__memory) == 0 and self.spilled > 0:
+            self.__reload()                     # may discard every line it reads
+
+
+    def __reload(self):
+        with open(self.path, 'rb') as reader:
+            reader.seek(self.__read_offset)
+
+            while self.spilled > 0 and len(self.__memory) < self.capacity:
+                line = reader.readline()
+
+                if not line:
+                    self.__spilled = 0          # the journal was truncated externally
+                    break
+
+                self.__spilled -= 1
+
+                try:
+                    self.__memory.put(None, self.__decode(line.decode().rstrip('\n')))
+                except Exception:
+                    self.__discarded += 1
+
+            self.__read_offset = reader.tell()
+
+        if self.spilled == 0:
+            self.__remove_journal()
+
+
+    def __recover(self) -> int:
+        try:
+            with open(self.path, 'rb') as reader:
+                return sum(1 for _ in reader)
+
+        except FileNotFoundError:
+            return 0
+
+
+    def __remove_journal(self):
+        self.close()
+
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+        self.__read_offset = 0
+        self.__spilled = 0
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def path(self):
+        return self.__path
+
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+
+    @property
+    def spilled(self):
+        return self.__spilled
+
+
+    @property
+    def offered(self):
+        return self.__offered
+
+
+    @property
+    def conflated(self):
+        return self.__memory.conflated
+
+
+    @property
+    def discarded(self):
+        return self.__discarded
+
+
+    def __len__(self):
+        return len(self.__memory) + self.spilled
+
+
+    def __contains__(self, key: Hashable):
+        return key in self.__memory
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return (f'SpillQueue:{{path:{self.path}, capacity:{self.capacity}, size:{len(self)}, '
+                f'spilled:{self.spilled}, offered:{self.offered}, conflated:{self.conflated}, '
+                f'discarded:{self.discarded}}}')
@@ -0,0 +1,97 @@
+"""
+Created on 17 Oct 2026
+
+@author: Bruno Beloff (bbeloff@me.com)
+
+A token bucket rate limiter, for asyncio producers
+
+Tokens accrue at rate per second, up to burst. Taking n tokens is permitted when at least n are held, so a producer
+that has been idle may send a burst immediately, while a busy producer is held to the sustained rate.
+
+https://en.wikipedia.org/wiki/Token_bucket
+"""
+
+import asyncio
+import time
+
+
+# --------------------------------------------------------------------------------------------------------------------
+
+class TokenBucket(object):
+    """
+    A token bucket rate limiter, for asyncio producers
+    """
+
+    def __init__(self, rate: float, burst: float):
+        if rate <= 0:
+            raise ValueError(f'rate must be greater than 0, got:{rate}')
+
+        if burst < 1:
+            raise ValueError(f'burst must be at least 1, got:{burst}')
+
+        self.__rate = rate                          # tokens per second
+        self.__burst = burst
+
+        self.__tokens = burst                       # the bucket starts full
+        self.__updated = time.monotonic()
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def take(self, n: float = 1) -> bool:
+        self.__refill()
+
+        if self.__tokens < n:
+            return False
+
+        self.__tokens -= n
+        return True
+
+
+    def delay(self, n: float = 1) -> float:
+        # seconds until n tokens are held
+        self.__refill()
+
+        return max(0.0, (n - self.__tokens) / self.rate)
+
+
+    async def acquire(self, n: float = 1):
+        if n > self.burst:
+            raise ValueError(f'n must be no more than burst, got:{n}')
+
+        while not self.take(n):
+            await asyncio.sleep(self.delay(n))
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __refill(self):
+        now = time.monotonic()
+
+        self.__tokens = min(self.burst, self.__tokens + (now - self.__updated) * self.rate)
+        self.__updated = now
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    @property
+    def rate(self):
+        return self.__rate
+
+
+    @property
+    def burst(self):
+        return self.__burst
+
+
+    @property
+    def tokens(self):
+        self.__refill()
+
+        return self.__tokens
+
+
+    # ----------------------------------------------------------------------------------------------------------------
+
+    def __str__(self, *args, **kwargs):
+        return f'TokenBucket:{{rate:{self.rate}, burst:{self.burst}, tokens:{round(self.tokens, 3)}}}'